@@ -0,0 +1,7 @@
+"""Reproducible micro-benchmarks for the capture → OCR → answer hot path.
+
+Run ``python -m benchmarks --output results.json`` to produce a JSON report and
+``python -m benchmarks --compare results.json`` to check a later run against
+it.  The suite uses synthetic frames and stand-in OCR/model backends from
+:mod:`benchmarks.frames`, so it runs headless without Tesseract or a display.
+"""
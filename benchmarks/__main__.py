@@ -0,0 +1,60 @@
+"""Command-line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+
+from quiz_automation.logger import configure_logger
+
+from .suite import BENCHMARKS, compare, run
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite, optionally saving and comparing JSON reports."""
+    parser = argparse.ArgumentParser(description="Quiz automation benchmarks")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown of the median that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep per-question log lines out of the timings and the output.
+    configure_logger(level=logging.WARNING)
+    report = run(args.names, args.iterations)
+
+    for name, res in report["results"].items():
+        print(
+            f"{name:32} mean {res['mean'] * 1e6:10.1f}us  "
+            f"p99 {res['p99'] * 1e6:10.1f}us  {res['ops_per_sec']:12,.0f} ops/s"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Synthetic quiz frames and stand-in backends used by the benchmark suite."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+_WORDS = (
+    "sky blue ocean planet river mountain energy light sound cell atom "
+    "gravity orbit molecule carbon oxygen water forest desert storm"
+).split()
+
+
+@dataclass(frozen=True)
+class SyntheticFrame:
+    """Screenshot stand-in mirroring the ``size``/``rgb`` shape of ``mss`` grabs.
+
+    ``text`` carries the rendered question so :class:`SyntheticOCR` can
+    "recognise" it without running a real OCR engine.
+    """
+
+    size: Tuple[int, int]
+    rgb: bytes
+    text: str
+
+    @property
+    def width(self) -> int:
+        """Return the frame width in pixels."""
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        """Return the frame height in pixels."""
+        return self.size[1]
+
+
+def make_question(rng: random.Random, options: int = 4) -> str:
+    """Return OCR-style text for a random question with lettered options."""
+    question = " ".join(rng.choice(_WORDS) for _ in range(8)) + "?"
+    lines = [question]
+    for i in range(options):
+        words = " ".join(rng.choice(_WORDS) for _ in range(3))
+        lines.append(f"{chr(ord('A') + i)}) {words}")
+    return "\n".join(lines)
+
+
+def generate_frames(
+    count: int,
+    *,
+    size: Tuple[int, int] = (600, 400),
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[SyntheticFrame]:
+    """Yield ``count`` frames where each question stays on screen ``repeat`` times.
+
+    Repeated frames model the watcher polling an unchanged question, which is
+    what the deduplication path has to filter out.
+    """
+    rng = random.Random(seed)  # nosec B311 - deterministic test data
+    width, height = size
+    row = bytes(rng.randrange(256) for _ in range(width * 3))
+    pixels = row * height
+    text = ""
+    for i in range(count):
+        if i % repeat == 0:
+            text = make_question(rng)
+        yield SyntheticFrame(size, pixels, text)
+
+
+class SyntheticOCR:
+    """OCR backend returning the text embedded in a :class:`SyntheticFrame`."""
+
+    def __call__(self, img: SyntheticFrame) -> str:
+        """Return ``img.text``."""
+        return img.text
+
+
+def sample_questions(count: int, seed: int = 0) -> List[Tuple[str, List[str]]]:
+    """Return ``count`` ``(question, options)`` pairs for model benchmarks."""
+    rng = random.Random(seed)  # nosec B311 - deterministic test data
+    pairs = []
+    for _ in range(count):
+        question, *options = make_question(rng).splitlines()
+        pairs.append((question, [o[3:] for o in options]))
+    return pairs
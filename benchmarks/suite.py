@@ -0,0 +1,436 @@
+"""Benchmark cases and the harness that runs and compares them."""
+
+from __future__ import annotations
+
+import contextlib
+import platform
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from queue import Queue
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Sequence
+
+from quiz_automation import automation, ocr
+from quiz_automation.clicker import NullClicker
+from quiz_automation.config import Settings, settings
+from quiz_automation.model_client import LocalModelClient
+from quiz_automation.preprocess import Preprocessor
+from quiz_automation.runner import QuizRunner
+from quiz_automation.stats import HistogramSnapshot, LatencyHistogram, Stats
+from quiz_automation.types import Point, Region
+from quiz_automation.virtual_screen import VirtualOCR, VirtualScreen
+from quiz_automation.watcher import Watcher
+
+from .frames import SyntheticOCR, generate_frames, sample_questions
+
+
+@dataclass
+class BenchResult:
+    """Timing summary for one benchmark case (all durations in seconds)."""
+
+    name: str
+    iterations: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    ops_per_sec: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+BenchFunc = Callable[[int], List[BenchResult]]
+BENCHMARKS: Dict[str, BenchFunc] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchFunc], BenchFunc]:
+    """Register a benchmark case under ``name``."""
+
+    def decorator(func: BenchFunc) -> BenchFunc:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def _histogram() -> LatencyHistogram:
+    return LatencyHistogram(lowest=1e-8, highest=60.0, precision=0.01)
+
+
+def summarize(
+    name: str, snap: HistogramSnapshot, total: float, **extra: Any
+) -> BenchResult:
+    """Return a :class:`BenchResult` for the per-operation samples in *snap*."""
+    return BenchResult(
+        name,
+        snap.count,
+        total,
+        snap.mean,
+        snap.percentile(50),
+        snap.percentile(95),
+        snap.percentile(99),
+        snap.count / total if total else 0.0,
+        dict(extra),
+    )
+
+
+def measure(
+    name: str,
+    func: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 10,
+) -> BenchResult:
+    """Call ``func(i)`` ``iterations`` times and summarise per-call latency."""
+    for i in range(min(warmup, iterations)):
+        func(i)
+    hist = _histogram()
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        func(i)
+        hist.record(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    return summarize(name, hist.snapshot(), total)
+
+
+@contextlib.contextmanager
+def _synthetic_ocr() -> Iterator[None]:
+    """Register :class:`SyntheticOCR` as OCR backend ``synthetic`` temporarily."""
+    previous = ocr._BACKENDS.get("synthetic")
+    ocr.register_backend("synthetic", SyntheticOCR)
+    try:
+        yield
+    finally:
+        if previous is None:
+            ocr._BACKENDS.pop("synthetic", None)
+        else:
+            ocr.register_backend("synthetic", previous)
+
+
+@contextlib.contextmanager
+def _stub_pipeline() -> Iterator[None]:
+    """Route OCR to :class:`SyntheticOCR` and turn clicks into no-ops."""
+    original_backend = settings.ocr_backend
+    original_click = automation.click_option
+    settings.ocr_backend = "synthetic"
+    automation.click_option = lambda base, index, offset=40: None  # type: ignore
+    try:
+        with _synthetic_ocr():
+            yield
+    finally:
+        settings.ocr_backend = original_backend
+        automation.click_option = original_click  # type: ignore
+
+
+@benchmark("watcher_dedupe")
+def bench_watcher_dedupe(iterations: int) -> List[BenchResult]:
+    """OCR a frame and check whether it shows a new question."""
+    frames = list(generate_frames(iterations))
+    watcher = Watcher(
+        Region(0, 0, *frames[0].size), Queue(), Settings(), ocr=SyntheticOCR()
+    )
+    new = 0
+
+    def step(i: int) -> None:
+        nonlocal new
+        if watcher.is_new_question(watcher.ocr(frames[i])):
+            new += 1
+
+    result = measure("watcher_dedupe", step, iterations, warmup=0)
+    result.extra["new_questions"] = new
+    return [result]
+
+
+@benchmark("ocr_backend")
+def bench_ocr_backend(iterations: int) -> List[BenchResult]:
+    """Resolve the configured OCR backend and run it, as answer_question does."""
+    frames = list(generate_frames(iterations))
+    with _synthetic_ocr():
+        return [
+            measure(
+                "ocr_backend",
+                lambda i: ocr.get_backend("synthetic")(frames[i]),
+                iterations,
+            )
+        ]
+
+
+@benchmark("ocr_preprocess")
+def bench_ocr_preprocess(iterations: int) -> List[BenchResult]:
+    """Full preprocessing chain on a 600x400 frame, with per-step means."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:  # pragma: no cover - NumPy missing
+        return []
+    frames = list(generate_frames(min(iterations, 50), repeat=1))
+    pre = Preprocessor()
+    totals: Dict[str, float] = {}
+    pixels: List[int] = []
+
+    def step(i: int) -> None:
+        out = pre(frames[i % len(frames)])
+        pixels.append(out.size)
+        for name, seconds in pre.timings.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+
+    result = measure("ocr_preprocess", step, max(1, iterations // 10), warmup=0)
+    calls = len(pixels)
+    result.extra["steps"] = {name: total / calls for name, total in totals.items()}
+    width, height = frames[0].size
+    result.extra["pixel_ratio"] = sum(pixels) / calls / (width * height * 3)
+    return [result]
+
+
+@benchmark("answer_question")
+def bench_answer_question(iterations: int) -> List[BenchResult]:
+    """Full parse path: OCR text → option split → local model → click."""
+    frames = list(generate_frames(iterations, repeat=1))
+    client = LocalModelClient()
+    options = list("ABCD")
+    stats = Stats()
+    region = Region(0, 0, *frames[0].size)
+
+    def step(i: int) -> None:
+        automation.answer_question(
+            frames[i],
+            Point(0, 0),
+            region,
+            options,
+            Point(0, 0),
+            stats=stats,
+            client=client,
+        )
+
+    with _stub_pipeline():
+        return [measure("answer_question", step, iterations)]
+
+
+@benchmark("local_model_ask")
+def bench_local_model_ask(iterations: int) -> List[BenchResult]:
+    """Word-overlap scoring in :class:`LocalModelClient`."""
+    pairs = sample_questions(iterations)
+    client = LocalModelClient()
+    return [measure("local_model_ask", lambda i: client.ask(*pairs[i]), iterations)]
+
+
+@benchmark("stats_record")
+def bench_stats_record(iterations: int) -> List[BenchResult]:
+    """Aggregate ``Stats.record`` throughput with 1, 4 and 8 writer threads.
+
+    Every writer times each ``record``/``record_stage`` pair into its own
+    histogram; the snapshots are merged for the percentiles.
+    """
+    results = []
+    for threads in (1, 4, 8):
+        stats = Stats()
+        per_thread = max(1, iterations // threads) * 10
+        barrier = threading.Barrier(threads + 1)
+        snapshots: List[HistogramSnapshot] = []
+
+        def work() -> None:
+            hist = _histogram()
+            clock = time.perf_counter
+            barrier.wait()
+            for _ in range(per_thread):
+                t0 = clock()
+                stats.record(0.01, 1)
+                stats.record_stage("ocr", 0.001)
+                hist.record(clock() - t0)
+            snapshots.append(hist.snapshot())
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        total = time.perf_counter() - started
+        merged = snapshots[0]
+        for snap in snapshots[1:]:
+            merged = merged.merge(snap)
+        results.append(
+            summarize(
+                f"stats_record[threads={threads}]", merged, total, threads=threads
+            )
+        )
+    return results
+
+
+class _TimedSource:
+    """Capture source wrapper timing the interval between consecutive frames."""
+
+    def __init__(self, source: Any) -> None:
+        self.source = source
+        self.hist = _histogram()
+        self._last: float | None = None
+
+    def grab(self, region: Region) -> Any:
+        img = self.source.grab(region)
+        now = time.perf_counter()
+        if img is not None and self._last is not None:
+            self.hist.record(now - self._last)
+        self._last = now
+        return img
+
+
+def _throughput(
+    name: str,
+    source: _TimedSource,
+    frames: int,
+    total: float,
+    offered: float | None,
+    **extra: Any,
+) -> BenchResult:
+    """Summarise a load run; percentiles are per-frame intervals."""
+    result = summarize(name, source.hist.snapshot(), total)
+    result.iterations = frames
+    result.ops_per_sec = frames / total if total else 0.0
+    result.extra = {
+        "offered_fps": offered,
+        "achieved_fps": result.ops_per_sec,
+        **extra,
+    }
+    return result
+
+
+@benchmark("pipeline_load")
+def bench_pipeline_load(iterations: int) -> List[BenchResult]:
+    """Drive ``Watcher`` and ``QuizRunner`` from a virtual screen at rising rates.
+
+    Achieved frames per second falling below the offered rate marks the point
+    where the loop saturates.
+    """
+    results = []
+    region = Region(0, 0, 320, 200)
+    for rate in (500.0, 2000.0, 8000.0, None):
+        label = f"{rate:g}" if rate else "max"
+        screen = VirtualScreen(rate=rate, repeat=3, limit=iterations)
+        timed = _TimedSource(screen)
+        watcher = Watcher(
+            region,
+            Queue(),
+            Settings(poll_interval=1e-6),
+            ocr=VirtualOCR(),
+            source=timed,
+        )
+        started = time.perf_counter()
+        watcher.run()
+        results.append(
+            _throughput(
+                f"pipeline_load[watcher,rate={label}]",
+                timed,
+                screen.frames,
+                time.perf_counter() - started,
+                rate,
+                questions=watcher.queue.qsize(),
+            )
+        )
+
+        frames = max(1, iterations // 4)
+        stats = Stats()
+        timed = _TimedSource(VirtualScreen(rate=rate, limit=frames))
+        runner = QuizRunner(
+            region,
+            Point(0, 0),
+            region,
+            list("ABCD"),
+            Point(0, 0),
+            model_client=LocalModelClient(),
+            stats=stats,
+            capture=timed,
+            clicker=NullClicker(),
+        )
+        original_backend = settings.ocr_backend
+        settings.ocr_backend = "virtual"
+        try:
+            started = time.perf_counter()
+            runner.start()
+            runner.join()
+            total = time.perf_counter() - started
+        finally:
+            settings.ocr_backend = original_backend
+        results.append(
+            _throughput(
+                f"pipeline_load[runner,rate={label}]",
+                timed,
+                stats.questions_answered,
+                total,
+                rate,
+                stage_p50={
+                    stage: snap.percentile(50)
+                    for stage, snap in stats.latency_snapshots().items()
+                },
+            )
+        )
+    return results
+
+
+@benchmark("server_answer")
+def bench_server_answer(iterations: int) -> List[BenchResult]:
+    """``POST /answer`` plus ``GET /answer/{id}`` with eager Celery tasks."""
+    try:
+        from fastapi.testclient import TestClient
+
+        from server.app import app, celery_app
+    except Exception:  # pragma: no cover - server extras missing
+        return []
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    client = TestClient(app)
+    pairs = sample_questions(iterations)
+
+    def step(i: int) -> None:
+        question, options = pairs[i]
+        resp = client.post("/answer", json={"question": question, "options": options})
+        client.get(f"/answer/{resp.json()['task_id']}")
+
+    return [measure("server_answer", step, max(1, iterations // 10))]
+
+
+def run(names: Sequence[str] | None = None, iterations: int = 2000) -> Dict[str, Any]:
+    """Run the selected benchmarks and return a JSON-serialisable report."""
+    selected = list(names) if names else list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    results: Dict[str, Any] = {}
+    for name in selected:
+        for result in BENCHMARKS[name](iterations):
+            results[result.name] = asdict(result)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Mapping[str, Any], current: Mapping[str, Any], threshold: float = 0.2
+) -> List[str]:
+    """Return descriptions of results whose median got slower by > ``threshold``.
+
+    The median is compared rather than the mean so a few scheduler hiccups in
+    either run do not register as regressions.
+    """
+    regressions = []
+    old_results = baseline.get("results", {})
+    for name, new in current.get("results", {}).items():
+        old = old_results.get(name)
+        if not old or not old.get("p50"):
+            continue
+        change = new["p50"] / old["p50"] - 1.0
+        if change > threshold:
+            regressions.append(
+                f"{name}: p50 {old['p50'] * 1e6:.1f}us -> "
+                f"{new['p50'] * 1e6:.1f}us (+{change:.0%})"
+            )
+    return regressions
@@ -4,17 +4,37 @@ This module re-exports the most commonly used classes and helper functions so
 that examples can simply import from :mod:`quiz_automation` without needing to
 know the internal module layout.  Only a small and well-defined public surface
 area is provided here.
+
+The names are resolved on first access (:pep:`562`), so ``import
+quiz_automation`` or importing a single submodule does not pull in the
+automation stack, its optional desktop dependencies or Qt.
 """
 
-from .automation import (
-    answer_question,
-    click_option,
-    read_chatgpt_response,
-    send_to_chatgpt,
-)
-from .gui import QuizGUI
-from .runner import QuizRunner
-from .stats import Stats
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - imports for static analysis only
+    from .automation import (
+        answer_question,
+        click_option,
+        read_chatgpt_response,
+        send_to_chatgpt,
+    )
+    from .gui import QuizGUI
+    from .runner import QuizRunner
+    from .stats import Stats
+
+_EXPORTS = {
+    "QuizRunner": ".runner",
+    "QuizGUI": ".gui",
+    "answer_question": ".automation",
+    "send_to_chatgpt": ".automation",
+    "read_chatgpt_response": ".automation",
+    "click_option": ".automation",
+    "Stats": ".stats",
+}
 
 __all__ = [
     "QuizRunner",
@@ -26,3 +46,17 @@ __all__ = [
     "Stats",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule providing *name* on first access."""
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
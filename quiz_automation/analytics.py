@@ -0,0 +1,202 @@
+"""Streaming aggregation of session logs.
+
+:func:`analyze` reads session records with
+:func:`~quiz_automation.session_log.read_session_log` and folds them into a
+:class:`SessionSummary` one record at a time, so memory does not grow with the
+number of records: latencies go into a
+:class:`~quiz_automation.stats.LatencyHistogram`, everything else into
+counters.  Only the columns needed for the summary are decoded, which skips
+``ocr_text`` entirely for columnar logs.  Files can be summarised in parallel
+worker processes and the partial summaries merged.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping
+
+from .session_log import read_session_log, session_log_files
+from .stats import DEFAULT_PERCENTILES, HistogramSnapshot, LatencyHistogram
+
+#: Record keys read by :func:`summarize_file`.
+COLUMNS = ("timestamp", "duration", "tokens", "letter", "error")
+
+
+class SessionSummary:
+    """Constant-memory aggregate of session records.
+
+    ``hourly`` counts answered questions per ``YYYY-MM-DDTHH`` hour, which
+    grows with the time span covered rather than the number of records.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty summary."""
+        self.answered = 0
+        self.errors = 0
+        self.tokens = 0
+        self.letters: Counter[str] = Counter()
+        self.error_types: Counter[str] = Counter()
+        self.hourly: Counter[str] = Counter()
+        self.first: str | None = None
+        self.last: str | None = None
+        self._histogram = LatencyHistogram()
+        self._merged: HistogramSnapshot | None = None
+
+    @property
+    def latency(self) -> HistogramSnapshot:
+        """Return the histogram of ``duration`` values."""
+        snapshot = self._histogram.snapshot()
+        return self._merged.merge(snapshot) if self._merged else snapshot
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        """Fold a single session record into the summary."""
+        timestamp = record.get("timestamp")
+        if isinstance(timestamp, str):
+            if self.first is None or timestamp < self.first:
+                self.first = timestamp
+            if self.last is None or timestamp > self.last:
+                self.last = timestamp
+        if record.get("error") is not None:
+            self.errors += 1
+            self.error_types[str(record["error"])] += 1
+            return
+        self.answered += 1
+        if isinstance(timestamp, str):
+            self.hourly[timestamp[:13]] += 1
+        duration = record.get("duration")
+        if isinstance(duration, (int, float)):
+            self._histogram.record(float(duration))
+        self.tokens += int(record.get("tokens") or 0)
+        letter = record.get("letter")
+        if letter is not None:
+            self.letters[str(letter)] += 1
+
+    def update(self, records: Iterable[Mapping[str, Any]]) -> "SessionSummary":
+        """Fold every record of *records* into the summary and return it."""
+        for record in records:
+            self.add(record)
+        return self
+
+    def merge(self, other: "SessionSummary") -> "SessionSummary":
+        """Add the counts of *other* to this summary and return it."""
+        self.answered += other.answered
+        self.errors += other.errors
+        self.tokens += other.tokens
+        self.letters.update(other.letters)
+        self.error_types.update(other.error_types)
+        self.hourly.update(other.hourly)
+        for stamp in (other.first, other.last):
+            if stamp is None:
+                continue
+            if self.first is None or stamp < self.first:
+                self.first = stamp
+            if self.last is None or stamp > self.last:
+                self.last = stamp
+        self._merged = self.latency.merge(other.latency)
+        self._histogram.reset()
+        return self
+
+    @property
+    def error_rate(self) -> float:
+        """Return the fraction of questions that failed."""
+        total = self.answered + self.errors
+        return self.errors / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON serialisable report."""
+        latency = self.latency
+        peak = max(self.hourly.values(), default=0)
+        return {
+            "answered": self.answered,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "error_types": dict(self.error_types.most_common()),
+            "first": self.first,
+            "last": self.last,
+            "hourly": dict(sorted(self.hourly.items())),
+            "peak_per_hour": peak,
+            "mean_per_hour": self.answered / len(self.hourly) if self.hourly else 0.0,
+            "latency": {
+                "count": latency.count,
+                "mean": latency.mean,
+                "max": latency.maximum,
+                **latency.percentiles(DEFAULT_PERCENTILES),
+            },
+            "tokens": {
+                "total": self.tokens,
+                "mean": self.tokens / self.answered if self.answered else 0.0,
+            },
+            "letters": dict(sorted(self.letters.items())),
+        }
+
+
+def summarize_file(path: str | Path) -> SessionSummary:
+    """Return the summary of a single session log file."""
+    return SessionSummary().update(read_session_log(path, columns=COLUMNS))
+
+
+def analyze(
+    paths: str | Path | Iterable[str | Path], workers: int = 1
+) -> SessionSummary:
+    """Summarise every session log file under *paths*.
+
+    Parameters
+    ----------
+    paths:
+        Files, rotated log base paths, directories or glob patterns; see
+        :func:`~quiz_automation.session_log.session_log_files`.
+    workers:
+        Summarise files in this many worker processes.  ``1`` keeps all work
+        in the calling process.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    files: List[Path] = [f for p in paths for f in session_log_files(p)]
+    summary = SessionSummary()
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            for part in pool.map(summarize_file, files):
+                summary.merge(part)
+    else:
+        for file in files:
+            summary.merge(summarize_file(file))
+    return summary
+
+
+def format_report(report: Mapping[str, Any]) -> str:
+    """Render a :meth:`SessionSummary.to_dict` report as plain text."""
+    latency = report["latency"]
+    lines = [
+        f"Questions answered: {report['answered']}",
+        f"Errors: {report['errors']} ({report['error_rate']:.1%})",
+        *(f"  {error}: {n}" for error, n in report["error_types"].items()),
+        f"Period: {report['first'] or '-'} .. {report['last'] or '-'}",
+        (
+            f"Throughput: {report['mean_per_hour']:.1f}/h mean, "
+            f"{report['peak_per_hour']}/h peak over {len(report['hourly'])} h"
+        ),
+        "Latency (s): "
+        + ", ".join(
+            f"{key} {latency[key]:.3f}"
+            for key in ("mean", *(f"p{q:g}" for q in DEFAULT_PERCENTILES), "max")
+        ),
+        (
+            f"Tokens: {report['tokens']['total']} total, "
+            f"{report['tokens']['mean']:.1f} per question"
+        ),
+    ]
+    answered = report["answered"]
+    if report["letters"]:
+        lines.append(
+            "Letters: "
+            + ", ".join(
+                f"{letter} {n} ({n / answered:.1%})"
+                for letter, n in report["letters"].items()
+            )
+        )
+    return "\n".join(lines)
+
+
+__all__ = ["COLUMNS", "SessionSummary", "analyze", "format_report", "summarize_file"]
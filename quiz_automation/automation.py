@@ -10,40 +10,45 @@ project and in the unit tests.
 
 from __future__ import annotations
 
+import contextlib
 import json
 import re
 import time
 from datetime import datetime
-from typing import Any, Sequence, TextIO
-
-try:  # pragma: no cover - optional heavy dependency
-    import pyautogui  # type: ignore
-    import pytesseract  # type: ignore
-except Exception:  # pragma: no cover
-    # ``pyautogui`` and ``pytesseract`` are not available in the execution
-    # environment.  Provide very small mocks so the rest of the code can still
-    # be exercised.  Each attribute mimics the interface used in this module
-    # which allows the tests to monkeypatch behaviour if required.
-    from types import SimpleNamespace
-
-    pyautogui = SimpleNamespace(  # type: ignore[attr-defined]
-        screenshot=lambda *_, **__: None,
-        moveTo=lambda *_, **__: None,
-        hotkey=lambda *_, **__: None,
-        click=lambda *_, **__: None,
-    )
-    pytesseract = SimpleNamespace(  # type: ignore[attr-defined]
-        image_to_string=lambda *_, **__: "",
-    )
+from time import perf_counter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, TextIO
 
-from . import ocr
+from . import ocr, tracing
 from .clicker import Clicker
 from .config import settings
 from .logger import get_logger
 from .model_client import ModelClientProtocol
+from .session_log import SessionLogWriter
 from .stats import Stats
 from .types import Point, Region
-from .utils import copy_image_to_clipboard, validate_region
+from .utils import LazyModule, copy_image_to_clipboard, validate_region
+
+if TYPE_CHECKING:  # pragma: no cover - NumPy/OpenCV are only needed to calibrate
+    from .calibration import OptionCalibrator
+
+# ``pyautogui`` and ``pytesseract`` are imported on first use.  When they are
+# not available in the execution environment very small stand-ins are used so
+# the rest of the code can still be exercised.  Each attribute mimics the
+# interface used in this module which allows the tests to monkeypatch
+# behaviour if required.
+pyautogui: Any = LazyModule(
+    "pyautogui",
+    SimpleNamespace(
+        screenshot=lambda *_, **__: None,
+        moveTo=lambda *_, **__: None,
+        hotkey=lambda *_, **__: None,
+        click=lambda *_, **__: None,
+    ),
+)
+pytesseract: Any = LazyModule(
+    "pytesseract", SimpleNamespace(image_to_string=lambda *_, **__: "")
+)
 
 logger = get_logger(__name__)
 
@@ -55,6 +60,17 @@ __all__ = [
 ]
 
 
+@contextlib.contextmanager
+def _stage(stats: Stats | None, name: str) -> Iterator[None]:
+    """Time a pipeline stage into ``stats`` and the active trace."""
+    start = perf_counter()
+    with tracing.span(name):
+        yield
+    if stats is not None:
+        stats.record_stage(name, perf_counter() - start)
+
+
+@tracing.traced("send_to_chatgpt")
 def send_to_chatgpt(img: Any, box: Point) -> None:
     """Paste *img* into the ChatGPT input box located at ``box``.
 
@@ -73,13 +89,16 @@ def send_to_chatgpt(img: Any, box: Point) -> None:
     if not hasattr(pyautogui, "moveTo"):
         raise RuntimeError("pyautogui not available")
 
-    if not copy_image_to_clipboard(img):
+    with tracing.span("clipboard_copy"):
+        copied = copy_image_to_clipboard(img)
+    if not copied:
         raise RuntimeError("failed to copy image to clipboard")
     pyautogui.moveTo(*box)
     # ``hotkey`` is easier for tests to monkeypatch than writing characters
     pyautogui.hotkey("ctrl", "v")
 
 
+@tracing.traced("read_chatgpt_response")
 def read_chatgpt_response(
     response_region: Region,
     timeout: float = 20.0,
@@ -125,22 +144,31 @@ def read_chatgpt_response(
     raise TimeoutError("No response detected")
 
 
-def click_option(base: Point, index: int, offset: int = 40) -> None:
+def click_option(
+    base: Point,
+    index: int,
+    offset: int = 40,
+    targets: Sequence[Point] | None = None,
+) -> None:
     """Click the answer option at ``index`` using ``base`` as the first option.
 
     ``base`` corresponds to the coordinates of the first option on screen.  The
     function increments the ``y`` coordinate by ``offset`` for each subsequent
     option and performs a mouse click at the calculated position via
-    :class:`~quiz_automation.clicker.Clicker`.
+    :class:`~quiz_automation.clicker.Clicker`.  Calibrated ``targets`` (see
+    :class:`~quiz_automation.calibration.OptionCalibrator`) replace that
+    arithmetic for the indices they cover.
 
     Raises
     ------
     RuntimeError
         If :mod:`pyautogui` is not available.
     """
-    Clicker(base, offset).click_option(index)
+    clicker = Clicker(base, offset, targets) if targets else Clicker(base, offset)
+    clicker.click_option(index)
 
 
+@tracing.traced("answer_question")
 def answer_question(
     quiz_image: Any,
     chatgpt_box: Point,
@@ -150,7 +178,10 @@ def answer_question(
     stats: Stats | None = None,
     poll_interval: float = 0.5,
     client: ModelClientProtocol | None = None,
-    session_log: TextIO | None = None,
+    session_log: TextIO | SessionLogWriter | None = None,
+    calibrator: OptionCalibrator | None = None,
+    clicker: Clicker | None = None,
+    ocr_backend: ocr.OCRBackend | None = None,
 ) -> str:
     """Send ``quiz_image`` to a model and click the chosen answer.
 
@@ -158,14 +189,34 @@ def answer_question(
     response region is polled until an answer appears.  When ``client`` is
     provided the image is OCR'd using the configured backend and the resulting
     question and option text are forwarded to ``client.ask``.
+
+    ``session_log`` receives one JSON record per question.  Pass a
+    :class:`~quiz_automation.session_log.SessionLogWriter` to keep the file
+    I/O off this thread; a plain text stream is written synchronously.
+
+    With a ``calibrator`` the click goes to the option positions detected in
+    ``quiz_image`` rather than ``option_base`` plus a fixed offset.
+
+    ``clicker`` performs the click instead of a :class:`Clicker` built from
+    ``option_base``, e.g. a :class:`~quiz_automation.clicker.NullClicker`
+    when replaying recorded frames.
+
+    ``ocr_backend`` reuses an already created backend instead of looking up
+    the configured one for this question.
+
+    Each stage (``ocr``, ``model``, ``calibrate``, ``click``) is timed into
+    ``stats`` and, when :mod:`~quiz_automation.tracing` is enabled, recorded as
+    a child span of an ``answer_question`` trace.
     """
     start = time.time()
     ocr_text = ""
     option_texts: list[str] = []
     question_text = ""
     if client is not None or session_log is not None:
-        ocr_backend = ocr.get_backend(settings.ocr_backend)
-        ocr_text = ocr_backend(quiz_image)
+        with _stage(stats, "ocr"):
+            if ocr_backend is None:
+                ocr_backend = ocr.get_backend(settings.ocr_backend)
+            ocr_text = ocr_backend(quiz_image)
         lines = [line.strip() for line in ocr_text.splitlines() if line.strip()]
         question_lines: list[str] = []
         valid_letters = {o.upper() for o in options}
@@ -177,14 +228,17 @@ def answer_question(
                 question_lines.append(line)
         question_text = " ".join(question_lines)
 
-    if client is None:
-        send_to_chatgpt(quiz_image, chatgpt_box)
-        response = read_chatgpt_response(response_region, poll_interval=poll_interval)
-        matches = re.findall(r"[A-D]", response.upper())
-        letter = matches[-1] if matches else ""
-    else:
-        response = ""
-        letter = client.ask(question_text, option_texts).upper()
+    with _stage(stats, "model"):
+        if client is None:
+            send_to_chatgpt(quiz_image, chatgpt_box)
+            response = read_chatgpt_response(
+                response_region, poll_interval=poll_interval
+            )
+            matches = re.findall(r"[A-D]", response.upper())
+            letter = matches[-1] if matches else ""
+        else:
+            response = ""
+            letter = client.ask(question_text, option_texts).upper()
 
     try:
         idx = options.index(letter)
@@ -194,7 +248,17 @@ def answer_question(
         letter = letter or "A"
         idx = max(0, min(len(options) - 1, ord(letter) - ord("A")))
 
-    click_option(option_base, idx)
+    targets = None
+    if calibrator is not None:
+        with _stage(stats, "calibrate"):
+            targets = calibrator.targets(quiz_image, len(options))
+    with _stage(stats, "click"):
+        if clicker is not None:
+            clicker.click_option(idx, targets or None)
+        elif targets:
+            click_option(option_base, idx, targets=targets)
+        else:
+            click_option(option_base, idx)
     logger.info("ChatGPT chose %s", letter)
 
     duration = time.time() - start
@@ -211,8 +275,11 @@ def answer_question(
             "duration": duration,
             "tokens": tokens,
         }
-        json.dump(record, session_log)
-        session_log.write("\n")
-        session_log.flush()
+        if isinstance(session_log, SessionLogWriter):
+            session_log.log(record)
+        else:
+            json.dump(record, session_log)
+            session_log.write("\n")
+            session_log.flush()
 
     return letter
@@ -0,0 +1,183 @@
+"""Locate answer options on screen instead of assuming a fixed spacing.
+
+:class:`OptionCalibrator` runs an
+:class:`~quiz_automation.cv_expert.AdvancedUIDetector` over the captured quiz
+frame and turns the detected option elements into screen click targets.  The
+result is cached under a coarse fingerprint of the column holding the option
+controls, so the question and answer text beside them can change freely and
+detection only runs again when the controls themselves move.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Collection, List, Optional, Tuple
+
+from .cv_expert import AdvancedUIDetector, ElementTracker
+from .logger import get_logger
+from .stats import Stats
+from .types import Point, Region
+
+try:  # pragma: no cover - optional heavy dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+logger = get_logger(__name__)
+
+
+def frame_fingerprint(
+    frame: Any,
+    grid: int = 16,
+    levels: int = 8,
+    columns: Tuple[int, int] | None = None,
+) -> str:
+    """Return a hash of *frame*'s coarse layout.
+
+    The frame is reduced to a ``grid`` x ``grid`` mean-brightness thumbnail
+    quantised to ``levels`` steps, which ignores noise while reacting to
+    elements moving around.  ``columns`` restricts the thumbnail to the pixel
+    columns ``start:stop``, masking out everything beside them such as the
+    option text.  Without NumPy the raw pixel bytes are hashed instead.
+    """
+    if np is None:  # pragma: no cover - exercised without NumPy
+        data = getattr(frame, "rgb", None) or bytes(frame)
+        return hashlib.sha1(data).hexdigest()  # nosec B324 - not security
+    if hasattr(frame, "rgb") and hasattr(frame, "size"):
+        width, height = frame.size
+        arr = np.frombuffer(frame.rgb, dtype=np.uint8).reshape(height, width, 3)
+    else:
+        arr = np.asarray(frame)
+    if arr.ndim == 3:
+        arr = arr[..., :3].mean(axis=2)
+    if columns is not None:
+        arr = arr[:, columns[0] : columns[1]]
+    height, width = arr.shape
+    rows = np.linspace(0, height, grid + 1).astype(np.intp)
+    cols = np.linspace(0, width, grid + 1).astype(np.intp)
+    # Mean over each cell via a summed-area table.
+    table = np.pad(arr.astype(np.float64).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    sums = (
+        table[rows[1:, None], cols[1:]]
+        - table[rows[:-1, None], cols[1:]]
+        - table[rows[1:, None], cols[:-1]]
+        + table[rows[:-1, None], cols[:-1]]
+    )
+    areas = np.maximum(np.diff(rows)[:, None] * np.diff(cols), 1)
+    thumb = (sums / areas * levels / 256).astype(np.uint8)
+    header = f"{width}x{height}:{columns}:".encode()
+    return hashlib.sha1(header + thumb.tobytes()).hexdigest()  # nosec B324
+
+
+class OptionCalibrator:
+    """Map answer indices to detected click targets, cached per layout.
+
+    Parameters
+    ----------
+    detector:
+        Detector returning the option elements of a quiz frame.  Wrap it in
+        an :class:`~quiz_automation.cv_expert.ElementTracker` so layout
+        changes are followed with local searches instead of full detections.
+    region:
+        Screen region the frames were captured from; detections are offset by
+        its origin to obtain screen coordinates.
+    names:
+        Element names treated as options.  ``None`` accepts every element.
+    max_layouts:
+        Number of fingerprints remembered.
+    stats:
+        When given, cache hits and misses are counted as
+        ``calibration_hits`` and ``calibration_misses``.
+
+    Once options have been detected, frames are fingerprinted over the
+    columns spanned by the detected controls only, so a new question with the
+    same layout is a cache hit.  :meth:`targets`, :meth:`relocate` and
+    :meth:`invalidate` share a lock, so the region can be moved from another
+    thread while a worker calibrates.
+    """
+
+    def __init__(
+        self,
+        detector: AdvancedUIDetector | ElementTracker,
+        region: Region,
+        names: Collection[str] | None = None,
+        max_layouts: int = 32,
+        stats: Stats | None = None,
+    ) -> None:
+        """Create a calibrator with an empty layout cache."""
+        self.detector = detector
+        self.region = region
+        self.names = set(names) if names is not None else None
+        self.max_layouts = max_layouts
+        self.stats = stats
+        self._layouts: "OrderedDict[str, Optional[List[Point]]]" = OrderedDict()
+        self._columns: Tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def detect(self, frame: Any, count: int) -> Optional[List[Point]]:
+        """Run detection and return ``count`` screen targets, or ``None``.
+
+        The columns spanned by the detected elements become the region used
+        to fingerprint later frames.
+        """
+        elements = [
+            e
+            for e in self.detector.detect_elements(frame)
+            if self.names is None or e.name in self.names
+        ]
+        if elements:
+            self._columns = (
+                min(e.bbox[0] for e in elements),
+                max(e.bbox[0] + e.bbox[2] for e in elements),
+            )
+        if len(elements) < count:
+            logger.debug("Calibration found %d of %d options", len(elements), count)
+            return None
+        return [
+            Point(self.region.left + x + w // 2, self.region.top + y + h // 2)
+            for x, y, w, h in (e.bbox for e in elements[:count])
+        ]
+
+    def targets(self, frame: Any, count: int) -> Optional[List[Point]]:
+        """Return click targets for ``count`` options in *frame*.
+
+        ``None`` means the options could not be located; callers should fall
+        back to fixed offsets.  Failed detections are cached too, so an
+        unrecognised layout costs one detection rather than one per question.
+        """
+        with self._lock:
+            key = self._key(frame, count)
+            if key in self._layouts:
+                self._layouts.move_to_end(key)
+                if self.stats is not None:
+                    self.stats.increment("calibration_hits")
+                return self._layouts[key]
+            if self.stats is not None:
+                self.stats.increment("calibration_misses")
+            targets = self.detect(frame, count)
+            self._layouts[self._key(frame, count)] = targets
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+            return targets
+
+    def _key(self, frame: Any, count: int) -> str:
+        columns = self._columns
+        return f"{count}:{columns}:{frame_fingerprint(frame, columns=columns)}"
+
+    def relocate(self, region: Region) -> None:
+        """Move to screen *region* and forget the layouts of the old one."""
+        with self._lock:
+            self.region = region
+            self._layouts.clear()
+            self._columns = None
+
+    def invalidate(self) -> None:
+        """Forget all cached layouts."""
+        with self._lock:
+            self._layouts.clear()
+            self._columns = None
+
+
+__all__ = ["OptionCalibrator", "frame_fingerprint"]
@@ -0,0 +1,330 @@
+"""Screen capture sources, frame recording and offline replay.
+
+:class:`QuizRunner <quiz_automation.runner.QuizRunner>` and
+:class:`Watcher <quiz_automation.watcher.Watcher>` obtain frames from a
+:class:`CaptureSource`.  Besides the live :class:`ScreenCapture` this module
+provides:
+
+* :class:`FrameRecorder` / :class:`RecordingCapture` – store every captured
+  frame in a directory.  Identical frames are stored once (keyed by their
+  BLAKE2 digest) as gzip-compressed raw RGB, and ``index.jsonl`` lists every
+  capture as ``{"t": seconds, "frame": digest, "size": [w, h]}``.
+* :class:`ReplayCapture` – feed a recording back, either as fast as the
+  pipeline consumes frames or at the recorded pace scaled by ``speed``.
+* :class:`~quiz_automation.virtual_screen.VirtualScreen` – render synthetic
+  quiz frames in memory for load tests.
+
+Sources are registered by name like OCR backends; see
+:func:`get_capture_source`.
+
+Together with a stub model client and
+:class:`~quiz_automation.clicker.NullClicker` a recording reproduces a session
+deterministically without a display.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from . import automation
+from .types import Region
+from .virtual_screen import VirtualScreen
+
+INDEX_FILE = "index.jsonl"
+FRAME_SUFFIX = ".rgb.gz"
+
+
+class CaptureSource(Protocol):
+    """Provider of quiz frames."""
+
+    def grab(self, region: Region) -> Any:
+        """Return an image of *region*, or ``None`` once no frames are left."""
+
+
+@dataclass(frozen=True)
+class Frame:
+    """Raw RGB frame exposing the ``size``/``rgb`` attributes of an mss shot."""
+
+    size: Tuple[int, int]
+    rgb: bytes
+
+
+class ScreenCapture:
+    """Capture the live screen with :func:`pyautogui.screenshot`."""
+
+    def grab(self, region: Region) -> Any:
+        """Return a screenshot of *region*."""
+        return automation.pyautogui.screenshot(region=region.as_tuple())
+
+
+class MssCapture:
+    """Capture the live screen with :mod:`mss`.
+
+    Raises
+    ------
+    RuntimeError
+        On the first grab if :mod:`mss` is not installed.
+    """
+
+    def __init__(self) -> None:
+        """Create the capture; the mss handle is opened lazily."""
+        self._sct: Any = None
+
+    def grab(self, region: Region) -> Any:
+        """Return an mss shot of *region*."""
+        if self._sct is None:
+            try:
+                import mss  # type: ignore
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("mss not available") from exc
+            self._sct = mss.mss()
+        return self._sct.grab(
+            {
+                "left": region.left,
+                "top": region.top,
+                "width": region.width,
+                "height": region.height,
+            }
+        )
+
+
+def _numpy() -> Any:
+    """Return :mod:`numpy`, imported on first use, or ``None``."""
+    try:
+        import numpy  # type: ignore
+    except Exception:  # pragma: no cover - optional heavy dependency
+        return None
+    return numpy
+
+
+def frame_bytes(img: Any) -> Tuple[Tuple[int, int], bytes]:
+    """Return ``((width, height), rgb_bytes)`` for an mss shot, array or image.
+
+    Raises
+    ------
+    TypeError
+        If *img* is not a recognised image type.
+    """
+    if hasattr(img, "rgb") and hasattr(img, "size"):
+        return tuple(img.size), bytes(img.rgb)  # type: ignore[return-value]
+    np = _numpy() if type(img).__module__ == "numpy" else None
+    if np is not None and isinstance(img, np.ndarray):
+        arr = img if img.ndim == 3 else np.repeat(img[..., None], 3, axis=2)
+        arr = np.ascontiguousarray(arr[..., :3], dtype=np.uint8)
+        return (arr.shape[1], arr.shape[0]), arr.tobytes()
+    if hasattr(img, "convert") and hasattr(img, "tobytes"):
+        return tuple(img.size), img.convert("RGB").tobytes()  # type: ignore
+    raise TypeError(f"Cannot record frame of type {type(img).__name__}")
+
+
+class FrameRecorder:
+    """Store captured frames in *directory*, deduplicated and compressed.
+
+    ``frames`` counts recorded captures and ``unique`` the frames actually
+    written.  Timestamps in the index are seconds since the recorder was
+    created.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        compresslevel: int = 6,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Open (or append to) the recording in *directory*."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compresslevel = compresslevel
+        self._clock = clock
+        self._start = clock()
+        self._seen = {
+            p.name[: -len(FRAME_SUFFIX)]
+            for p in self.directory.glob(f"*{FRAME_SUFFIX}")
+        }
+        self._index = (self.directory / INDEX_FILE).open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.unique = 0
+
+    def record(self, img: Any) -> str:
+        """Store *img* and return its digest."""
+        size, data = frame_bytes(img)
+        digest = hashlib.blake2b(
+            f"{size[0]}x{size[1]}:".encode() + data, digest_size=16
+        ).hexdigest()
+        with self._lock:
+            if digest not in self._seen:
+                path = self.directory / f"{digest}{FRAME_SUFFIX}"
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(gzip.compress(data, self.compresslevel))
+                os.replace(tmp, path)
+                self._seen.add(digest)
+                self.unique += 1
+            entry = {"t": self._clock() - self._start, "frame": digest, "size": size}
+            self._index.write(json.dumps(entry) + "\n")
+            self.frames += 1
+        return digest
+
+    def close(self) -> None:
+        """Flush and close the index."""
+        with self._lock:
+            self._index.close()
+
+
+class RecordingCapture:
+    """Capture from *source* and record every frame with *recorder*."""
+
+    def __init__(self, source: CaptureSource, recorder: FrameRecorder) -> None:
+        """Wrap *source*."""
+        self.source = source
+        self.recorder = recorder
+
+    def grab(self, region: Region) -> Any:
+        """Return the next frame of *source* after recording it."""
+        img = self.source.grab(region)
+        if img is not None:
+            self.recorder.record(img)
+        return img
+
+
+class ReplayCapture:
+    """Replay a :class:`FrameRecorder` directory as a capture source.
+
+    Frames are returned as ``(height, width, 3)`` NumPy arrays, or as
+    :class:`Frame` objects without NumPy; the requested region is ignored.
+
+    Parameters
+    ----------
+    directory:
+        Recording to replay.
+    speed:
+        ``None`` returns frames as fast as they are requested.  Otherwise
+        frames are held back to the recorded timing divided by ``speed``
+        (``1.0`` is real time).
+    loop:
+        Start over at the end instead of returning ``None``.
+    cache_size:
+        Number of decoded frames kept in memory.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        speed: float | None = None,
+        loop: bool = False,
+        cache_size: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Read the recording index."""
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than 0")
+        self.directory = Path(directory)
+        self.speed = speed
+        self.loop = loop
+        self.cache_size = cache_size
+        self._clock = clock
+        self._sleep = sleep
+        self.entries: List[Tuple[float, str, Tuple[int, int]]] = []
+        with (self.directory / INDEX_FILE).open(encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries.append(
+                        (float(entry["t"]), entry["frame"], tuple(entry["size"]))
+                    )
+        self._pos = 0
+        self._origin: Optional[float] = None
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _decode(self, digest: str, size: Tuple[int, int]) -> Any:
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+        path = self.directory / f"{digest}{FRAME_SUFFIX}"
+        data = gzip.decompress(path.read_bytes())
+        np = _numpy()
+        if np is not None:
+            width, height = size
+            img = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+        else:  # pragma: no cover - exercised without NumPy
+            img = Frame(size, data)
+        self._cache[digest] = img
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return img
+
+    def grab(self, region: Region | None = None) -> Any:
+        """Return the next recorded frame, or ``None`` at the end."""
+        with self._lock:
+            if self._pos >= len(self.entries):
+                if not self.loop or not self.entries:
+                    return None
+                self._pos = 0
+                self._origin = None
+            t, digest, size = self.entries[self._pos]
+            self._pos += 1
+            if self.speed is not None:
+                if self._origin is None:
+                    self._origin = self._clock() - t / self.speed
+                delay = self._origin + t / self.speed - self._clock()
+                if delay > 0:
+                    self._sleep(delay)
+            return self._decode(digest, size)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# -- source registry ----------------------------------------------------
+
+_SOURCES: Dict[str, Callable[..., CaptureSource]] = {
+    "screen": ScreenCapture,
+    "mss": MssCapture,
+    "replay": ReplayCapture,
+    "virtual": VirtualScreen,
+}
+
+
+def register_capture_source(name: str, factory: Callable[..., CaptureSource]) -> None:
+    """Register *factory* as capture source *name*."""
+    _SOURCES[name] = factory
+
+
+def get_capture_source(name: str = "screen", **kwargs: Any) -> CaptureSource:
+    """Create the capture source registered as *name* with ``kwargs``.
+
+    Raises
+    ------
+    RuntimeError
+        If *name* is not registered.
+    """
+    try:
+        factory = _SOURCES[name]
+    except KeyError:
+        raise RuntimeError(f"Unknown capture source '{name}'") from None
+    return factory(**kwargs)
+
+
+__all__ = [
+    "CaptureSource",
+    "Frame",
+    "FrameRecorder",
+    "MssCapture",
+    "RecordingCapture",
+    "ReplayCapture",
+    "ScreenCapture",
+    "frame_bytes",
+    "get_capture_source",
+    "register_capture_source",
+]
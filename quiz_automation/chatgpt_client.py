@@ -3,16 +3,10 @@
 from __future__ import annotations
 
 import time
-from typing import List, Literal, Optional
+from typing import Any, List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, ValidationError
 
-try:  # pragma: no cover - optional dependency
-    from openai import APIConnectionError, APITimeoutError, OpenAI, RateLimitError
-except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
-    APITimeoutError = APIConnectionError = RateLimitError = ()  # type: ignore
-
 from .config import settings
 from .model_client import ModelClientProtocol
 
@@ -23,16 +17,32 @@ class QuizAnswer(BaseModel):
     answer: Literal["A", "B", "C", "D"]
 
 
-if isinstance(APITimeoutError, type):
+# The OpenAI SDK takes a noticeable share of start-up time, so it is only
+# imported by :func:`_load_openai` when the first client is created.
+OpenAI: Any = None
+TRANSIENT_ERRORS: Tuple[type[BaseException], ...] = (TimeoutError, ConnectionError)
+_openai_loaded = False
+
+
+def _load_openai() -> None:
+    """Import the OpenAI SDK and bind :data:`OpenAI` and its transient errors."""
+    global OpenAI, TRANSIENT_ERRORS, _openai_loaded
+    if _openai_loaded:
+        return
+    _openai_loaded = True
+    try:  # pragma: no cover - optional dependency
+        import openai  # type: ignore
+    except Exception:  # pragma: no cover
+        return
+    if OpenAI is None:  # pragma: no branch - keep a stand-in set by tests
+        OpenAI = openai.OpenAI
     TRANSIENT_ERRORS = (
-        APITimeoutError,
-        APIConnectionError,
-        RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
         TimeoutError,
         ConnectionError,
     )
-else:  # pragma: no cover - openai not installed
-    TRANSIENT_ERRORS = (TimeoutError, ConnectionError)
 
 
 class ChatGPTClient(ModelClientProtocol):
@@ -40,6 +50,7 @@ class ChatGPTClient(ModelClientProtocol):
 
     def __init__(self, api_key: Optional[str] = None) -> None:
         """Create a client using ``api_key`` or configured settings."""
+        _load_openai()
         if OpenAI is None:  # pragma: no cover
             raise RuntimeError("openai package not available")
         self.client = OpenAI(api_key=api_key or settings.openai_api_key)
@@ -10,26 +10,31 @@ monkeypatched for unit tests.
 
 from __future__ import annotations
 
-try:  # pragma: no cover - optional heavy dependency
-    import pyautogui  # type: ignore
-except Exception:  # pragma: no cover
-    # ``pyautogui`` is not available.  Provide a minimal mock so the rest of the
-    # code can still be exercised.  Each attribute mirrors the functions used in
-    # this module and can be monkeypatched in tests if required.
-    from types import SimpleNamespace
+from types import SimpleNamespace
+from typing import Any, List, Sequence
 
-    pyautogui = SimpleNamespace(  # type: ignore[attr-defined]
-        moveTo=lambda *_, **__: None,
-        click=lambda *_, **__: None,
-    )
+from .utils import LazyModule
 
-__all__ = ["Clicker", "move_to", "click", "click_at"]
+# ``pyautogui`` is imported on first use.  When it is not available a minimal
+# mock lets the rest of the code be exercised.  Each attribute mirrors the
+# functions used in this module and can be monkeypatched in tests if required.
+pyautogui: Any = LazyModule(
+    "pyautogui",
+    SimpleNamespace(moveTo=lambda *_, **__: None, click=lambda *_, **__: None),
+)
+
+__all__ = ["Clicker", "NullClicker", "move_to", "click", "click_at"]
 
 
 class Clicker:
     """Encapsulate mouse movement and clicking via :mod:`pyautogui`."""
 
-    def __init__(self, base: tuple[int, int] = (0, 0), offset: int = 40) -> None:
+    def __init__(
+        self,
+        base: tuple[int, int] = (0, 0),
+        offset: int = 40,
+        targets: Sequence[tuple[int, int]] | None = None,
+    ) -> None:
         """Initialize the clicker with ``base`` coordinates and ``offset``.
 
         Parameters
@@ -38,9 +43,13 @@ class Clicker:
             Screen coordinates of the first option.  Defaults to ``(0, 0)``.
         offset:
             Vertical distance in pixels between successive options.
+        targets:
+            Calibrated screen coordinates of each option.  When an index is
+            covered by ``targets`` it takes precedence over ``base``/``offset``.
         """
         self.base = base
         self.offset = offset
+        self.targets = list(targets) if targets is not None else []
 
     def move(self, x: int, y: int) -> None:
         """Move the mouse cursor to ``(x, y)``."""
@@ -59,12 +68,46 @@ class Clicker:
         self.move(x, y)
         self.click()
 
-    def click_option(self, index: int) -> None:
-        """Click the option at ``index`` relative to ``base`` and ``offset``."""
+    def click_option(
+        self, index: int, targets: Sequence[tuple[int, int]] | None = None
+    ) -> None:
+        """Click the option at ``index``.
+
+        Uses the calibrated target when available, otherwise ``base`` shifted
+        down by ``index * offset``.  ``targets`` replaces :attr:`targets` for
+        this click.
+        """
+        targets = self.targets if targets is None else targets
+        if 0 <= index < len(targets):
+            x, y = targets[index]
+            self.click_at(x, y)
+            return
         x, y = self.base
         self.click_at(x, y + index * self.offset)
 
 
+class NullClicker(Clicker):
+    """Clicker that records positions instead of moving the mouse.
+
+    Used when replaying recorded frames offline; :attr:`clicks` lists the
+    ``(x, y)`` positions that would have been clicked.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Accept the :class:`Clicker` arguments."""
+        super().__init__(*args, **kwargs)
+        self.clicks: List[tuple[int, int]] = []
+        self._pos = (0, 0)
+
+    def move(self, x: int, y: int) -> None:
+        """Remember ``(x, y)`` as the cursor position."""
+        self._pos = (x, y)
+
+    def click(self) -> None:
+        """Record a click at the remembered position."""
+        self.clicks.append(self._pos)
+
+
 _default_clicker = Clicker()
 
 
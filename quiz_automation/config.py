@@ -1,7 +1,20 @@
-"""Configuration handling for the quiz automation package."""
+"""Configuration handling for the quiz automation package.
+
+Configuration is loaded and validated once by a :class:`SettingsRegistry`,
+which hands out immutable :class:`SettingsSnapshot` objects.  Reading a
+snapshot costs nothing, so threads can fetch :meth:`SettingsRegistry.current`
+for every unit of work instead of constructing :class:`Settings` again.  The
+registry re-validates only when :meth:`SettingsRegistry.reload` notices that
+its ``.env`` file changed, optionally from a background polling thread.
+"""
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +30,20 @@ class Settings(BaseSettings):
     poll_interval: float = 1.0
     temperature: float = 0.0
     ocr_backend: str | None = None
+    ocr_preprocess: bool = False
+    ocr_preprocess_steps: list[str] = [
+        "grayscale",
+        "scale",
+        "threshold",
+        "crop",
+        "deskew",
+    ]
+    ocr_scale: float = 1.0
+    ocr_threshold_block: int = 31
+    trace_enabled: bool = False
+    trace_path: str | None = None
+    metrics_host: str = "127.0.0.1"
+    trace_sample_rate: float = 1.0
 
     quiz_region: Region = Region(100, 100, 600, 400)
     chat_box: Point = Point(800, 900)
@@ -39,7 +66,222 @@ class Settings(BaseSettings):
             raise ValueError("temperature must be non-negative")
         return v
 
+    @field_validator("trace_sample_rate")
+    @classmethod
+    def _check_trace_sample_rate(cls, v: float) -> float:
+        if not 0 <= v <= 1:
+            raise ValueError("trace_sample_rate must be between 0 and 1")
+        return v
+
+    @field_validator("ocr_scale")
+    @classmethod
+    def _check_ocr_scale(cls, v: float) -> float:
+        if v <= 0:
+            raise ValueError("ocr_scale must be greater than 0")
+        return v
+
+    @field_validator("ocr_threshold_block")
+    @classmethod
+    def _check_ocr_threshold_block(cls, v: int) -> int:
+        if v < 3 or v % 2 == 0:
+            raise ValueError("ocr_threshold_block must be an odd number >= 3")
+        return v
+
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsSnapshot(Settings):
+    """Validated, immutable configuration handed out by :class:`SettingsRegistry`."""
+
+    model_config = SettingsConfigDict(frozen=True)
+
+
+class SettingsRegistry:
+    """Load :class:`Settings` once and share immutable snapshots.
+
+    Parameters
+    ----------
+    env_file:
+        Optional ``.env`` file read in addition to the environment.  Its
+        modification time is checked by :meth:`reload`.
+    factory:
+        Callable building a validated settings object; keyword ``overrides``
+        and ``_env_file`` are passed to it.
+    """
+
+    def __init__(
+        self,
+        env_file: str | os.PathLike[str] | None = None,
+        factory: Callable[..., Any] = SettingsSnapshot,
+        **overrides: Any,
+    ) -> None:
+        """Create a registry; nothing is loaded until first use."""
+        self.env_file = env_file
+        self.factory = factory
+        self.overrides: Dict[str, Any] = overrides
+        self._snapshot: Any = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[Any], None]] = []
+        self._watch_stop: Optional[threading.Event] = None
+        self.loads = 0
+
+    # -- loading -------------------------------------------------------
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        if self.env_file is None:
+            return None
+        try:
+            st = os.stat(self.env_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self) -> Any:
+        kwargs = dict(self.overrides)
+        if self.env_file is not None:
+            kwargs["_env_file"] = self.env_file
+        stamp = self._file_stamp()
+        snapshot = self.factory(**kwargs)
+        self.loads += 1
+        self._stamp = stamp
+        return snapshot
+
+    def _publish(self, snapshot: Any) -> Any:
+        self._snapshot = snapshot
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception:  # pragma: no cover - listener bugs are logged
+                logger.exception("Settings listener failed")
+        return snapshot
+
+    def current(self) -> Any:
+        """Return the current snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                snapshot = self._snapshot
+        return snapshot
+
+    def configure(
+        self, env_file: str | os.PathLike[str] | None = None, **overrides: Any
+    ) -> Any:
+        """Load settings from *env_file* with ``overrides`` and return them.
+
+        Overrides whose value is ``None`` are ignored so command-line options
+        that were not given fall back to the environment.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            If the configuration is invalid; the previous snapshot is kept.
+        """
+        with self._lock:
+            self.env_file = env_file
+            self.overrides = {k: v for k, v in overrides.items() if v is not None}
+            return self._publish(self._load())
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-validate if the ``.env`` file changed (or *force*).
+
+        Invalid files are logged and leave the current snapshot in place.
+        Returns whether a new snapshot was published.
+        """
+        with self._lock:
+            if not force and (
+                self._snapshot is None or self._file_stamp() == self._stamp
+            ):
+                return False
+            try:
+                snapshot = self._load()
+            except Exception:
+                self._stamp = self._file_stamp()
+                logger.exception("Invalid configuration in %s", self.env_file)
+                return False
+            self._publish(snapshot)
+            return True
+
+    def override(self, **values: Any) -> Any:
+        """Publish a copy of the current snapshot with *values* replaced.
+
+        Unlike :meth:`configure` this does not re-read or re-validate
+        anything; it is meant for tests and programmatic tweaks.
+        """
+        with self._lock:
+            return self._publish(self.current().model_copy(update=values))
+
+    def reset(self) -> None:
+        """Forget the loaded snapshot, file and overrides."""
+        with self._lock:
+            self.env_file = None
+            self.overrides = {}
+            self._snapshot = None
+            self._stamp = None
+
+    # -- change notification -------------------------------------------
+    def subscribe(self, listener: Callable[[Any], None]) -> Callable[[], None]:
+        """Call *listener* with every newly published snapshot.
+
+        Returns a function removing the listener again.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Poll the ``.env`` file every *interval* seconds and reload on change."""
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        self.stop_watching()
+        stop = self._watch_stop = threading.Event()
+
+        def poll() -> None:
+            while not stop.wait(interval):
+                self.reload()
+
+        threading.Thread(target=poll, name="settings-watch", daemon=True).start()
+
+    def stop_watching(self) -> None:
+        """Stop the polling thread started by :meth:`watch`."""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+
+class _CurrentSettings:
+    """Attribute view of the registry's current snapshot.
+
+    Assigning an attribute publishes a new snapshot through
+    :meth:`SettingsRegistry.override`.
+    """
+
+    __slots__ = ("_registry",)
+
+    def __init__(self, registry: SettingsRegistry) -> None:
+        object.__setattr__(self, "_registry", registry)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._registry.current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._registry.override(**{name: value})
+
+    def __repr__(self) -> str:
+        return f"<current settings {self._registry.current()!r}>"
+
+
+#: Process-wide registry used by the CLI and the module-level ``settings``.
+settings_registry = SettingsRegistry()
 
-# A module-level settings instance convenient for components that do not need
-# their own configuration object.
-settings = Settings()
+# A module-level view of the current settings convenient for components that
+# do not need their own configuration object.
+settings: Any = _CurrentSettings(settings_registry)
@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Tuple
+from pathlib import Path
+from typing import Any, List, Mapping, Sequence, Tuple
+
+from .types import Region
 
 try:  # pragma: no cover - optional heavy dependency
-    import cv2  # type: ignore
     import numpy as np  # type: ignore
 except Exception:  # pragma: no cover
-    cv2 = None  # type: ignore
     np = None  # type: ignore
 
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
 
 @dataclass
 class UIElement:
@@ -22,40 +30,321 @@ class UIElement:
     confidence: float
 
 
+def non_max_suppression(
+    boxes: Sequence[Tuple[int, int, int, int]],
+    scores: Sequence[float],
+    iou_threshold: float = 0.3,
+) -> List[int]:
+    """Return indices of the boxes kept by greedy non-maximum suppression.
+
+    ``boxes`` are ``(x, y, w, h)``.  Boxes are visited from the highest score
+    down and dropped when their intersection-over-union with an already kept
+    box exceeds ``iou_threshold``.
+    """
+    if not len(boxes):
+        return []
+    b = np.asarray(boxes, dtype=np.float64)
+    x1, y1 = b[:, 0], b[:, 1]
+    x2, y2 = x1 + b[:, 2], y1 + b[:, 3]
+    areas = b[:, 2] * b[:, 3]
+    order = np.argsort(np.asarray(scores, dtype=np.float64))[::-1]
+    keep: List[int] = []
+    while order.size:
+        i = int(order[0])
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter)
+        order = rest[iou <= iou_threshold]
+    return keep
+
+
+@dataclass
+class _Variant:
+    """A template resized for one search scale, with its coarse counterpart."""
+
+    name: str
+    image: Any
+    coarse: Any
+    factor: int
+
+
 class AdvancedUIDetector:
-    """Locate quiz checkboxes via simple template matching.
+    """Locate quiz UI elements by multi-scale, multi-template matching.
+
+    Every template is searched at each of ``scales`` (to cope with DPI
+    scaling) and all matches scoring at least ``threshold`` are returned after
+    non-maximum suppression, in reading order.  Search runs coarse to fine:
+    frame and template are first matched ``2 ** pyramid_levels`` times smaller
+    and only windows around coarse hits are re-matched at full resolution.
+    Templates too small to shrink (below ``min_template`` pixels on a side
+    after shrinking) are matched at full resolution directly.
 
-    The implementation is intentionally lightweight so unit tests can mock
-    OpenCV calls.  A production version would include more robust handling and
-    additional heuristics.
+    Parameters
+    ----------
+    template_path:
+        Optional single template loaded under the name ``"checkbox"``.
+    templates:
+        Mapping of element names to template paths or grayscale arrays.
+    roi:
+        Default region of the frame to search, in frame coordinates.
     """
 
-    def __init__(self, template_path: str | None = None) -> None:
-        """Initialise the detector, optionally loading a template image."""
+    def __init__(
+        self,
+        template_path: str | None = None,
+        templates: Mapping[str, Any] | None = None,
+        scales: Sequence[float] = (1.0,),
+        threshold: float = 0.8,
+        nms_threshold: float = 0.3,
+        roi: Region | None = None,
+        pyramid_levels: int = 2,
+        min_template: int = 8,
+        coarse_slack: float = 0.15,
+    ) -> None:
+        """Initialise the detector and load any templates."""
         self.template_path = template_path
         self.template = None
-        if template_path and cv2 is not None:
+        self.templates: dict[str, Any] = {}
+        self.scales = tuple(scales)
+        self.threshold = threshold
+        self.nms_threshold = nms_threshold
+        self.roi = roi
+        self.pyramid_levels = pyramid_levels
+        self.min_template = min_template
+        self.coarse_slack = coarse_slack
+        if cv2 is None:
+            return
+        if template_path:
             try:  # pragma: no cover - file IO
                 self.template = cv2.imread(template_path, 0)
             except Exception:
                 self.template = None
+            if self.template is not None:
+                self.templates["checkbox"] = self.template
+        for name, source in (templates or {}).items():
+            image = (
+                cv2.imread(str(source), 0)
+                if isinstance(source, (str, Path))
+                else source
+            )
+            if image is not None:
+                self.templates[name] = image
+        self._variants = [
+            self._variant(name, image, scale)
+            for name, image in self.templates.items()
+            for scale in self.scales
+        ]
 
-    def detect_elements(self, frame) -> List[UIElement]:
-        """Return a list of detected UI elements.
+    @classmethod
+    def from_directory(cls, path: str | Path, **kwargs: Any) -> "AdvancedUIDetector":
+        """Load every ``*.png`` in *path* as a template named after its stem."""
+        templates = {p.stem: p for p in sorted(Path(path).glob("*.png"))}
+        return cls(templates=templates, **kwargs)
 
-        A real implementation would perform template matching and contour
-        analysis.  Here we simply return an empty list when OpenCV is missing or
-        when no template is supplied.
+    @staticmethod
+    def _resize(image: Any, width: int, height: int) -> Any:
+        return cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+    def _variant(self, name: str, image: Any, scale: float) -> _Variant:
+        if scale != 1.0:
+            h, w = image.shape[:2]
+            image = self._resize(
+                image, max(1, round(w * scale)), max(1, round(h * scale))
+            )
+        factor = 1
+        h, w = image.shape[:2]
+        for _ in range(self.pyramid_levels):
+            if min(h, w) // (factor * 2) < self.min_template:
+                break
+            factor *= 2
+        coarse = self._resize(image, w // factor, h // factor) if factor > 1 else image
+        return _Variant(name, image, coarse, factor)
+
+    @staticmethod
+    def _gray(frame: Any) -> Any:
+        frame = np.asarray(frame)
+        if frame.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            frame = cv2.cvtColor(frame, code)
+        return frame
+
+    @staticmethod
+    def _peaks(result: Any, threshold: float) -> List[Tuple[float, int, int]]:
+        ys, xs = np.nonzero(result >= threshold)
+        return [(float(result[y, x]), int(x), int(y)) for y, x in zip(ys, xs)]
+
+    def _match(self, gray: Any, variant: _Variant) -> List[Tuple[float, int, int]]:
+        """Return ``(score, x, y)`` matches of *variant* in *gray*."""
+        h, w = variant.image.shape[:2]
+        height, width = gray.shape[:2]
+        if height < h or width < w:
+            return []
+        f = variant.factor
+        if f == 1:
+            result = cv2.matchTemplate(gray, variant.image, cv2.TM_CCOEFF_NORMED)
+            return self._peaks(result, self.threshold)
+
+        small = self._resize(gray, width // f, height // f)
+        result = cv2.matchTemplate(small, variant.coarse, cv2.TM_CCOEFF_NORMED)
+        coarse = self._peaks(result, self.threshold - self.coarse_slack)
+        ch, cw = variant.coarse.shape[:2]
+        keep = non_max_suppression(
+            [(x, y, cw, ch) for _, x, y in coarse],
+            [s for s, _, _ in coarse],
+            self.nms_threshold,
+        )
+        matches = []
+        for i in keep:
+            _, cx, cy = coarse[i]
+            # Refine inside the full-resolution cell the coarse hit covers.
+            x0, y0 = max(cx * f - f, 0), max(cy * f - f, 0)
+            window = gray[
+                y0 : min(cy * f + h + 2 * f, height),
+                x0 : min(cx * f + w + 2 * f, width),
+            ]
+            if window.shape[0] < h or window.shape[1] < w:
+                continue
+            refined = cv2.matchTemplate(window, variant.image, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (bx, by) = cv2.minMaxLoc(refined)
+            if score >= self.threshold:
+                matches.append((float(score), x0 + bx, y0 + by))
+        return matches
+
+    def _detect(
+        self, gray: Any, roi: Region | None
+    ) -> List[Tuple[UIElement, _Variant]]:
+        """Return matched elements in reading order with their template variant."""
+        ox = oy = 0
+        if roi is not None:
+            ox, oy = roi.left, roi.top
+            gray = gray[oy : oy + roi.height, ox : ox + roi.width]
+
+        found, boxes, scores = [], [], []
+        for variant in self._variants:
+            h, w = variant.image.shape[:2]
+            for score, x, y in self._match(gray, variant):
+                found.append(variant)
+                boxes.append((x + ox, y + oy, w, h))
+                scores.append(score)
+        keep = non_max_suppression(boxes, scores, self.nms_threshold)
+        matches = [
+            (UIElement(found[i].name, boxes[i], scores[i]), found[i]) for i in keep
+        ]
+        return sorted(matches, key=lambda m: (m[0].bbox[1], m[0].bbox[0]))
+
+    def detect_elements(self, frame, roi: Region | None = None) -> List[UIElement]:
+        """Return all matched UI elements in reading order.
+
+        ``roi`` (or the detector's default ``roi``) limits the search to part
+        of *frame*; returned boxes are always in full-frame coordinates.  An
+        empty list is returned when OpenCV is missing or no template loaded.
         """
-        if cv2 is None or self.template is None:
+        if cv2 is None or np is None or not self.templates:
             return []
-        result = cv2.matchTemplate(frame, self.template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        h, w = self.template.shape[:2]
-        if max_val > 0.8:
-            x, y = max_loc
-            return [UIElement("checkbox", (x, y, w, h), float(max_val))]
-        return []
+        return [e for e, _ in self._detect(self._gray(frame), roi or self.roi)]
+
+
+class ElementTracker:
+    """Follow detected UI elements from frame to frame.
+
+    After one full :meth:`AdvancedUIDetector.detect_elements` pass, each
+    element is re-matched only inside a window ``search_margin`` pixels
+    around its previous box, using the template variant that found it.  A
+    full detection runs again when an element is lost, when
+    :meth:`LayoutAnalyzer.needs_redetection` rejects the tracked confidences,
+    or every ``redetect_every`` frames to pick up new elements.  Results are
+    cached per exact frame content, so polling an unchanged screen costs one
+    hash.
+
+    :meth:`detect_elements` has the detector's signature, so a tracker can be
+    used wherever a detector is expected.
+    """
+
+    def __init__(
+        self,
+        detector: AdvancedUIDetector,
+        search_margin: int = 16,
+        min_score: float = 0.85,
+        redetect_every: int | None = 30,
+        cache_size: int = 16,
+    ) -> None:
+        """Wrap *detector*; nothing is tracked until the first frame."""
+        self.detector = detector
+        self.search_margin = search_margin
+        self.min_score = min_score
+        self.redetect_every = redetect_every
+        self.cache_size = cache_size
+        self.full_detections = 0
+        self.tracked_frames = 0
+        self._tracked: List[Tuple[UIElement, _Variant]] = []
+        self._since_full = 0
+        self._cache: "OrderedDict[bytes, List[UIElement]]" = OrderedDict()
+
+    @property
+    def elements(self) -> List[UIElement]:
+        """Return the elements found in the most recent frame."""
+        return [e for e, _ in self._tracked]
+
+    def reset(self) -> None:
+        """Drop tracked elements so the next frame runs a full detection."""
+        self._tracked = []
+        self._cache.clear()
+
+    def _track(self, gray: Any) -> List[Tuple[UIElement, _Variant]] | None:
+        """Re-match every tracked element near its last box, or ``None``."""
+        height, width = gray.shape[:2]
+        m = self.search_margin
+        updated = []
+        for element, variant in self._tracked:
+            x, y, w, h = element.bbox
+            x0, y0 = max(x - m, 0), max(y - m, 0)
+            window = gray[y0 : min(y + h + m, height), x0 : min(x + w + m, width)]
+            if window.shape[0] < h or window.shape[1] < w:
+                return None
+            result = cv2.matchTemplate(window, variant.image, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (bx, by) = cv2.minMaxLoc(result)
+            if score < self.detector.threshold:
+                return None
+            bbox = (x0 + bx, y0 + by, w, h)
+            updated.append((UIElement(element.name, bbox, float(score)), variant))
+        if LayoutAnalyzer.needs_redetection([e for e, _ in updated], self.min_score):
+            return None
+        return updated
+
+    def detect_elements(self, frame, roi: Region | None = None) -> List[UIElement]:
+        """Return the UI elements in *frame*, tracking where possible."""
+        if cv2 is None or np is None or not self.detector.templates:
+            return []
+        gray = np.ascontiguousarray(self.detector._gray(frame))
+        key = hashlib.blake2b(gray.data, digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        tracked = None
+        due = (
+            self.redetect_every is not None and self._since_full >= self.redetect_every
+        )
+        if self._tracked and not due:
+            tracked = self._track(gray)
+        if tracked is None:
+            tracked = self.detector._detect(gray, roi or self.detector.roi)
+            self.full_detections += 1
+            self._since_full = 0
+        else:
+            self.tracked_frames += 1
+            self._since_full += 1
+        self._tracked = tracked
+
+        elements = [e for e, _ in tracked]
+        self._cache[key] = elements
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(elements)
 
 
 class LayoutAnalyzer:
@@ -67,3 +356,14 @@ class LayoutAnalyzer:
         if not elements:
             return 0.0
         return sum(e.confidence for e in elements) / len(elements)
+
+    @classmethod
+    def needs_redetection(
+        cls, elements: List[UIElement], min_score: float = 0.85
+    ) -> bool:
+        """Return ``True`` when tracked *elements* are no longer trustworthy.
+
+        That is the case when nothing is tracked or the layout score (mean
+        confidence) has dropped below ``min_score``.
+        """
+        return not elements or cls.score_layout(elements) < min_score
@@ -0,0 +1,190 @@
+"""Rolling performance dashboard built from :class:`~quiz_automation.stats.Stats`.
+
+:class:`Dashboard` turns successive :class:`~quiz_automation.stats.StatsSnapshot`
+objects into fixed-size ring buffers of per-interval metrics: throughput in
+questions per minute, mean latency of every pipeline stage, gauges such as
+the runner's queue depth, cache hit ratios and the error rate.  Each sample
+only subtracts the previous snapshot's cumulative counters, so its cost does
+not depend on how long the session has been running, and memory is bounded by
+``capacity``.  Windowed histograms (``Stats(latency_window=...)``) are not
+cumulative, so their own mean is reported instead of a difference.
+:meth:`Dashboard.render` draws the buffers as text sparklines for
+:class:`~quiz_automation.gui.QuizGUI` or a terminal.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+from .stats import STAGES, StatsSnapshot
+
+#: Characters used by :func:`sparkline`, lowest to highest.
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values: Iterable[float], width: int | None = None) -> str:
+    """Return *values* drawn as a line of block characters.
+
+    Only the last *width* values are drawn.  The scale runs from zero to the
+    largest value shown, so a flat line at the bottom means "nothing".
+    """
+    data = list(values)
+    if width is not None:
+        data = data[-width:]
+    top = max(data, default=0.0)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(data)
+    steps = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(max(v, 0.0) / top * steps)] for v in data)
+
+
+class Dashboard:
+    """Ring buffers of per-interval metrics derived from stats snapshots.
+
+    Parameters
+    ----------
+    capacity:
+        Number of samples kept per series.
+    clock:
+        Time source used when :meth:`sample` is called without ``now``.
+    windowed:
+        Whether the sampled latency histograms only cover a trailing window.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 120,
+        clock: Callable[[], float] = time.monotonic,
+        windowed: bool = False,
+    ) -> None:
+        """Create an empty dashboard."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._clock = clock
+        self.windowed = windowed
+        self._previous: Optional[StatsSnapshot] = None
+        self._previous_time = 0.0
+        self.series: Dict[str, Deque[float]] = {}
+        self.hit_ratios: Dict[str, float] = {}
+
+    def _push(self, name: str, value: float) -> None:
+        buf = self.series.get(name)
+        if buf is None:
+            buf = self.series[name] = deque(maxlen=self.capacity)
+        buf.append(value)
+
+    def sample(self, snap: StatsSnapshot, now: float | None = None) -> bool:
+        """Add the interval since the previous snapshot to the buffers.
+
+        The first snapshot only sets the baseline.  Returns whether a sample
+        was added.
+        """
+        now = self._clock() if now is None else now
+        prev, prev_time = self._previous, self._previous_time
+        self._previous, self._previous_time = snap, now
+        for name, value in snap.gauges.items():
+            self._push(f"gauge:{name}", value)
+        if prev is None or now <= prev_time:
+            return False
+
+        counters, before = snap.counters, prev.counters
+        for prefix in {
+            name.rsplit("_", 1)[0]
+            for name in counters
+            if name.endswith(("_hits", "_misses"))
+        }:
+            hits = counters.get(f"{prefix}_hits", 0) - before.get(f"{prefix}_hits", 0)
+            misses = counters.get(f"{prefix}_misses", 0) - before.get(
+                f"{prefix}_misses", 0
+            )
+            # Keep the last ratio through intervals without any lookups.
+            if hits + misses > 0:
+                self.hit_ratios[prefix] = hits / (hits + misses)
+
+        answered = snap.questions_answered - prev.questions_answered
+        errors = snap.errors - prev.errors
+        self._push("throughput", answered * 60.0 / (now - prev_time))
+        self._push("error_rate", errors / (answered + errors) if errors else 0.0)
+        for stage, hist in snap.latency.items():
+            if self.windowed:
+                self._push(f"latency:{stage}", hist.mean)
+                continue
+            old = prev.latency.get(stage)
+            count = hist.count - (old.count if old else 0)
+            total = hist.total - (old.total if old else 0.0)
+            self._push(f"latency:{stage}", total / count if count > 0 else 0.0)
+        return True
+
+    def values(self, name: str) -> List[float]:
+        """Return the buffered values of series *name*, oldest first."""
+        return list(self.series.get(name, ()))
+
+    def latest(self, name: str) -> float:
+        """Return the newest value of series *name*, or ``0.0``."""
+        buf = self.series.get(name)
+        return buf[-1] if buf else 0.0
+
+    def stages(self) -> List[str]:
+        """Return the stages with latency series in pipeline order."""
+        names = [k.split(":", 1)[1] for k in self.series if k.startswith("latency:")]
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return sorted(names, key=lambda s: (order.get(s, len(order)), s))
+
+    def bottleneck(self, window: int = 10) -> Optional[str]:
+        """Return the stage with the highest mean latency over *window* samples.
+
+        The ``total`` stage is ignored; ``None`` means no stage took any time.
+        """
+        best, best_mean = None, 0.0
+        for stage in self.stages():
+            if stage == "total":
+                continue
+            recent = self.values(f"latency:{stage}")[-window:]
+            mean = sum(recent) / len(recent) if recent else 0.0
+            if mean > best_mean:
+                best, best_mean = stage, mean
+        return best
+
+    def render(self, width: int = 40) -> str:
+        """Return the dashboard as text, one sparkline per series."""
+        rows = [
+            (
+                "questions/min",
+                "throughput",
+                f"{self.latest('throughput'):.1f}",
+            ),
+            ("error rate", "error_rate", f"{self.latest('error_rate'):.1%}"),
+        ]
+        rows += [
+            (
+                f"{stage} latency",
+                f"latency:{stage}",
+                f"{self.latest(f'latency:{stage}') * 1000:.0f} ms",
+            )
+            for stage in self.stages()
+        ]
+        rows += [
+            (key.split(":", 1)[1], key, f"{self.latest(key):g}")
+            for key in sorted(self.series)
+            if key.startswith("gauge:")
+        ]
+        label_width = max(len(label) for label, _key, _value in rows)
+        lines = [
+            f"{label:<{label_width}} {sparkline(self.values(key), width):<{width}} "
+            f"{value}"
+            for label, key, value in rows
+        ]
+        lines += [
+            f"{prefix} hit ratio: {ratio:.1%}"
+            for prefix, ratio in sorted(self.hit_ratios.items())
+        ]
+        slowest = self.bottleneck()
+        if slowest is not None:
+            lines.append(f"Bottleneck: {slowest}")
+        return "\n".join(lines)
+
+
+__all__ = ["SPARK_CHARS", "Dashboard", "sparkline"]
@@ -1,25 +1,51 @@
-"""Simple PySide6 based GUI for displaying live quiz metrics."""
+"""Simple PySide6 based GUI for displaying live quiz metrics.
+
+Worker threads never touch Qt: :meth:`QuizGUI.update` only records that new
+statistics are available.  A ``QTimer`` in the GUI thread pulls a single
+:meth:`Stats.snapshot` per tick when something changed, so any number of
+updates between two ticks costs one repaint.  Once per ``sample_interval``
+the snapshot also feeds a :class:`~quiz_automation.dashboard.Dashboard`,
+whose sparklines are shown below the summary line.
+"""
 
 from __future__ import annotations
 
+import threading
+import time
 from typing import Optional, Callable, TYPE_CHECKING
 
+from .dashboard import Dashboard
 from .stats import Stats
 
 if TYPE_CHECKING:  # pragma: no cover - used only for type hints
     from .runner import QuizRunner
 
-try:  # pragma: no cover - optional graphical dependency
-    from PySide6.QtWidgets import (
-        QApplication,
-        QLabel,
-        QPushButton,
-        QVBoxLayout,
-        QHBoxLayout,
-        QWidget,
-    )
-except Exception:  # pragma: no cover - fall back when Qt is unavailable
-    QApplication = QLabel = QPushButton = QVBoxLayout = QHBoxLayout = QWidget = None  # type: ignore
+# Qt widgets are bound by ``_load_qt`` when the first window is created, so
+# importing this module does not load PySide6.
+QApplication = QLabel = QPushButton = QVBoxLayout = QHBoxLayout = QWidget = None  # type: ignore
+QTimer = None  # type: ignore
+_qt_loaded = False
+
+
+def _load_qt() -> None:
+    """Import the PySide6 widgets used by :class:`QuizGUI`, if available."""
+    global QApplication, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QWidget
+    global QTimer, _qt_loaded
+    if _qt_loaded:
+        return
+    _qt_loaded = True
+    try:  # pragma: no cover - optional graphical dependency
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import (
+            QApplication,
+            QLabel,
+            QPushButton,
+            QVBoxLayout,
+            QHBoxLayout,
+            QWidget,
+        )
+    except Exception:  # pragma: no cover - fall back when Qt is unavailable
+        pass
 
 
 class QuizGUI:
@@ -28,13 +54,45 @@ class QuizGUI:
     The widget is intentionally tiny so that unit tests can instantiate it
     without starting a full GUI environment. When PySide6 is not available, the
     class still stores the last rendered text for inspection by tests.
+
+    Parameters
+    ----------
+    refresh_interval:
+        Seconds between two repaints of the statistics.
+    dashboard:
+        Dashboard fed with the statistics; a new one by default.
+    sample_interval:
+        Seconds between two dashboard samples.  Samples are also taken while
+        no updates arrive, so a stalled pipeline shows as falling throughput.
+    clock:
+        Time source for the dashboard samples.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        refresh_interval: float = 0.25,
+        dashboard: Dashboard | None = None,
+        sample_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         """Create the GUI window and underlying Qt widgets."""
+        if refresh_interval <= 0:
+            raise ValueError("refresh_interval must be greater than 0")
+        self.refresh_interval = refresh_interval
+        self.dashboard = dashboard or Dashboard()
+        self.sample_interval = sample_interval
+        self._clock = clock
         self._app: Optional[QApplication]
         self._label: Optional[QLabel]
+        self._dashboard_label: Optional[QLabel] = None
         self._last_text: str = ""
+        self._dashboard_text: str = ""
+        self._pending: Optional[Stats] = None
+        self._pending_lock = threading.Lock()
+        self._stats: Optional[Stats] = None
+        self._last_sample: Optional[float] = None
+        self._timer = None
+        self.repaints = 0
 
         # Callbacks for external control
         self.on_pause: Optional[Callable[[], None]] = None
@@ -46,6 +104,7 @@ class QuizGUI:
         self._resume_btn: Optional[QPushButton]
         self._stop_btn: Optional[QPushButton]
 
+        _load_qt()
         if QApplication is None:  # pragma: no cover - headless fallback
             self._app = None
             self._label = None
@@ -66,6 +125,9 @@ class QuizGUI:
         layout = QVBoxLayout(self._window)
         self._label = QLabel("Ready")
         layout.addWidget(self._label)
+        self._dashboard_label = QLabel("")
+        self._dashboard_label.setStyleSheet("font-family: monospace;")
+        layout.addWidget(self._dashboard_label)
 
         # Control buttons
         self._pause_btn = QPushButton("Pause")
@@ -86,28 +148,84 @@ class QuizGUI:
         self._window.setWindowTitle("Quiz Stats")
         self._window.show()
 
+        self._timer = QTimer(self._window)
+        self._timer.setInterval(int(refresh_interval * 1000))
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
     def update(self, stats: Stats) -> None:
-        """Refresh the GUI with the latest *stats*."""
-        text = (
-            f"Questions: {stats.questions_answered} | "
-            f"Avg Time: {stats.average_time:.2f}s | "
-            f"Avg Tokens: {stats.average_tokens:.1f} | "
-            f"Errors: {stats.errors}"
+        """Schedule a repaint with *stats*; safe to call from any thread.
+
+        Nothing is rendered here.  The next timer tick (or :meth:`refresh`)
+        takes one snapshot of the most recently passed *stats*.
+        """
+        with self._pending_lock:
+            self._pending = stats
+
+    def _sample_due(self, now: float) -> bool:
+        return (
+            self._last_sample is None
+            or now - self._last_sample >= self.sample_interval
         )
-        self._last_text = text
 
-        if self._label is not None:  # pragma: no branch - only if GUI is active
-            self._label.setText(text)
-            # ``processEvents`` keeps the UI responsive during tests without a
-            # full event loop running.
-            assert self._app is not None  # for type checkers
-            self._app.processEvents()
+    def refresh(self) -> bool:
+        """Render pending statistics in the calling (GUI) thread.
+
+        Returns whether anything was rendered.
+        """
+        with self._pending_lock:
+            stats, self._pending = self._pending, None
+        now = self._clock()
+        if stats is not None:
+            self._stats = stats
+        elif self._stats is None or not self._sample_due(now):
+            return False
+        snap = self._stats.snapshot()
+        if self._sample_due(now):
+            self._last_sample = now
+            self.dashboard.windowed = (
+                getattr(self._stats, "latency_window", None) is not None
+            )
+            self.dashboard.sample(snap, now)
+            text = self.dashboard.render()
+            if text != self._dashboard_text:
+                self._dashboard_text = text
+                if self._dashboard_label is not None:  # pragma: no branch
+                    self._dashboard_label.setText(text)
+        latency = snap.percentiles()
+        text = (
+            f"Questions: {snap.questions_answered} | "
+            f"Avg Time: {snap.average_time:.2f}s | "
+            f"P50/P95/P99: {latency['p50']:.2f}/{latency['p95']:.2f}/"
+            f"{latency['p99']:.2f}s | "
+            f"Avg Tokens: {snap.average_tokens:.1f} | "
+            f"Errors: {snap.errors}"
+        )
+        if text != self._last_text:
+            self._last_text = text
+            self.repaints += 1
+            if self._label is not None:  # pragma: no branch - only if GUI is active
+                self._label.setText(text)
+        return True
 
     @property
     def last_text(self) -> str:
-        """Return the most recently rendered text."""
+        """Return the most recently rendered text.
+
+        Without Qt there is no timer, so pending statistics are rendered on
+        access.
+        """
+        if self._timer is None:
+            self.refresh()
         return self._last_text
 
+    @property
+    def dashboard_text(self) -> str:
+        """Return the most recently rendered dashboard."""
+        if self._timer is None:
+            self.refresh()
+        return self._dashboard_text
+
     # ------------------------------------------------------------------
     # Button signal emitters
     def _emit_pause(self) -> None:
@@ -125,7 +243,8 @@ class QuizGUI:
     # ------------------------------------------------------------------
     # Convenience helpers
     def connect_runner(self, runner: "QuizRunner") -> None:
-        """Wire GUI controls to *runner* methods."""
+        """Wire GUI controls to *runner* methods and sample its statistics."""
+        self._stats = getattr(runner, "stats", self._stats)
         self.on_pause = runner.pause
         self.on_resume = runner.resume
         self.on_stop = runner.stop
@@ -0,0 +1,156 @@
+"""Prometheus/OpenMetrics text exposition for :class:`~quiz_automation.stats.Stats`.
+
+:func:`render_metrics` turns a :class:`~quiz_automation.stats.StatsSnapshot`
+into the Prometheus text format (version 0.0.4), which OpenMetrics scrapers
+also accept.  The FastAPI server mounts it at ``/metrics``; headless runs can
+start a :class:`MetricsServer` on a spare port instead.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Sequence
+
+from .logger import get_logger
+from .stats import Stats, StatsSnapshot
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#: Upper bounds (seconds) of the exported cumulative histogram buckets.
+DEFAULT_BUCKETS: Sequence[float] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return f"{prefix}_{_INVALID.sub('_', name)}"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(
+    snapshot: StatsSnapshot,
+    prefix: str = "quiz",
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> str:
+    """Return ``snapshot`` in the Prometheus text exposition format.
+
+    Counters from :meth:`Stats.increment` become ``<prefix>_<name>_total`` and
+    gauges from :meth:`Stats.set_gauge` become ``<prefix>_<name>``.  Stage
+    latencies are exported as one histogram labelled by ``stage``.
+    """
+    lines: List[str] = []
+
+    def counter(name: str, help_text: str, value: float) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+
+    counter(
+        f"{prefix}_questions_answered_total",
+        "Questions answered successfully.",
+        snapshot.questions_answered,
+    )
+    counter(f"{prefix}_errors_total", "Questions that failed.", snapshot.errors)
+    counter(
+        f"{prefix}_tokens_total", "Response tokens consumed.", snapshot.total_tokens
+    )
+
+    for name, value in sorted(snapshot.counters.items()):
+        counter(_metric_name(prefix, name) + "_total", f"Count of {name}.", value)
+
+    for name, value in sorted(snapshot.gauges.items()):
+        metric = _metric_name(prefix, name)
+        lines.append(f"# HELP {metric} Current {name}.")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+
+    if snapshot.latency:
+        metric = f"{prefix}_stage_latency_seconds"
+        lines.append(f"# HELP {metric} Time spent per pipeline stage.")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, hist in sorted(snapshot.latency.items()):
+            label = _label(stage)
+            for bound in buckets:
+                lines.append(
+                    f'{metric}_bucket{{stage="{label}",le="{bound:g}"}} '
+                    f"{hist.count_below(bound)}"
+                )
+            lines.append(f'{metric}_bucket{{stage="{label}",le="+Inf"}} {hist.count}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {hist.total}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {hist.count}')
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve ``/metrics`` for *stats* from a background HTTP thread.
+
+    Uses :mod:`http.server` so headless runs need no extra dependencies.  Pass
+    ``port=0`` to bind an ephemeral port and read it back from :attr:`port`.
+    """
+
+    def __init__(self, stats: Stats, host: str = "127.0.0.1", port: int = 9100) -> None:
+        """Bind the listener; call :meth:`start` to begin serving."""
+        self.stats = stats
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics(outer.stats.snapshot()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug("metrics: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        """Return the bound TCP port."""
+        return int(self._server.server_address[1])
+
+    def start(self) -> "MetricsServer":
+        """Start serving in a daemon thread and return ``self``."""
+        self._thread.start()
+        logger.info("Serving metrics on port %d", self.port)
+        return self
+
+    def stop(self) -> None:
+        """Stop the listener and release the socket."""
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+
+__all__ = ["CONTENT_TYPE", "DEFAULT_BUCKETS", "MetricsServer", "render_metrics"]
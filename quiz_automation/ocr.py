@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 from importlib import import_module
-from typing import Any, Callable, Dict, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Dict, Protocol
+
+from .virtual_screen import VirtualOCR
+
+if TYPE_CHECKING:  # pragma: no cover - NumPy is imported only when preprocessing
+    from .preprocess import Preprocessor
 
 
 class OCRBackend(Protocol):
@@ -20,11 +25,25 @@ class PytesseractOCR:
     The implementation only runs when the callable is invoked so that unit tests
     can provide lightweight stubs.  When dependencies are missing a clear
     ``RuntimeError`` is raised.
+
+    Images pass through ``preprocess`` first.  By default it is built from the
+    ``ocr_preprocess*`` settings when ``ocr_preprocess`` is enabled; ``True``
+    builds it from those settings regardless and ``False`` disables it.
     """
 
-    def __init__(self, lang: str | None = None) -> None:
+    def __init__(
+        self, lang: str | None = None, preprocess: Preprocessor | bool | None = None
+    ) -> None:
         """Initialize the backend with optional language code."""
         self.lang = lang
+        if preprocess is None or preprocess is True:
+            from .config import settings
+
+            if preprocess or settings.ocr_preprocess:
+                from .preprocess import Preprocessor
+
+                preprocess = Preprocessor.from_settings(settings, force=True)
+        self.preprocess: Preprocessor | None = preprocess or None
 
     def __call__(self, img) -> str:  # pragma: no cover - requires optional deps
         """Return recognized text from *img* using :mod:`pytesseract`."""
@@ -34,6 +53,10 @@ class PytesseractOCR:
         except Exception as exc:  # pragma: no cover - exercised via tests
             raise RuntimeError("pytesseract not available") from exc
 
+        if self.preprocess is not None:
+            # Returns an array (or Pillow image) that pytesseract accepts.
+            return pytesseract.image_to_string(self.preprocess(img), lang=self.lang)
+
         # ``mss`` screenshots expose ``rgb`` and ``size`` attributes.  When that
         # shape is detected we convert to a Pillow image; otherwise we assume the
         # caller already supplied a compatible object.
@@ -46,7 +69,28 @@ class PytesseractOCR:
 
 # -- backend registry ---------------------------------------------------
 
-_BACKENDS: Dict[str, Callable[..., OCRBackend]] = {"pytesseract": PytesseractOCR}
+#: Settings a backend built by :func:`get_backend` depends on.
+OCR_SETTINGS = (
+    "ocr_backend",
+    "ocr_preprocess",
+    "ocr_preprocess_steps",
+    "ocr_scale",
+    "ocr_threshold_block",
+)
+
+
+def settings_key(cfg: Any) -> tuple:
+    """Return the :data:`OCR_SETTINGS` values of *cfg*.
+
+    A backend only needs to be rebuilt when this key changes.
+    """
+    return tuple(getattr(cfg, name, None) for name in OCR_SETTINGS)
+
+
+_BACKENDS: Dict[str, Callable[..., OCRBackend]] = {
+    "pytesseract": PytesseractOCR,
+    "virtual": VirtualOCR,
+}
 
 
 def register_backend(
@@ -91,8 +135,10 @@ def get_backend(name: str | None = None, **kwargs: Any) -> OCRBackend:
 
 
 __all__ = [
+    "OCR_SETTINGS",
     "OCRBackend",
     "PytesseractOCR",
     "register_backend",
     "get_backend",
+    "settings_key",
 ]
@@ -0,0 +1,290 @@
+"""Image preprocessing applied before OCR.
+
+Tesseract is both faster and more accurate on small, clean, black-on-white
+inputs than on full-resolution RGB screenshots.  :class:`Preprocessor` runs a
+configurable sequence of steps:
+
+``grayscale``
+    Collapse RGB to a single luminance channel.
+``scale``
+    Resize by ``scale`` to normalise the text size (DPI) Tesseract sees.
+``threshold``
+    Adaptive mean threshold over ``block_size`` pixel windows.  Dark themes
+    are inverted first so the result is always dark text on white.
+``crop``
+    Crop to the bounding box of the text plus ``margin`` pixels.
+``deskew``
+    Rotate text lines back to horizontal when tilted by up to ``max_skew``
+    degrees.
+
+Steps are vectorised with NumPy and use OpenCV kernels when it is installed.
+Without NumPy a Pillow implementation is used, which skips ``deskew``.
+"""
+
+from __future__ import annotations
+
+import math
+from time import perf_counter
+from typing import Any, Dict, Sequence
+
+from . import tracing
+from .stats import Stats
+
+try:  # pragma: no cover - optional heavy dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+try:  # pragma: no cover - optional heavy dependency
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
+STEPS: Sequence[str] = ("grayscale", "scale", "threshold", "crop", "deskew")
+
+
+# -- NumPy / OpenCV implementation ------------------------------------------
+
+
+def _to_array(img: Any) -> Any:
+    """Return *img* (mss shot, Pillow image or array) as a NumPy array."""
+    if isinstance(img, np.ndarray):
+        return img
+    if hasattr(img, "rgb") and hasattr(img, "size"):
+        width, height = img.size
+        return np.frombuffer(img.rgb, dtype=np.uint8).reshape(height, width, 3)
+    return np.asarray(img)
+
+
+def _grayscale(arr: Any) -> Any:
+    if arr.ndim == 2:
+        return arr
+    if cv2 is not None:
+        return cv2.cvtColor(np.ascontiguousarray(arr[..., :3]), cv2.COLOR_RGB2GRAY)
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return (arr[..., :3] @ weights).astype(np.uint8)
+
+
+def _scale(arr: Any, factor: float) -> Any:
+    if factor == 1.0:
+        return arr
+    height, width = arr.shape[:2]
+    new_h, new_w = max(1, round(height * factor)), max(1, round(width * factor))
+    if cv2 is not None:
+        interpolation = cv2.INTER_AREA if factor < 1 else cv2.INTER_CUBIC
+        return cv2.resize(arr, (new_w, new_h), interpolation=interpolation)
+    rows = np.minimum((np.arange(new_h) / factor).astype(np.intp), height - 1)
+    cols = np.minimum((np.arange(new_w) / factor).astype(np.intp), width - 1)
+    return arr[rows[:, None], cols]
+
+
+def _threshold(gray: Any, block_size: int, offset: int) -> Any:
+    # A dark theme (light text on a dark background) is flipped first so the
+    # threshold always yields dark text on white.
+    if gray.mean() < 127:
+        gray = 255 - gray
+    if cv2 is not None:
+        binary = cv2.adaptiveThreshold(
+            gray,
+            255,
+            cv2.ADAPTIVE_THRESH_MEAN_C,
+            cv2.THRESH_BINARY,
+            block_size,
+            offset,
+        )
+    else:
+        # Window sums from a summed-area table of the edge-padded image.
+        radius = block_size // 2
+        padded = np.pad(gray.astype(np.int64), radius, mode="edge")
+        table = np.pad(padded.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+        height, width = gray.shape
+        b = block_size
+        sums = (
+            table[b : b + height, b : b + width]
+            - table[:height, b : b + width]
+            - table[b : b + height, :width]
+            + table[:height, :width]
+        )
+        mean = sums / (b * b)
+        binary = np.where(gray > mean - offset, 255, 0).astype(np.uint8)
+    return binary
+
+
+def _crop(arr: Any, margin: int) -> Any:
+    mask = arr < 128
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return arr
+    top, bottom = max(rows[0] - margin, 0), rows[-1] + margin + 1
+    left, right = max(cols[0] - margin, 0), cols[-1] + margin + 1
+    return arr[top:bottom, left:right]
+
+
+def skew_angle(arr: Any) -> float:
+    """Return the tilt of dark text in *arr* in degrees (clockwise positive).
+
+    The angle is the principal axis of the dark pixel coordinates, which for
+    a block of text lines runs along the lines.
+    """
+    ys, xs = np.nonzero(arr < 128)
+    if xs.size < 10:
+        return 0.0
+    xs = xs - xs.mean()
+    ys = ys - ys.mean()
+    cov_xx, cov_yy, cov_xy = (xs * xs).mean(), (ys * ys).mean(), (xs * ys).mean()
+    return math.degrees(0.5 * math.atan2(2 * cov_xy, cov_xx - cov_yy))
+
+
+def _deskew(arr: Any, max_skew: float) -> Any:
+    angle = skew_angle(arr)
+    if abs(angle) < 0.1 or abs(angle) > max_skew:
+        return arr
+    height, width = arr.shape[:2]
+    cx, cy = (width - 1) / 2, (height - 1) / 2
+    if cv2 is not None:
+        matrix = cv2.getRotationMatrix2D((cx, cy), angle, 1.0)
+        return cv2.warpAffine(
+            arr,
+            matrix,
+            (width, height),
+            flags=cv2.INTER_NEAREST,
+            borderValue=255,
+        )
+    # Map every output pixel back onto the tilted source (nearest neighbour).
+    theta = math.radians(angle)
+    cos, sin = math.cos(theta), math.sin(theta)
+    ys, xs = np.indices((height, width), dtype=np.float32)
+    dx, dy = xs - cx, ys - cy
+    src_x = np.rint(cx + dx * cos - dy * sin).astype(np.intp)
+    src_y = np.rint(cy + dx * sin + dy * cos).astype(np.intp)
+    inside = (src_x >= 0) & (src_x < width) & (src_y >= 0) & (src_y < height)
+    out = np.full_like(arr, 255)
+    out[inside] = arr[src_y[inside], src_x[inside]]
+    return out
+
+
+# -- Pillow fallback ---------------------------------------------------------
+
+
+def _pil_step(img: Any, step: str, pre: "Preprocessor") -> Any:  # pragma: no cover
+    """Run *step* on a Pillow image; used when NumPy is unavailable."""
+    from PIL import Image, ImageChops, ImageFilter, ImageOps  # type: ignore
+
+    if (
+        hasattr(img, "rgb")
+        and hasattr(img, "size")
+        and not isinstance(img, Image.Image)
+    ):
+        img = Image.frombytes("RGB", img.size, img.rgb)
+    if step == "grayscale":
+        return img.convert("L")
+    if step == "scale":
+        if pre.scale == 1.0:
+            return img
+        size = (
+            max(1, round(img.width * pre.scale)),
+            max(1, round(img.height * pre.scale)),
+        )
+        return img.resize(size, Image.LANCZOS)
+    if step == "threshold":
+        gray = img.convert("L")
+        hist = gray.histogram()
+        if sum(i * n for i, n in enumerate(hist)) < 127 * sum(hist):
+            gray = ImageOps.invert(gray)
+        mean = gray.filter(ImageFilter.BoxBlur(pre.block_size // 2))
+        below = ImageChops.subtract(mean, gray)
+        return below.point(lambda v: 0 if v >= pre.offset else 255)
+    if step == "crop":
+        bbox = ImageOps.invert(img.convert("L")).getbbox()
+        if bbox is None:
+            return img
+        left, top, right, bottom = bbox
+        m = pre.margin
+        return img.crop((max(left - m, 0), max(top - m, 0), right + m, bottom + m))
+    return img  # ``deskew`` needs NumPy
+
+
+class Preprocessor:
+    """Callable that prepares an image for OCR.
+
+    ``timings`` holds the seconds spent in each step during the last call.
+    When ``stats`` is given every step is also recorded there as stage
+    ``preprocess_<step>``; with :mod:`~quiz_automation.tracing` enabled each
+    step is a ``preprocess.<step>`` span.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[str] = STEPS,
+        scale: float = 1.0,
+        block_size: int = 31,
+        offset: int = 10,
+        margin: int = 8,
+        max_skew: float = 10.0,
+        stats: Stats | None = None,
+    ) -> None:
+        """Validate and store the step configuration."""
+        unknown = set(steps) - set(STEPS)
+        if unknown:
+            raise ValueError(f"Unknown preprocessing steps: {sorted(unknown)}")
+        if scale <= 0:
+            raise ValueError("scale must be greater than 0")
+        if block_size < 3 or block_size % 2 == 0:
+            raise ValueError("block_size must be an odd number >= 3")
+        self.steps = tuple(steps)
+        self.scale = scale
+        self.block_size = block_size
+        self.offset = offset
+        self.margin = margin
+        self.max_skew = max_skew
+        self.stats = stats
+        self.timings: Dict[str, float] = {}
+
+    @classmethod
+    def from_settings(
+        cls, cfg: Any, stats: Stats | None = None, force: bool = False
+    ) -> "Preprocessor | None":
+        """Build a preprocessor from ``ocr_preprocess*`` settings, or ``None``.
+
+        ``None`` is returned when ``ocr_preprocess`` is off, unless *force*.
+        """
+        if not (force or cfg.ocr_preprocess):
+            return None
+        return cls(
+            steps=cfg.ocr_preprocess_steps,
+            scale=cfg.ocr_scale,
+            block_size=cfg.ocr_threshold_block,
+            stats=stats,
+        )
+
+    def _run(self, img: Any, step: str) -> Any:
+        if np is None:  # pragma: no cover - exercised without NumPy
+            return _pil_step(img, step, self)
+        if step == "grayscale":
+            return _grayscale(img)
+        if step == "scale":
+            return _scale(img, self.scale)
+        if step == "threshold":
+            return _threshold(_grayscale(img), self.block_size, self.offset)
+        if step == "crop":
+            return _crop(_grayscale(img), self.margin)
+        return _deskew(_grayscale(img), self.max_skew)
+
+    def __call__(self, img: Any) -> Any:
+        """Return the processed image (a NumPy array when NumPy is available)."""
+        if np is not None:
+            img = _to_array(img)
+        timings: Dict[str, float] = {}
+        for step in self.steps:
+            start = perf_counter()
+            with tracing.span(f"preprocess.{step}"):
+                img = self._run(img, step)
+            timings[step] = perf_counter() - start
+            if self.stats is not None:
+                self.stats.record_stage(f"preprocess_{step}", timings[step])
+        self.timings = timings
+        return img
+
+
+__all__ = ["STEPS", "Preprocessor", "skew_angle"]
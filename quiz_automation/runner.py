@@ -5,16 +5,25 @@ from __future__ import annotations
 import queue
 import threading
 import time
-from typing import Sequence, TextIO
+from datetime import datetime
+from typing import TYPE_CHECKING, Sequence, TextIO
 
-from . import automation
+from . import ocr, tracing
 from .automation import answer_question
-from .gui import QuizGUI
+from .capture import CaptureSource, ScreenCapture
+from .clicker import Clicker
+from .config import Settings, settings
 from .logger import get_logger
 from .model_client import ModelClientProtocol
+from .ocr import OCRBackend
+from .session_log import SessionLogWriter
 from .stats import Stats
 from .types import Point, Region
 
+if TYPE_CHECKING:  # pragma: no cover - imports for type hints only
+    from .calibration import OptionCalibrator
+    from .gui import QuizGUI
+
 logger = get_logger(__name__)
 
 
@@ -34,9 +43,26 @@ class QuizRunner(threading.Thread):
         gui: QuizGUI | None = None,
         max_questions: int | None = None,
         poll_interval: float = 0.5,
-        session_log: TextIO | None = None,
+        session_log: TextIO | SessionLogWriter | None = None,
+        calibrator: OptionCalibrator | None = None,
+        capture: CaptureSource | None = None,
+        clicker: Clicker | None = None,
     ) -> None:
-        """Initialise the runner thread."""
+        """Initialise the runner thread.
+
+        A text ``session_log`` is wrapped in a
+        :class:`~quiz_automation.session_log.SessionLogWriter`, which is drained
+        and flushed when :meth:`run` returns, so no records are lost on
+        :meth:`stop`.  The stream itself is left open for the caller to close.
+
+        ``capture`` supplies the frames (the live screen by default); the
+        runner stops once it returns ``None``, e.g. at the end of a
+        :class:`~quiz_automation.capture.ReplayCapture`.  ``clicker`` is
+        forwarded to :func:`~quiz_automation.automation.answer_question`.
+
+        The OCR backend is built on first use and reused for every question;
+        :meth:`apply_settings` swaps it and the screen layout while running.
+        """
         super().__init__(daemon=True)
         self.quiz_region = quiz_region
         self.chatgpt_box = chatgpt_box
@@ -51,8 +77,62 @@ class QuizRunner(threading.Thread):
         if self.gui is not None:
             self.gui.connect_runner(self)
         self.poll_interval = poll_interval
-        self.session_log = session_log
+        self._owns_session_log = session_log is not None and not isinstance(
+            session_log, SessionLogWriter
+        )
+        self.session_log = (
+            SessionLogWriter(session_log) if self._owns_session_log else session_log
+        )
+        self.calibrator = calibrator
+        self.capture_source = capture or ScreenCapture()
+        self.clicker = clicker
         self.max_questions = max_questions
+        self.ocr_backend: OCRBackend | None = None
+        self._ocr_key: tuple | None = None
+        self._config_lock = threading.Lock()
+
+    def _needs_ocr(self) -> bool:
+        return self.model_client is not None or self.session_log is not None
+
+    def _ensure_ocr(self) -> OCRBackend | None:
+        """Return the warm OCR backend, building it from the settings once."""
+        if self.ocr_backend is None and self._needs_ocr():
+            self._ocr_key = ocr.settings_key(settings)
+            self.ocr_backend = ocr.get_backend(settings.ocr_backend)
+        return self.ocr_backend
+
+    def apply_settings(self, cfg: Settings) -> None:
+        """Switch to the regions, polling interval and OCR backend of *cfg*.
+
+        Safe to call while the runner is running, e.g. as a
+        :meth:`~quiz_automation.config.SettingsRegistry.subscribe` listener.
+        The change takes effect with the next question as a whole.  The model
+        client, capture source, session log and calibrator stay warm; the
+        OCR backend is only rebuilt when an ``ocr_*`` setting changed, and
+        calibrated layouts are only dropped when the quiz region moved.
+
+        Raises
+        ------
+        RuntimeError
+            If the new OCR backend cannot be created; nothing is changed.
+        """
+        key = ocr.settings_key(cfg)
+        backend = None
+        if self._needs_ocr() and key != self._ocr_key:
+            backend = ocr.get_backend(cfg.ocr_backend)
+        with self._config_lock:
+            if backend is not None:
+                self.ocr_backend, self._ocr_key = backend, key
+            if self.calibrator is not None and cfg.quiz_region != self.quiz_region:
+                self.calibrator.relocate(cfg.quiz_region)
+            self.quiz_region = cfg.quiz_region
+            self.chatgpt_box = cfg.chat_box
+            self.response_region = cfg.response_region
+            self.option_base = cfg.option_base
+            if self.clicker is not None:
+                self.clicker.base = cfg.option_base
+            self.poll_interval = cfg.poll_interval
+        logger.info("Runner reconfigured")
 
     def stop(self) -> None:
         """Signal the runner to stop."""
@@ -71,19 +151,37 @@ class QuizRunner(threading.Thread):
     def run(self) -> None:  # pragma: no cover
         """Run the capture and worker threads until stopped."""
         q: queue.Queue = queue.Queue(maxsize=1)
+        taken = threading.Event()
+        busy = threading.Event()
 
         def capture() -> None:
             while not self.stop_flag.is_set():
                 if self.pause_flag.is_set():
                     time.sleep(0.05)
                     continue
-                if q.empty():
-                    img = automation.pyautogui.screenshot(
-                        region=self.quiz_region.as_tuple()
-                    )
+                taken.clear()
+                # No capture once the answered questions, plus the one being
+                # answered, fill the ``max_questions`` quota.
+                quota_full = (
+                    self.max_questions is not None
+                    and self.stats.questions_answered + busy.is_set()
+                    >= self.max_questions
+                )
+                if q.empty() and not quota_full:
+                    start = time.perf_counter()
+                    with self._config_lock:
+                        region = self.quiz_region
+                    with tracing.span("capture"):
+                        img = self.capture_source.grab(region)
+                    if img is None:
+                        self.stop()
+                        break
+                    self.stats.record_stage("capture", time.perf_counter() - start)
                     q.put(img)
+                    self.stats.set_gauge("queue_depth", q.qsize())
                 else:
-                    time.sleep(0.05)
+                    # Woken as soon as the worker takes or finishes a frame.
+                    taken.wait(0.05)
 
         def worker() -> None:
             while not self.stop_flag.is_set() or not q.empty():
@@ -100,22 +198,44 @@ class QuizRunner(threading.Thread):
                     img = q.get(timeout=0.1)
                 except queue.Empty:
                     continue
+                busy.set()
+                taken.set()
+                self.stats.set_gauge("queue_depth", q.qsize())
                 try:
+                    with self._config_lock:
+                        ocr_backend = self._ensure_ocr()
+                        layout = (
+                            self.chatgpt_box,
+                            self.response_region,
+                            self.options,
+                            self.option_base,
+                        )
+                        poll_interval = self.poll_interval
                     answer_question(
                         img,
-                        self.chatgpt_box,
-                        self.response_region,
-                        self.options,
-                        self.option_base,
+                        *layout,
                         stats=self.stats,
-                        poll_interval=self.poll_interval,
+                        poll_interval=poll_interval,
                         client=self.model_client,
                         session_log=self.session_log,
+                        calibrator=self.calibrator,
+                        clicker=self.clicker,
+                        ocr_backend=ocr_backend,
                     )
-                except Exception:
+                except Exception as exc:
                     logger.exception("Error while answering question")
                     self.stats.record_error()
+                    if self.session_log is not None:
+                        self.session_log.log(
+                            {
+                                "timestamp": datetime.utcnow().isoformat(),
+                                "error": type(exc).__name__,
+                                "message": str(exc),
+                            }
+                        )
                 finally:
+                    busy.clear()
+                    taken.set()
                     if self.gui is not None:
                         self.gui.update(self.stats)
                     if (
@@ -131,3 +251,5 @@ class QuizRunner(threading.Thread):
         t_worker.start()
         t_capture.join()
         t_worker.join()
+        if self._owns_session_log:
+            self.session_log.close()
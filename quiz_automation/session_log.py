@@ -0,0 +1,583 @@
+"""Session-log writers, storage formats and a streaming reader.
+
+:class:`SessionLogWriter` moves encoding and file I/O off the answering
+thread: :meth:`SessionLogWriter.log` only appends the record to a queue, and a
+daemon thread hands queued records in batches to a sink.  The sink is flushed
+every ``flush_interval`` seconds or ``flush_records`` records, whichever comes
+first, and on :meth:`~SessionLogWriter.flush` / :meth:`~SessionLogWriter.close`.
+
+Sinks:
+
+* :class:`JsonLinesSink` writes one JSON object per line to a text stream.
+* :class:`RotatingSink` writes timestamped segment files next to a base path,
+  starting a new segment after ``max_bytes`` or ``max_age`` seconds.  Records
+  are gathered into blocks of ``block_records`` rows or ``block_bytes`` bytes,
+  optionally compressed with gzip or zstd (the ``zstandard`` package), so
+  frequent flushes do not produce tiny, poorly compressed blocks.  Segments
+  hold JSON lines or the columnar block format below.
+
+Columnar segments start with ``QSLC\\x01``.  Each block is ``QB``, a
+little-endian ``uint32`` header length, a JSON header
+``{"rows", "codec", "columns": [[name, nbytes], ...]}`` and then one encoded
+JSON array per column.  Readers only decode the columns they ask for, so
+aggregating ``duration`` never touches the bulky ``ocr_text`` column.
+
+:func:`read_session_log` streams records lazily from any of these files, from
+all segments of a rotated log, or from a directory of logs.
+"""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import io
+import json
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Protocol,
+    Sequence,
+    TextIO,
+)
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+COLUMNAR_MAGIC = b"QSLC\x01"
+_BLOCK_MAGIC = b"QB"
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESSIONS = ("none", "gzip", "zstd")
+FORMATS = ("jsonl", "columnar")
+_SEGMENT_SUFFIX = r"\.\d{8}T\d{6}-\d{4,}(?:\.gz|\.zst)?"
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("zstandard not available") from exc
+    return zstandard
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":  # pragma: no cover - optional dependency
+        return _zstd().ZstdCompressor(level=6).compress(data)
+    return data
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":  # pragma: no cover - optional dependency
+        return _zstd().ZstdDecompressor().decompress(data)
+    return data
+
+
+class SessionSink(Protocol):
+    """Destination for batches of session records."""
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """Store *records* and return how many had to be dropped."""
+        ...
+
+    def flush(self) -> None:
+        """Make stored records durable."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        ...
+
+
+class JsonLinesSink:
+    """Write records as JSON lines to a text stream left open on :meth:`close`."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Wrap *stream*."""
+        self.stream = stream
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """Encode and write *records*; unserialisable ones are dropped."""
+        lines: List[str] = []
+        for record in records:
+            try:
+                lines.append(json.dumps(record))
+            except (TypeError, ValueError):
+                logger.exception("Unserialisable session record dropped")
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+        return len(records) - len(lines)
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush the stream without closing it."""
+        self.stream.flush()
+
+
+def encode_columnar_block(
+    records: Sequence[Mapping[str, Any]], codec: str = "none"
+) -> bytes:
+    """Return *records* as one columnar block (see the module docstring)."""
+    names: Dict[str, None] = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    blobs = [
+        _compress(
+            json.dumps([r.get(name) for r in records], default=str).encode("utf-8"),
+            codec,
+        )
+        for name in names
+    ]
+    header = json.dumps(
+        {
+            "rows": len(records),
+            "codec": codec,
+            "columns": [[name, len(blob)] for name, blob in zip(names, blobs)],
+        }
+    ).encode("utf-8")
+    return b"".join([_BLOCK_MAGIC, struct.pack("<I", len(header)), header, *blobs])
+
+
+def _approx_size(record: Mapping[str, Any]) -> int:
+    """Return a cheap estimate of *record*'s encoded size in bytes."""
+    return sum(
+        len(v) + len(k) if isinstance(v, str) else len(k) + 8 for k, v in record.items()
+    )
+
+
+class RotatingSink:
+    """Write session records to size/time-rotated segment files.
+
+    Segments are named ``<path>.<UTC timestamp>-<seq>``, plus ``.gz`` or
+    ``.zst`` for compressed JSON lines.  A segment is never reopened: when the
+    name is taken, e.g. by another process started in the same second, the
+    next ``seq`` is tried.
+
+    Compressed and columnar segments consist of self-contained blocks (gzip
+    members, zstd frames or columnar blocks).  :meth:`flush` only cuts a block
+    once ``block_records`` rows or about ``block_bytes`` bytes are buffered,
+    or the oldest buffered record is ``block_delay`` seconds old; a crash
+    therefore loses at most one block.  ``flush(force=True)`` and
+    :meth:`close` write whatever is buffered.  Plain JSON lines need no
+    blocks and are written on every flush.  :attr:`pending` counts the
+    records still held in memory, which :class:`SessionLogWriter` uses to keep
+    calling :meth:`flush` until they are out.
+
+    Parameters
+    ----------
+    path:
+        Base path of the log; segments are created in its directory.
+    fmt:
+        ``"jsonl"`` or ``"columnar"``.
+    compression:
+        ``"none"``, ``"gzip"`` or ``"zstd"``.
+    max_bytes:
+        Start a new segment once the current one reaches this size.
+    max_age:
+        Start a new segment after this many seconds, if set.
+    block_records, block_bytes:
+        Row and approximate byte targets of a compressed or columnar block.
+    block_delay:
+        Maximum seconds a record may wait for its block to fill.
+
+    Raises
+    ------
+    RuntimeError
+        If ``compression="zstd"`` and :mod:`zstandard` is not installed.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fmt: str = "jsonl",
+        compression: str = "none",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float | None = None,
+        clock: Callable[[], float] = time.time,
+        block_records: int = 1024,
+        block_bytes: int = 1024 * 1024,
+        block_delay: float = 60.0,
+    ) -> None:
+        """Validate the configuration; the first segment opens on first flush."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown session log format '{fmt}'")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown session log compression '{compression}'")
+        if compression == "zstd":
+            _zstd()
+        self.path = Path(path)
+        self.fmt = fmt
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.block_records = block_records
+        self.block_bytes = block_bytes
+        self.block_delay = block_delay
+        self._clock = clock
+        self._pending: List[Mapping[str, Any]] = []
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._file: BinaryIO | None = None
+        self._opened = 0.0
+        self._seq = 0
+        self.segments: List[Path] = []
+
+    def _open(self) -> BinaryIO:
+        stamp = datetime.fromtimestamp(self._clock(), timezone.utc)
+        suffix = ""
+        if self.fmt == "jsonl":
+            suffix = {"gzip": ".gz", "zstd": ".zst"}.get(self.compression, "")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._seq += 1
+            segment = self.path.with_name(
+                f"{self.path.name}.{stamp:%Y%m%dT%H%M%S}-{self._seq:04d}{suffix}"
+            )
+            try:
+                fh = segment.open("xb")
+            except FileExistsError:
+                continue
+            break
+        if self.fmt == "columnar":
+            fh.write(COLUMNAR_MAGIC)
+        self._file = fh
+        self._opened = self._clock()
+        self.segments.append(segment)
+        return fh
+
+    def _rotate_due(self, fh: BinaryIO) -> bool:
+        if fh.tell() >= self.max_bytes:
+            return True
+        return self.max_age is not None and self._clock() - self._opened >= self.max_age
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> int:
+        """Buffer *records* until a block is due."""
+        if records and not self._pending:
+            self._pending_since = self._clock()
+        self._pending.extend(records)
+        self._pending_bytes += sum(_approx_size(r) for r in records)
+        return 0
+
+    def _block_due(self) -> bool:
+        if self.fmt == "jsonl" and self.compression == "none":
+            return True
+        return (
+            len(self._pending) >= self.block_records
+            or self._pending_bytes >= self.block_bytes
+            or self._clock() - self._pending_since >= self.block_delay
+        )
+
+    @property
+    def pending(self) -> int:
+        """Return how many records are buffered but not yet written."""
+        return len(self._pending)
+
+    def flush(self, force: bool = False) -> None:
+        """Append the buffered records as one block once due, or if *force*."""
+        if self._pending and (force or self._block_due()):
+            self._write_block()
+
+    def _write_block(self) -> None:
+        records, self._pending = self._pending, []
+        self._pending_bytes = 0
+        if self.fmt == "columnar":
+            block = encode_columnar_block(records, self.compression)
+        else:
+            text = "".join(json.dumps(r, default=str) + "\n" for r in records)
+            block = _compress(text.encode("utf-8"), self.compression)
+        fh = self._file
+        if fh is None or self._rotate_due(fh):
+            if fh is not None:
+                fh.close()
+            fh = self._open()
+        fh.write(block)
+        fh.flush()
+
+    def close(self) -> None:
+        """Write the buffered records and close the current segment."""
+        if self._pending:
+            self._write_block()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SessionLogWriter:
+    """Write session records to a sink from a background thread.
+
+    Parameters
+    ----------
+    stream:
+        Text stream receiving one JSON object per line, or a
+        :class:`SessionSink`.  A stream is not closed by :meth:`close`; the
+        caller that opened it stays responsible for it.  A sink is closed.
+    flush_interval:
+        Maximum seconds written records may sit in the sink's buffer.
+    flush_records:
+        Flush once this many records were written since the last flush.
+    max_batch:
+        Maximum records handed to the sink in a single call.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | SessionSink,
+        flush_interval: float = 1.0,
+        flush_records: int = 256,
+        max_batch: int = 256,
+    ) -> None:
+        """Start the writer thread."""
+        self.sink: SessionSink = (
+            stream  # type: ignore[assignment]
+            if hasattr(stream, "write_records")
+            else JsonLinesSink(stream)  # type: ignore[arg-type]
+        )
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.max_batch = max_batch
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="session-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def log(self, record: Mapping[str, Any]) -> None:
+        """Queue *record* for writing; never blocks on I/O."""
+        if self._closed:
+            raise ValueError("session log writer is closed")
+        self._queue.put(record)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every record queued so far is written and flushed.
+
+        Records a sink holds back for a fuller block are written out too.
+        Returns ``False`` if ``timeout`` expired first.
+        """
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write all queued records, flush and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "SessionLogWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- writer thread ---------------------------------------------------
+    def _drain(
+        self, first: Any
+    ) -> tuple[List[Mapping[str, Any]], List[threading.Event], bool]:
+        """Collect up to ``max_batch`` records starting with *first*."""
+        records: List[Mapping[str, Any]] = []
+        waiters: List[threading.Event] = []
+        stop = False
+        item = first
+        while True:
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                records.append(item)
+            if stop or len(records) >= self.max_batch:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return records, waiters, stop
+
+    def _flush_sink(self, force: bool) -> int:
+        """Flush the sink and return how many records it still buffers."""
+        if not hasattr(self.sink, "pending"):
+            self.sink.flush()
+            return 0
+        self.sink.flush(force=force)  # type: ignore[call-arg]
+        return self.sink.pending  # type: ignore[attr-defined]
+
+    def _run(self) -> None:
+        # Records written since the last flush or still buffered by the sink;
+        # while any remain the loop wakes up every ``flush_interval``.
+        unflushed = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = None
+            if unflushed:
+                timeout = max(
+                    0.0, self.flush_interval - (time.monotonic() - last_flush)
+                )
+            try:
+                first = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                records, waiters, stop = [], [], False
+            else:
+                records, waiters, stop = self._drain(first)
+            try:
+                if records:
+                    self.dropped += self.sink.write_records(records)
+                    unflushed += len(records)
+                if unflushed and (
+                    waiters
+                    or stop
+                    or unflushed >= self.flush_records
+                    or time.monotonic() - last_flush >= self.flush_interval
+                ):
+                    unflushed = self._flush_sink(force=bool(waiters or stop))
+                    last_flush = time.monotonic()
+            except Exception:
+                logger.exception("Failed to write session log")
+                self.dropped += len(records)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                try:
+                    self.sink.close()
+                except Exception:
+                    logger.exception("Failed to close session log")
+                return
+
+
+# -- reading ---------------------------------------------------------------
+
+
+def session_log_files(path: str | Path) -> List[Path]:
+    """Return the files making up the log at *path*, oldest first.
+
+    *path* may be a directory (every file in it), a glob pattern, or a log
+    base path, which expands to the file itself plus its rotated segments
+    ``<path>.<stamp>-<seq>[.gz|.zst]``; other siblings such as ``<path>.bak``
+    are ignored.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file())
+    pattern = str(path)
+    if glob.has_magic(pattern):
+        return sorted(Path(p) for p in glob.glob(pattern) if os.path.isfile(p))
+    segment = re.compile(re.escape(path.name) + _SEGMENT_SUFFIX)
+    files = [
+        Path(p)
+        for p in glob.glob(glob.escape(pattern) + ".*")
+        if segment.fullmatch(os.path.basename(p)) and os.path.isfile(p)
+    ]
+    if path.is_file():
+        files.append(path)
+    return sorted(files)
+
+
+def _read_columnar(
+    fh: BinaryIO, columns: Sequence[str] | None
+) -> Iterator[Dict[str, Any]]:
+    while True:
+        magic = fh.read(2)
+        if not magic:
+            return
+        if magic != _BLOCK_MAGIC:
+            raise ValueError("Corrupt columnar session log block")
+        (size,) = struct.unpack("<I", fh.read(4))
+        header = json.loads(fh.read(size))
+        values: Dict[str, List[Any]] = {}
+        for name, nbytes in header["columns"]:
+            if columns is not None and name not in columns:
+                fh.seek(nbytes, io.SEEK_CUR)
+                continue
+            values[name] = json.loads(_decompress(fh.read(nbytes), header["codec"]))
+        for row in range(header["rows"]):
+            yield {name: column[row] for name, column in values.items()}
+
+
+def _read_lines(
+    stream: Iterable[bytes], columns: Sequence[str] | None
+) -> Iterator[Dict[str, Any]]:
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if columns is not None:
+            record = {k: v for k, v in record.items() if k in columns}
+        yield record
+
+
+def _read_file(path: Path, columns: Sequence[str] | None) -> Iterator[Dict[str, Any]]:
+    with path.open("rb") as fh:
+        head = fh.read(len(COLUMNAR_MAGIC))
+        if head == COLUMNAR_MAGIC:
+            yield from _read_columnar(fh, columns)
+            return
+        fh.seek(0)
+        if head.startswith(_GZIP_MAGIC):
+            with gzip.open(fh) as stream:
+                yield from _read_lines(stream, columns)
+        elif head.startswith(_ZSTD_MAGIC):  # pragma: no cover - optional dependency
+            reader = (
+                _zstd().ZstdDecompressor().stream_reader(fh, read_across_frames=True)
+            )
+            yield from _read_lines(io.BufferedReader(reader), columns)
+        else:
+            yield from _read_lines(fh, columns)
+
+
+def read_session_log(
+    paths: str | Path | Iterable[str | Path],
+    columns: Sequence[str] | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield session records lazily from one or more logs.
+
+    Plain, gzip and zstd JSON lines and columnar segments are recognised by
+    their first bytes.  ``columns`` restricts each record to those keys; for
+    columnar files the other columns are skipped without being decoded.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    wanted = set(columns) if columns is not None else None
+    for path in paths:
+        for file in session_log_files(path):
+            yield from _read_file(file, wanted)
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "FORMATS",
+    "JsonLinesSink",
+    "RotatingSink",
+    "SessionLogWriter",
+    "SessionSink",
+    "encode_columnar_block",
+    "read_session_log",
+    "session_log_files",
+]
@@ -2,9 +2,338 @@
 
 from __future__ import annotations
 
+import math
+import time
 from dataclasses import dataclass, field
 from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Mapping, Tuple
 
+#: Pipeline stages timed by :func:`~quiz_automation.automation.answer_question`
+#: and :class:`~quiz_automation.runner.QuizRunner`.  ``total`` covers a whole
+#: question from OCR to click.
+STAGES: Tuple[str, ...] = ("capture", "ocr", "model", "click", "total")
+
+DEFAULT_PERCENTILES: Tuple[float, ...] = (50.0, 95.0, 99.0)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Immutable copy of a :class:`LatencyHistogram`.
+
+    Snapshots taken from histograms with the same bucket layout can be merged,
+    which allows per-thread or per-process histograms to be combined.  Use
+    :meth:`to_dict` and :meth:`from_dict` to ship snapshots between processes.
+    """
+
+    lowest: float
+    growth: float
+    counts: Tuple[int, ...]
+    count: int = 0
+    total: float = 0.0
+    minimum: float = 0.0
+    maximum: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Return the arithmetic mean of the recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    def bucket_upper(self, index: int) -> float:
+        """Return the exclusive upper bound of bucket ``index``."""
+        return self.lowest * self.growth**index
+
+    def count_below(self, bound: float) -> int:
+        """Return how many samples fall in buckets ending at or below ``bound``."""
+        total = 0
+        for index, n in enumerate(self.counts):
+            if self.bucket_upper(index) > bound:
+                break
+            total += n
+        return total
+
+    def percentile(self, q: float) -> float:
+        """Return the value below which ``q`` percent of samples fall.
+
+        The result is the upper bound of the matching bucket clamped to the
+        observed ``minimum``/``maximum``, so the relative error is bounded by the
+        histogram precision.
+        """
+        if not 0.0 <= q <= 100.0:
+            raise ValueError("percentile must be between 0 and 100")
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(max(self.bucket_upper(index), self.minimum), self.maximum)
+        return self.maximum  # pragma: no cover - counts always sum to count
+
+    def percentiles(
+        self, qs: Iterable[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, float]:
+        """Return ``{"p50": ..., "p95": ...}`` for each percentile in ``qs``."""
+        return {f"p{q:g}": self.percentile(q) for q in qs}
+
+    def merge(self, other: "HistogramSnapshot") -> "HistogramSnapshot":
+        """Return a snapshot combining ``self`` and ``other``."""
+        if (self.lowest, self.growth) != (other.lowest, other.growth):
+            raise ValueError("cannot merge histograms with different layouts")
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        size = max(len(self.counts), len(other.counts))
+        counts = tuple(
+            (self.counts[i] if i < len(self.counts) else 0)
+            + (other.counts[i] if i < len(other.counts) else 0)
+            for i in range(size)
+        )
+        return HistogramSnapshot(
+            self.lowest,
+            self.growth,
+            counts,
+            self.count + other.count,
+            self.total + other.total,
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON serialisable representation with sparse buckets."""
+        return {
+            "lowest": self.lowest,
+            "growth": self.growth,
+            "buckets": {str(i): n for i, n in enumerate(self.counts) if n},
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "HistogramSnapshot":
+        """Rebuild a snapshot produced by :meth:`to_dict`."""
+        buckets = {int(k): int(v) for k, v in data.get("buckets", {}).items()}
+        size = max(buckets) + 1 if buckets else 0
+        return cls(
+            float(data["lowest"]),
+            float(data["growth"]),
+            tuple(buckets.get(i, 0) for i in range(size)),
+            int(data.get("count", 0)),
+            float(data.get("total", 0.0)),
+            float(data.get("minimum", 0.0)),
+            float(data.get("maximum", 0.0)),
+        )
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds.
+
+    Bucket ``i`` holds values in ``[lowest * growth**(i-1), lowest * growth**i)``
+    with bucket ``0`` collecting everything below ``lowest``.  The bucket array
+    is allocated once so recording a value is a single ``log`` and an integer
+    increment.  The class is not synchronised; :class:`Stats` serialises access.
+    """
+
+    def __init__(
+        self,
+        lowest: float = 1e-6,
+        highest: float = 3600.0,
+        precision: float = 0.05,
+    ) -> None:
+        """Create a histogram covering ``lowest``..``highest`` seconds.
+
+        ``precision`` is the maximum relative error of reported percentiles.
+        """
+        if lowest <= 0 or highest <= lowest:
+            raise ValueError("require 0 < lowest < highest")
+        if precision <= 0:
+            raise ValueError("precision must be positive")
+        self.lowest = lowest
+        self.highest = highest
+        self.growth = 1.0 + precision
+        self._log_growth = math.log(self.growth)
+        size = math.ceil(math.log(highest / lowest) / self._log_growth) + 2
+        self._counts = [0] * size
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def bucket_index(self, value: float) -> int:
+        """Return the bucket index for ``value``."""
+        if value < self.lowest:
+            return 0
+        index = int(math.log(value / self.lowest) / self._log_growth) + 1
+        return min(index, len(self._counts) - 1)
+
+    def record(self, value: float) -> None:
+        """Add a single ``value`` to the histogram."""
+        value = max(0.0, value)
+        self._counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Return an immutable copy of the current state."""
+        return HistogramSnapshot(
+            self.lowest,
+            self.growth,
+            tuple(self._counts),
+            self.count,
+            self.total,
+            self.minimum if self.count else 0.0,
+            self.maximum,
+        )
+
+
+class SlidingHistogram:
+    """Histogram restricted to values recorded in the last ``window`` seconds.
+
+    The window is split into ``slots`` sub-histograms arranged as a ring.  When
+    the clock moves into a new slot the oldest one is cleared and reused, so
+    memory stays constant regardless of the recording rate.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        slots: int = 6,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs: float,
+    ) -> None:
+        """Create a sliding histogram; ``kwargs`` go to :class:`LatencyHistogram`."""
+        if window <= 0 or slots <= 0:
+            raise ValueError("window and slots must be positive")
+        self.window = window
+        self._slot_width = window / slots
+        self._clock = clock
+        self._slots = [LatencyHistogram(**kwargs) for _ in range(slots)]
+        self._epochs = [-1] * slots
+
+    def _current(self) -> int:
+        return int(self._clock() // self._slot_width)
+
+    def record(self, value: float) -> None:
+        """Add ``value`` to the slot for the current time."""
+        epoch = self._current()
+        index = epoch % len(self._slots)
+        if self._epochs[index] != epoch:
+            self._slots[index].reset()
+            self._epochs[index] = epoch
+        self._slots[index].record(value)
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Return the merged histogram of all slots inside the window."""
+        oldest = self._current() - len(self._slots) + 1
+        first = self._slots[0]
+        result = HistogramSnapshot(first.lowest, first.growth, ())
+        for epoch, hist in zip(self._epochs, self._slots):
+            if epoch >= oldest:
+                result = result.merge(hist.snapshot())
+        return result
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """Point-in-time copy of all :class:`Stats` metrics."""
+
+    questions_answered: int = 0
+    total_time: float = 0.0
+    total_tokens: int = 0
+    errors: int = 0
+    latency: Mapping[str, HistogramSnapshot] = field(default_factory=dict)
+    counters: Mapping[str, int] = field(default_factory=dict)
+    gauges: Mapping[str, float] = field(default_factory=dict)
+
+    @property
+    def average_time(self) -> float:
+        """Return the average time taken per question."""
+        if self.questions_answered == 0:
+            return 0.0
+        return self.total_time / self.questions_answered
+
+    @property
+    def average_tokens(self) -> float:
+        """Return the average tokens used per question."""
+        if self.questions_answered == 0:
+            return 0.0
+        return self.total_tokens / self.questions_answered
+
+    def percentiles(
+        self, stage: str = "total", qs: Iterable[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, float]:
+        """Return latency percentiles for ``stage`` as ``{"p50": ...}``."""
+        snap = self.latency.get(stage)
+        if snap is None:
+            return {f"p{q:g}": 0.0 for q in qs}
+        return snap.percentiles(qs)
+
+    def merge(self, other: "StatsSnapshot") -> "StatsSnapshot":
+        """Return a snapshot combining ``self`` and ``other``.
+
+        Counters and histograms are added; gauges of the same name are summed,
+        which suits per-process values such as queue depths.
+        """
+        latency = dict(self.latency)
+        for stage, snap in other.latency.items():
+            prev = latency.get(stage)
+            latency[stage] = snap if prev is None else prev.merge(snap)
+        counters = dict(self.counters)
+        for name, value in other.counters.items():
+            counters[name] = counters.get(name, 0) + value
+        gauges = dict(self.gauges)
+        for name, value in other.gauges.items():
+            gauges[name] = gauges.get(name, 0.0) + value
+        return StatsSnapshot(
+            self.questions_answered + other.questions_answered,
+            self.total_time + other.total_time,
+            self.total_tokens + other.total_tokens,
+            self.errors + other.errors,
+            latency,
+            counters,
+            gauges,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON serialisable representation of every metric."""
+        return {
+            "questions_answered": self.questions_answered,
+            "total_time": self.total_time,
+            "total_tokens": self.total_tokens,
+            "errors": self.errors,
+            "latency": {k: v.to_dict() for k, v in self.latency.items()},
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "StatsSnapshot":
+        """Rebuild a snapshot produced by :meth:`to_dict`."""
+        return cls(
+            int(data.get("questions_answered", 0)),
+            float(data.get("total_time", 0.0)),
+            int(data.get("total_tokens", 0)),
+            int(data.get("errors", 0)),
+            {
+                k: HistogramSnapshot.from_dict(v)
+                for k, v in data.get("latency", {}).items()
+            },
+            {k: int(v) for k, v in data.get("counters", {}).items()},
+            {k: float(v) for k, v in data.get("gauges", {}).items()},
+        )
 
 
 @dataclass
@@ -12,16 +341,43 @@ class Stats:
     """Container tracking per-question metrics.
 
     The object internally protects its mutable state with a :class:`~threading.Lock`
-    so that worker threads can safely update statistics concurrently. Consumers
-    such as the GUI read the aggregated properties like
-    :attr:`questions_answered` or :attr:`average_time` to display live metrics.
+    so that worker threads can safely update statistics concurrently.  Each
+    update holds the lock for a few additions only.  Consumers such as the GUI
+    read the aggregated properties like :attr:`questions_answered` or
+    :attr:`average_time`, or take a consistent :meth:`snapshot` of every metric
+    at once.
+
+    Per-stage latencies are kept in log-bucketed histograms (see
+    :data:`STAGES`) and queried through :meth:`percentiles`.  When
+    ``latency_window`` is set, the histograms only cover that many trailing
+    seconds.
+
+    Free-form event counters (for example cache hits) are added with
+    :meth:`increment` and point-in-time values such as queue depths with
+    :meth:`set_gauge`.
     """
 
     total_time: float = 0.0
     total_tokens: int = 0
     questions_answered: int = 0
     errors: int = 0
+    latency_window: float | None = None
     _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+    _stages: Dict[str, LatencyHistogram | SlidingHistogram] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _counters: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _gauges: Dict[str, float] = field(default_factory=dict, init=False, repr=False)
+
+    def _histogram(self, stage: str) -> LatencyHistogram | SlidingHistogram:
+        hist = self._stages.get(stage)
+        if hist is None:
+            if self.latency_window is None:
+                hist = LatencyHistogram()
+            else:
+                hist = SlidingHistogram(self.latency_window)
+            self._stages[stage] = hist
+        return hist
 
     def record(self, duration: float, tokens: int) -> None:
         """Record timing and token usage for a successful question."""
@@ -29,13 +385,57 @@ class Stats:
             self.questions_answered += 1
             self.total_time += duration
             self.total_tokens += tokens
+            self._histogram("total").record(duration)
 
+    def record_stage(self, stage: str, duration: float) -> None:
+        """Record ``duration`` seconds spent in pipeline ``stage``."""
+        with self._lock:
+            self._histogram(stage).record(duration)
 
     def record_error(self) -> None:
         """Increment the error counter."""
         with self._lock:
             self.errors += 1
 
+    def increment(self, name: str, value: int = 1) -> None:
+        """Add ``value`` to the event counter ``name``."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set the gauge ``name`` to ``value``; the last write wins."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> StatsSnapshot:
+        """Return all metrics copied in one critical section."""
+        with self._lock:
+            return StatsSnapshot(
+                self.questions_answered,
+                self.total_time,
+                self.total_tokens,
+                self.errors,
+                {name: hist.snapshot() for name, hist in self._stages.items()},
+                dict(self._counters),
+                dict(self._gauges),
+            )
+
+    def latency_snapshots(self) -> Dict[str, HistogramSnapshot]:
+        """Return a histogram snapshot for every stage recorded so far."""
+        with self._lock:
+            return {name: hist.snapshot() for name, hist in self._stages.items()}
+
+    def percentiles(
+        self, stage: str = "total", qs: Iterable[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, float]:
+        """Return latency percentiles for ``stage`` as ``{"p50": ...}``."""
+        with self._lock:
+            hist = self._stages.get(stage)
+            snap = hist.snapshot() if hist is not None else None
+        if snap is None:
+            return {f"p{q:g}": 0.0 for q in qs}
+        return snap.percentiles(qs)
+
     @property
     def average_time(self) -> float:
         """Return the average time taken per question."""
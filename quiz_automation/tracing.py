@@ -0,0 +1,286 @@
+"""Lightweight span tracing for the question pipeline.
+
+:func:`span` and :func:`traced` record how long each stage of a question takes
+(OCR, clipboard copy, ChatGPT round trip, click, ...).  Spans opened while
+another span is active on the same thread become its children, so every
+question yields one timeline that can be exported as Chrome trace-event JSON
+(``chrome://tracing`` or Perfetto) or as OTLP/JSON spans for OpenTelemetry
+collectors.
+
+Tracing is disabled by default.  In that state :func:`span` returns a shared
+no-op context manager, so instrumented code pays a single attribute check.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """A single timed operation."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    thread_id: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Return the span duration in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class _NoopSpan:
+    """Context manager returned while tracing is off or a trace is unsampled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+# ``None`` outside any trace, ``_UNSAMPLED`` inside a trace that was dropped by
+# sampling, otherwise the active :class:`Span`.
+_UNSAMPLED = object()
+_current: contextvars.ContextVar[Any] = contextvars.ContextVar(
+    "quiz_automation_span", default=None
+)
+
+
+class _ActiveSpan:
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span) -> None:
+        self._tracer = tracer
+        self._span = span
+        self._token: Optional[contextvars.Token[Any]] = None
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self._span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self._span.attributes["error"] = repr(exc)
+        assert self._token is not None
+        _current.reset(self._token)
+        self._tracer._finished.append(self._span)
+
+
+class _UnsampledTrace:
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> None:
+        self._token = _current.set(_UNSAMPLED)
+
+    def __exit__(self, *exc: object) -> None:
+        _current.reset(self._token)
+
+
+class Tracer:
+    """Collect :class:`Span` objects in a bounded in-memory buffer.
+
+    ``sample_rate`` is applied once per trace (root span); children inherit
+    the decision so sampled timelines are always complete.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 1.0,
+        max_spans: int = 100_000,
+    ) -> None:
+        """Create a tracer keeping at most ``max_spans`` finished spans."""
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._finished: Deque[Span] = deque(maxlen=max_spans)
+        self._random = random.Random()  # nosec B311 - sampling, not security
+
+    def configure(
+        self, enabled: bool | None = None, sample_rate: float | None = None
+    ) -> None:
+        """Update ``enabled`` and/or ``sample_rate`` in place."""
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError("sample_rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if enabled is not None:
+            self.enabled = enabled
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Return a context manager timing ``name``.
+
+        Outside an active trace the span starts a new trace, subject to
+        sampling.  The context manager yields the :class:`Span` (or ``None``
+        when nothing is recorded) so callers can attach attributes.
+        """
+        if not self.enabled:
+            return _NOOP
+        parent = _current.get()
+        if parent is _UNSAMPLED:
+            return _NOOP
+        if parent is None:
+            if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+                return _UnsampledTrace()
+            trace_id = os.urandom(16).hex()
+            parent_id = None
+        else:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+        span = Span(
+            name,
+            trace_id,
+            os.urandom(8).hex(),
+            parent_id,
+            time.time_ns(),
+            thread_id=threading.get_ident(),
+            attributes=attributes,
+        )
+        return _ActiveSpan(self, span)
+
+    def traced(self, name: str | None = None) -> Callable[[F], F]:
+        """Decorate a function so each call runs inside :meth:`span`."""
+
+        def decorator(func: F) -> F:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    # -- inspection and export ------------------------------------------
+    def spans(self) -> List[Span]:
+        """Return finished spans in completion order."""
+        return list(self._finished)
+
+    def clear(self) -> None:
+        """Drop all finished spans."""
+        self._finished.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return finished spans as a Chrome trace-event document."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": "quiz",
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {**s.attributes, "trace_id": s.trace_id},
+            }
+            for s in self._finished
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self, service_name: str = "quiz_automation") -> Dict[str, Any]:
+        """Return finished spans in the OTLP/JSON ``resourceSpans`` layout."""
+
+        def attrs(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [
+                {"key": k, "value": {"stringValue": str(v)}} for k, v in values.items()
+            ]
+
+        spans = [
+            {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": attrs(s.attributes),
+            }
+            for s in self._finished
+        ]
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": attrs({"service.name": service_name})},
+                    "scopeSpans": [
+                        {"scope": {"name": "quiz_automation"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+    def export(self, path: str | Path, fmt: str = "chrome") -> None:
+        """Write finished spans to ``path`` as ``"chrome"`` or ``"otlp"`` JSON."""
+        if fmt == "chrome":
+            data = self.to_chrome_trace()
+        elif fmt == "otlp":
+            data = self.to_otlp()
+        else:
+            raise ValueError(f"Unknown trace format '{fmt}'")
+        with Path(path).open("w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+
+
+#: Process-wide tracer used by the instrumented pipeline.
+tracer = Tracer()
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Open a span on the process-wide :data:`tracer`."""
+    if not tracer.enabled:
+        return _NOOP
+    return tracer.span(name, **attributes)
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorate a function with a span on the process-wide :data:`tracer`.
+
+    The tracer is looked up on every call, so replacing :data:`tracer` (for
+    example in tests) also affects functions decorated earlier.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            active = tracer
+            if not active.enabled:
+                return func(*args, **kwargs)
+            with active.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+__all__ = ["Span", "Tracer", "span", "traced", "tracer"]
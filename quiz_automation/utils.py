@@ -5,6 +5,7 @@ from __future__ import annotations
 import base64
 import contextlib
 import hashlib
+import importlib
 import io
 import logging
 import subprocess  # nosec B404
@@ -16,6 +17,32 @@ from .types import Region
 logger = logging.getLogger(__name__)
 
 
+class LazyModule:
+    """Stand-in for module *name* that imports it on first attribute access.
+
+    When the import fails, attributes are looked up on ``fallback`` instead,
+    so ``hasattr`` checks for optional dependencies keep working.  Attributes
+    set on the proxy (e.g. by ``monkeypatch``) shadow the module's.
+    """
+
+    def __init__(self, name: str, fallback: Any = None) -> None:
+        """Remember *name*; nothing is imported yet."""
+        self.__dict__.update(_name=name, _fallback=fallback, _module=None)
+
+    def _load(self) -> Any:
+        module = self.__dict__["_module"]
+        if module is None:
+            try:
+                module = importlib.import_module(self.__dict__["_name"])
+            except Exception:  # pragma: no cover - depends on installed packages
+                module = self.__dict__["_fallback"]
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+
 def hash_text(text: str) -> str:
     """Return a SHA256 hash for *text*."""
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
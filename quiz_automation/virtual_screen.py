@@ -0,0 +1,184 @@
+"""Synthetic in-memory screen for load testing without a display.
+
+:class:`VirtualScreen` is a :class:`~quiz_automation.capture.CaptureSource`
+that renders quiz frames (question line plus lettered options with
+checkboxes) into raw RGB buffers shaped like :mod:`mss` grabs.  Each question
+is rendered once and the same frame is returned for ``repeat`` consecutive
+grabs, so frames can be produced at thousands per second, optionally paced to
+a fixed ``rate``.  :class:`VirtualOCR` (OCR backend ``"virtual"``) reads the
+text carried by the frame instead of running Tesseract, which lets
+:class:`~quiz_automation.watcher.Watcher` and
+:class:`~quiz_automation.runner.QuizRunner` run their full loops on a
+headless CI box.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from .types import Region
+
+_WORDS = (
+    "sky blue ocean planet river mountain energy light sound cell atom "
+    "gravity orbit molecule carbon oxygen water forest desert storm"
+).split()
+
+
+@dataclass(frozen=True)
+class VirtualFrame:
+    """Rendered quiz frame with the ``size``/``rgb`` attributes of an mss shot.
+
+    ``text`` is the question as OCR would read it; ``index`` numbers the
+    questions shown so far.
+    """
+
+    size: Tuple[int, int]
+    rgb: bytes
+    text: str
+    index: int
+
+
+def random_questions(seed: int = 0, options: int = 4) -> Iterator[str]:
+    """Yield an endless, reproducible stream of OCR-style quiz texts."""
+    rng = random.Random(seed)  # nosec B311 - synthetic test data
+    while True:
+        lines = [" ".join(rng.choice(_WORDS) for _ in range(8)) + "?"]
+        for i in range(options):
+            words = " ".join(rng.choice(_WORDS) for _ in range(3))
+            lines.append(f"{chr(ord('A') + i)}) {words}")
+        yield "\n".join(lines)
+
+
+def render_quiz(text: str, size: Tuple[int, int]) -> bytes:
+    """Return RGB bytes of *text* drawn as a quiz on a white background.
+
+    Each character becomes a dark glyph cell whose shade depends on the
+    character, so different questions produce different pixels.  Option lines
+    (every line after the first) get a checkbox in front of them.
+    """
+    width, height = size
+    buf = bytearray(b"\xff" * (width * height * 3))
+    lines = text.splitlines() or [""]
+    line_h = max(6, height // (len(lines) + 1))
+    glyph_w, glyph_h = max(2, line_h // 3), max(2, line_h // 2)
+    margin = line_h // 2
+
+    def fill(x: int, y: int, row: bytes, rows: int) -> None:
+        row = row[: max(0, (width - x) * 3)]
+        for yy in range(y, min(y + rows, height)):
+            offset = (yy * width + x) * 3
+            buf[offset : offset + len(row)] = row
+
+    for i, line in enumerate(lines):
+        y = margin + i * line_h
+        if y >= height:
+            break
+        x = margin
+        if i:
+            box = glyph_h + 2
+            fill(x, y, b"\x30" * (box * 3), box)
+            fill(x + 1, y + 1, b"\xff" * ((box - 2) * 3), box - 2)
+            x += box + glyph_w
+        row = b"".join(bytes((40 + (ord(c) * 37) % 128,)) * (glyph_w * 3) for c in line)
+        fill(x, y, row, glyph_h)
+    return bytes(buf)
+
+
+class VirtualScreen:
+    """Capture source producing rendered quiz frames from memory.
+
+    Parameters
+    ----------
+    questions:
+        Question texts to show in order; the screen runs dry after the last
+        one.  Defaults to an endless :func:`random_questions` stream.
+    size:
+        Frame size in pixels.  ``None`` uses the size of the grabbed region.
+    rate:
+        Frames per second to pace :meth:`grab` to.  ``None`` produces frames
+        as fast as they are requested.
+    repeat:
+        Consecutive grabs showing the same question, modelling a watcher
+        polling an unchanged screen.
+    limit:
+        Total frames to produce before :meth:`grab` returns ``None``.
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[str] | None = None,
+        *,
+        size: Tuple[int, int] | None = None,
+        rate: float | None = None,
+        repeat: int = 1,
+        limit: int | None = None,
+        seed: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a screen; nothing is rendered until the first grab."""
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if repeat < 1:
+            raise ValueError("repeat must be at least 1")
+        self._questions = iter(
+            questions if questions is not None else random_questions(seed)
+        )
+        self.size = size
+        self.rate = rate
+        self.repeat = repeat
+        self.limit = limit
+        self._clock = clock
+        self._sleep = sleep
+        self._origin: Optional[float] = None
+        self._current: Optional[VirtualFrame] = None
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.questions = 0
+
+    def grab(self, region: Region | None = None) -> Any:
+        """Return the next frame, or ``None`` once the screen has run dry."""
+        with self._lock:
+            if self.limit is not None and self.frames >= self.limit:
+                return None
+            if self.rate is not None:
+                now = self._clock()
+                if self._origin is None:
+                    self._origin = now
+                delay = self._origin + self.frames / self.rate - now
+                if delay > 0:
+                    self._sleep(delay)
+            if self._current is None or self.frames % self.repeat == 0:
+                text = next(self._questions, None)
+                if text is None:
+                    return None
+                size = self.size or (
+                    (region.width, region.height) if region else (600, 400)
+                )
+                self._current = VirtualFrame(
+                    size, render_quiz(text, size), text, self.questions
+                )
+                self.questions += 1
+            self.frames += 1
+            return self._current
+
+
+class VirtualOCR:
+    """OCR backend returning the text carried by a :class:`VirtualFrame`."""
+
+    def __call__(self, img: Any) -> str:
+        """Return ``img.text``, or an empty string for other images."""
+        return getattr(img, "text", "")
+
+
+__all__ = [
+    "VirtualFrame",
+    "VirtualOCR",
+    "VirtualScreen",
+    "random_questions",
+    "render_quiz",
+]
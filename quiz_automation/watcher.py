@@ -7,8 +7,9 @@ import threading
 import time
 from queue import Queue
 
+from .capture import CaptureSource
 from .config import Settings
-from .ocr import OCRBackend, get_backend
+from .ocr import OCRBackend, get_backend, settings_key
 from .utils import Region, hash_text, validate_region
 
 logger = logging.getLogger(__name__)
@@ -34,8 +35,15 @@ class Watcher(threading.Thread):
         queue: Queue,
         cfg: Settings,
         ocr: OCRBackend | None = None,
+        source: CaptureSource | None = None,
     ) -> None:
-        """Initialize the watcher thread."""
+        """Initialize the watcher thread.
+
+        ``source`` replaces the live :mod:`mss` capture, e.g. with a
+        :class:`~quiz_automation.capture.ReplayCapture`; the watcher stops
+        once it returns ``None``.  Without an explicit ``ocr`` the backend
+        follows ``cfg`` and is swapped by :meth:`apply_settings`.
+        """
         super().__init__(daemon=True)
         validate_region(region)
         if not isinstance(region, Region):
@@ -47,10 +55,44 @@ class Watcher(threading.Thread):
         self.pause_flag = threading.Event()
         self._last_hash: str | None = None
         self.ocr_backend = ocr or get_backend(cfg.ocr_backend)
+        self._ocr_from_cfg = ocr is None
+        self.source = source
+        self._config_lock = threading.Lock()
+
+    def apply_settings(self, cfg: Settings) -> None:
+        """Switch to the quiz region, poll interval and OCR backend of *cfg*.
+
+        Safe to call while the thread is running; the next poll uses the new
+        configuration as a whole.  The capture source and an explicitly
+        passed OCR backend are kept, and the configured backend is only
+        rebuilt when an ``ocr_*`` setting changed.
+
+        Raises
+        ------
+        ValueError
+            If the new quiz region is invalid; nothing is changed.
+        RuntimeError
+            If the new OCR backend cannot be created; nothing is changed.
+        """
+        region = cfg.quiz_region
+        validate_region(region)
+        if not isinstance(region, Region):
+            region = Region(*region)
+        backend = self.ocr_backend
+        if self._ocr_from_cfg and settings_key(cfg) != settings_key(self.cfg):
+            backend = get_backend(cfg.ocr_backend)
+        with self._config_lock:
+            if region != self.region:
+                self._last_hash = None
+            self.region = region
+            self.cfg = cfg
+            self.ocr_backend = backend
 
     # -- basic helpers -------------------------------------------------
     def capture(self):
         """Capture the configured screen region."""
+        if self.source is not None:
+            return self.source.grab(self.region)
         try:
             mss_module = _mss()
         except Exception as exc:
@@ -96,8 +138,12 @@ class Watcher(threading.Thread):
             if self.pause_flag.is_set():
                 time.sleep(self.cfg.poll_interval)
                 continue
-            img = self.capture()
-            text = self.ocr(img)
+            with self._config_lock:
+                img = self.capture()
+                text = self.ocr(img) if img is not None else ""
+            if img is None:
+                self.stop()
+                break
             if self.is_new_question(text):
                 self.queue.put(("question", img, text))
             time.sleep(self.cfg.poll_interval)
@@ -1,18 +1,197 @@
 """Command-line interface for quiz automation."""
+
 from __future__ import annotations
 
 import argparse
+import json
 import logging
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
-from quiz_automation import QuizGUI
+from quiz_automation import QuizGUI, tracing
+from quiz_automation.analytics import analyze, format_report
 from quiz_automation.runner import QuizRunner
-from quiz_automation.config import Settings, settings as global_settings
-from quiz_automation.logger import configure_logger
+from quiz_automation.capture import (
+    CaptureSource,
+    FrameRecorder,
+    RecordingCapture,
+    ReplayCapture,
+    ScreenCapture,
+)
+from quiz_automation.clicker import NullClicker
+from quiz_automation.config import Settings, settings_registry
+from quiz_automation.logger import configure_logger, get_logger
+from quiz_automation.metrics import MetricsServer
+from quiz_automation.session_log import (
+    COMPRESSIONS,
+    FORMATS,
+    RotatingSink,
+    SessionLogWriter,
+)
 from quiz_automation.chatgpt_client import ChatGPTClient
 from quiz_automation.model_client import LocalModelClient
 from quiz_automation.stats import Stats
+from quiz_automation.virtual_screen import VirtualScreen
+
+if TYPE_CHECKING:  # pragma: no cover - NumPy/OpenCV load only with templates
+    from quiz_automation.calibration import OptionCalibrator
+
+logger = get_logger(__name__)
+
+
+def _trace_output(args: argparse.Namespace, cfg: Settings) -> str | None:
+    """Return where spans are written: ``--trace`` or ``TRACE_PATH``."""
+    if args.trace:
+        return args.trace
+    return cfg.trace_path if cfg.trace_enabled else None
+
+
+def _configure_tracing(args: argparse.Namespace, cfg: Settings) -> None:
+    """Enable the process tracer from ``--trace`` flags or ``cfg``.
+
+    Spans are only collected when there is a file to write them to, so
+    ``TRACE_ENABLED`` without ``TRACE_PATH`` (or ``--trace``) is ignored.
+    """
+    output = _trace_output(args, cfg)
+    if output is None and cfg.trace_enabled:
+        logger.warning("TRACE_ENABLED is set without TRACE_PATH; tracing is off")
+    sample_rate = (
+        args.trace_sample_rate
+        if args.trace_sample_rate is not None
+        else cfg.trace_sample_rate
+    )
+    tracing.tracer.configure(enabled=output is not None, sample_rate=sample_rate)
+
+
+def _export_trace(args: argparse.Namespace, cfg: Settings) -> None:
+    """Write collected spans to ``--trace`` or ``TRACE_PATH`` if requested."""
+    output = _trace_output(args, cfg)
+    if output is not None:
+        tracing.tracer.export(output, args.trace_format)
+
+
+def _build_calibrator(
+    args: argparse.Namespace, cfg: Settings, stats: Stats
+) -> OptionCalibrator | None:
+    """Return an option calibrator when ``--option-templates`` is given."""
+    if not args.option_templates:
+        return None
+    from quiz_automation.calibration import OptionCalibrator
+    from quiz_automation.cv_expert import AdvancedUIDetector, ElementTracker
+
+    detector = AdvancedUIDetector.from_directory(
+        args.option_templates, scales=(0.75, 1.0, 1.25, 1.5)
+    )
+    return OptionCalibrator(ElementTracker(detector), cfg.quiz_region, stats=stats)
+
+
+def _offline(args: argparse.Namespace) -> bool:
+    """Return whether frames come from a recording or the virtual screen."""
+    return bool(args.replay) or args.capture == "virtual"
+
+
+def _load_settings(args: argparse.Namespace) -> Settings:
+    """Load the process settings once, applying command-line overrides.
+
+    The virtual screen also switches the OCR backend to ``virtual``.
+    """
+    return settings_registry.configure(
+        args.config,
+        temperature=args.temperature,
+        ocr_backend=(
+            "virtual" if args.capture == "virtual" and not args.replay else None
+        ),
+    )
 
 
+def _watch_settings(args: argparse.Namespace, runner: QuizRunner) -> Callable[[], None]:
+    """Apply reloaded settings to *runner* when ``--watch-config`` is given.
+
+    Returns a function that stops watching.
+    """
+    if not args.watch_config:
+        return lambda: None
+    unsubscribe = settings_registry.subscribe(runner.apply_settings)
+    settings_registry.watch(args.watch_config)
+
+    def stop() -> None:
+        settings_registry.stop_watching()
+        unsubscribe()
+
+    return stop
+
+
+def _build_capture(
+    args: argparse.Namespace,
+) -> tuple[CaptureSource | None, FrameRecorder | None]:
+    """Return the capture source for ``--replay``/``--record-frames``/``--capture``."""
+    if args.replay:
+        return ReplayCapture(args.replay, speed=args.replay_speed), None
+    if args.capture == "virtual":
+        return VirtualScreen(rate=args.virtual_rate, repeat=1), None
+    if args.record_frames:
+        recorder = FrameRecorder(args.record_frames)
+        return RecordingCapture(ScreenCapture(), recorder), recorder
+    return None, None
+
+
+def _open_session_log(args: argparse.Namespace) -> Any:
+    """Return the ``--session-log`` destination, or ``None``.
+
+    The default is a plain JSONL file.  Any rotation, compression or columnar
+    option switches to timestamped segments written by a
+    :class:`~quiz_automation.session_log.RotatingSink`.
+    """
+    if not args.session_log:
+        return None
+    if (
+        args.session_log_format == "jsonl"
+        and args.session_log_compression == "none"
+        and args.session_log_rotate_mb is None
+        and args.session_log_rotate_hours is None
+    ):
+        return open(args.session_log, "a", encoding="utf-8")
+    sink = RotatingSink(
+        args.session_log,
+        fmt=args.session_log_format,
+        compression=args.session_log_compression,
+        max_bytes=int((args.session_log_rotate_mb or 64) * 1024 * 1024),
+        max_age=(
+            args.session_log_rotate_hours * 3600
+            if args.session_log_rotate_hours is not None
+            else None
+        ),
+    )
+    return SessionLogWriter(sink)
+
+
+def analyze_main(argv: list[str]) -> None:
+    """Summarise session logs for the ``analyze`` subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="quiz-automation analyze",
+        description="Summarise --session-log files (plain, compressed or rotated)",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Session log files, rotated log base paths, directories or globs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Summarise files in this many worker processes",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON instead of text",
+    )
+    args = parser.parse_args(argv)
+    report = analyze(args.paths, workers=args.workers).to_dict()
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
 
 def main(argv: list[str] | None = None) -> None:
     """Run the quiz automation tool.
@@ -20,8 +199,15 @@ def main(argv: list[str] | None = None) -> None:
     Parameters
     ----------
     argv:
-        Optional list of command line arguments for testing purposes.
+        Optional list of command line arguments for testing purposes.  A
+        leading ``analyze`` runs :func:`analyze_main` instead.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "analyze":
+        analyze_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(description="Quiz automation entry point")
     parser.add_argument(
         "--mode",
@@ -38,6 +224,15 @@ def main(argv: list[str] | None = None) -> None:
         "--config",
         help="Path to a configuration file read by the Settings class",
     )
+    parser.add_argument(
+        "--watch-config",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Check the --config file at this interval and apply changed "
+            "regions, intervals, OCR backend and model without restarting"
+        ),
+    )
     parser.add_argument(
         "--max-questions",
         type=int,
@@ -58,35 +253,113 @@ def main(argv: list[str] | None = None) -> None:
         "--session-log",
         help="Path to a JSONL file for per-question session records",
     )
+    parser.add_argument(
+        "--session-log-format",
+        choices=FORMATS,
+        default="jsonl",
+        help="Write rotated session log segments as JSON lines or column blocks",
+    )
+    parser.add_argument(
+        "--session-log-compression",
+        choices=COMPRESSIONS,
+        default="none",
+        help="Compress each flushed session log block",
+    )
+    parser.add_argument(
+        "--session-log-rotate-mb",
+        type=float,
+        help="Start a new session log segment after this many megabytes",
+    )
+    parser.add_argument(
+        "--session-log-rotate-hours",
+        type=float,
+        help="Start a new session log segment after this many hours",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port in headless mode",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        help=(
+            "Interface the metrics listener binds to (overrides METRICS_HOST, "
+            "default 127.0.0.1); use 0.0.0.0 for a remote Prometheus"
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        help=(
+            "Record per-question stage spans and write them to this JSON file "
+            "(overrides TRACE_PATH)"
+        ),
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=["chrome", "otlp"],
+        default="chrome",
+        help="Trace file format: Chrome trace events or OTLP/JSON spans",
+    )
+    parser.add_argument(
+        "--trace-sample-rate",
+        type=float,
+        help="Fraction of questions to trace (overrides TRACE_SAMPLE_RATE)",
+    )
+    parser.add_argument(
+        "--option-templates",
+        help="Directory of option template PNGs used to locate click targets",
+    )
+    parser.add_argument(
+        "--record-frames",
+        help="Store every captured frame (deduplicated, compressed) in this directory",
+    )
+    parser.add_argument(
+        "--replay",
+        help=(
+            "Replay frames recorded with --record-frames instead of capturing "
+            "the screen; uses the local model and does not click"
+        ),
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        help="Replay at the recorded pace times this factor (default: max speed)",
+    )
+    parser.add_argument(
+        "--capture",
+        choices=["screen", "virtual"],
+        default="screen",
+        help=(
+            "Frame source: the real screen or a synthetic in-memory quiz screen "
+            "for load tests (uses the local model and does not click)"
+        ),
+    )
+    parser.add_argument(
+        "--virtual-rate",
+        type=float,
+        help="Frames per second produced by --capture virtual (default: max speed)",
+    )
     args = parser.parse_args(argv)
-
+    if args.watch_config is not None and not args.config:
+        parser.error("--watch-config requires --config")
 
     level = getattr(logging, args.log_level.upper(), logging.INFO)
     configure_logger(level=level)
 
-    log_file = (
-        open(args.session_log, "a", encoding="utf-8")
-        if args.session_log
-        else None
-    )
+    log_file = _open_session_log(args)
 
     if args.mode == "gui":
         gui = QuizGUI()
-        cfg = Settings(_env_file=args.config) if args.config else Settings()
-        if args.temperature is not None:
-            cfg.temperature = args.temperature
-        for attr in (
-            "openai_model",
-            "openai_system_prompt",
-            "ocr_backend",
-            "temperature",
-        ):
-            setattr(global_settings, attr, getattr(cfg, attr))
+        cfg = _load_settings(args)
+        _configure_tracing(args, cfg)
         options = list("ABCD")
         stats = Stats()
         model_client = (
-            ChatGPTClient() if args.backend == "chatgpt" else LocalModelClient()
+            ChatGPTClient()
+            if args.backend == "chatgpt" and not _offline(args)
+            else LocalModelClient()
         )
+        capture, recorder = _build_capture(args)
         runner = QuizRunner(
             cfg.quiz_region,
             cfg.chat_box,
@@ -97,8 +370,13 @@ def main(argv: list[str] | None = None) -> None:
             model_client=model_client,
             stats=stats,
             max_questions=args.max_questions,
+            poll_interval=cfg.poll_interval,
             session_log=log_file,
+            calibrator=_build_calibrator(args, cfg, stats),
+            capture=capture,
+            clicker=NullClicker(cfg.option_base) if _offline(args) else None,
         )
+        stop_watching = _watch_settings(args, runner)
         runner.start()
         app = getattr(gui, "_app", None)
         try:
@@ -113,27 +391,25 @@ def main(argv: list[str] | None = None) -> None:
         except KeyboardInterrupt:
             pass
         finally:
+            stop_watching()
             runner.stop()
             runner.join()
+            _export_trace(args, cfg)
             if log_file:
                 log_file.close()
+            if recorder is not None:
+                recorder.close()
     else:
-        cfg_kwargs = {"_env_file": args.config} if args.config else {}
-        if args.temperature is not None:
-            cfg_kwargs["temperature"] = args.temperature
-        cfg = Settings(**cfg_kwargs)
-        for attr in (
-            "openai_model",
-            "openai_system_prompt",
-            "ocr_backend",
-            "temperature",
-        ):
-            setattr(global_settings, attr, getattr(cfg, attr))
+        cfg = _load_settings(args)
+        _configure_tracing(args, cfg)
         options = list("ABCD")
         stats = Stats()
         model_client = (
-            ChatGPTClient() if args.backend == "chatgpt" else LocalModelClient()
+            ChatGPTClient()
+            if args.backend == "chatgpt" and not _offline(args)
+            else LocalModelClient()
         )
+        capture, recorder = _build_capture(args)
 
         runner = QuizRunner(
             cfg.quiz_region,
@@ -141,12 +417,26 @@ def main(argv: list[str] | None = None) -> None:
             cfg.response_region,
             options,
             cfg.option_base,
-
             model_client=model_client,
             stats=stats,
             max_questions=args.max_questions,
+            poll_interval=cfg.poll_interval,
             session_log=log_file,
+            calibrator=_build_calibrator(args, cfg, stats),
+            capture=capture,
+            clicker=NullClicker(cfg.option_base) if _offline(args) else None,
+        )
+        metrics_server = (
+            MetricsServer(
+                stats,
+                host=args.metrics_host or cfg.metrics_host,
+                port=args.metrics_port,
+            ).start()
+            if args.metrics_port is not None
+            else None
         )
+        started = time.perf_counter()
+        stop_watching = _watch_settings(args, runner)
         runner.start()
         try:
             while True:
@@ -156,10 +446,23 @@ def main(argv: list[str] | None = None) -> None:
         except KeyboardInterrupt:
             pass
         finally:
+            stop_watching()
             runner.stop()
             runner.join()
+            if _offline(args):
+                elapsed = time.perf_counter() - started
+                answered = stats.questions_answered
+                print(
+                    f"Answered {answered} questions in {elapsed:.2f}s "
+                    f"({answered / elapsed if elapsed else 0.0:.1f}/s)"
+                )
+            _export_trace(args, cfg)
+            if metrics_server is not None:
+                metrics_server.stop()
             if log_file:
                 log_file.close()
+            if recorder is not None:
+                recorder.close()
 
 
 if __name__ == "__main__":
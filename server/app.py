@@ -1,21 +1,80 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import binascii
+import json
 import os
+import socket
+import threading
+import time
+import uuid
+import weakref
 from io import BytesIO
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional
 
-from celery import Celery
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from celery import Celery, group, states
+from celery.backends.base import BaseKeyValueStoreBackend
+from celery.result import GroupResult
+from celery.signals import task_postrun, worker_process_init
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
+from quiz_automation.logger import get_logger
+from quiz_automation.metrics import CONTENT_TYPE, render_metrics
 from quiz_automation.model_client import LocalModelClient
-from quiz_automation.ocr import get_backend
+from quiz_automation.ocr import OCRBackend, get_backend
+from quiz_automation.stats import Stats, StatsSnapshot
+
+from .blobs import FileBlobStore, default_blob_store
+from .cache import ResultCache, content_key
 
 # Celery configuration -----------------------------------------------------
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+# Questions handled by one Celery task in ``POST /answer/batch``.
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "50"))
+# Answer text-only requests in the API process instead of via the broker.
+INLINE_TEXT_ANSWERS = os.getenv("INLINE_TEXT_ANSWERS", "0").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+# Maximum concurrent inline answers; excess requests fall back to Celery.
+INLINE_MAX_CONCURRENCY = int(os.getenv("INLINE_MAX_CONCURRENCY", "4"))
+# Upper bound for ``?wait=`` long polls, in seconds.
+LONG_POLL_MAX_WAIT = float(os.getenv("LONG_POLL_MAX_WAIT", "30"))
+# Seconds between SSE keep-alive comments, and between the shared result
+# backend checks that wake long polls and streams.
+SSE_KEEPALIVE = float(os.getenv("SSE_KEEPALIVE", "15"))
+SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", "0.2"))
+# Maximum concurrently open SSE streams; further streams get 503.
+SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", "256"))
+# Run a dummy OCR/model inference when a worker process starts.
+WORKER_PREWARM = os.getenv("WORKER_PREWARM", "0").lower() in {"1", "true", "yes"}
+# Directory shared by the API and the workers.  Only when it is set are base64
+# images longer than ``INLINE_IMAGE_MAX_BYTES`` and raw uploads moved to the
+# blob store, with just their key sent through the broker; otherwise images
+# travel inline.  Blobs left behind by lost tasks are pruned after
+# ``BLOB_TTL``, checked at most every ``BLOB_PRUNE_INTERVAL`` seconds.
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR") or None
+INLINE_IMAGE_MAX_BYTES = int(os.getenv("INLINE_IMAGE_MAX_BYTES", "65536"))
+BLOB_TTL = float(os.getenv("BLOB_TTL", "3600"))
+BLOB_PRUNE_INTERVAL = float(os.getenv("BLOB_PRUNE_INTERVAL", "300"))
+# Largest raw body accepted by ``POST /answer/image``.
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+# Seconds identical requests share one task id; ``0`` disables deduplication.
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "300"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+# Redis hash on the result backend where worker processes publish their
+# statistics; entries not updated for ``WORKER_STATS_TTL`` seconds are dropped.
+WORKER_STATS_KEY = "quiz_automation:worker_stats"
+WORKER_STATS_TTL = float(os.getenv("WORKER_STATS_TTL", "3600"))
+
+logger = get_logger(__name__)
 
 celery_app = Celery(
     "quiz_tasks", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND
@@ -25,6 +84,18 @@ celery_app = Celery(
 
 app = FastAPI()
 
+# Per-process metrics for OCR and model stages.  With eager execution or
+# inline answers the tasks record here directly; each Celery worker process
+# keeps its own and publishes it for ``/stats`` and ``/metrics`` (see
+# :func:`collect_stats`).
+stats = Stats()
+
+_inline_slots = threading.BoundedSemaphore(INLINE_MAX_CONCURRENCY)
+_stream_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+# Content key -> task id, shared by duplicate ``/answer`` requests.
+result_cache = ResultCache(RESULT_CACHE_TTL, RESULT_CACHE_SIZE)
+
 
 class AnswerRequest(BaseModel):
     """Payload for the answer endpoint."""
@@ -34,42 +105,696 @@ class AnswerRequest(BaseModel):
     options: List[str]
 
 
-@celery_app.task
-def process_answer(
-    question: str | None, image_b64: str | None, options: List[str]
-) -> str:
-    """Run OCR and model prediction for *question* or *image*."""
+class BatchAnswerRequest(BaseModel):
+    """Payload for the batch answer endpoint."""
 
-    question_text = question or ""
-    if image_b64 and not question:
+    items: List[AnswerRequest] = Field(min_length=1)
+    chunk_size: Optional[int] = Field(default=None, gt=0)
+
+
+# Worker warm state ------------------------------------------------------
+#
+# Heavy objects are built once per process and reused by every task.  Worker
+# processes fill the cache from the ``worker_process_init`` signal; the API
+# process (eager mode, inline answers) fills it lazily on first use.
+
+_worker_state: dict[str, Any] = {}
+_worker_state_lock = threading.Lock()
+
+
+def _cached(key: str, factory: Any) -> Any:
+    value = _worker_state.get(key)
+    if value is None:
+        with _worker_state_lock:
+            value = _worker_state.get(key)
+            if value is None:
+                value = _worker_state[key] = factory()
+    return value
+
+
+def _pil_image() -> Any:
+    def load() -> Any:
         try:
             from PIL import Image  # type: ignore
         except Exception as exc:  # pragma: no cover - optional dependency
             raise RuntimeError("Pillow not available") from exc
+        return Image
+
+    return _cached("pil_image", load)
+
+
+def _ocr_backend() -> OCRBackend:
+    def build() -> OCRBackend:
+        backend = get_backend()
+        # Report preprocessing steps alongside the other stages.
+        preprocess = getattr(backend, "preprocess", None)
+        if preprocess is not None:
+            preprocess.stats = stats
+        return backend
+
+    return _cached("ocr_backend", build)
+
+
+def _model_client() -> LocalModelClient:
+    return _cached("model_client", LocalModelClient)
+
+
+def _blob_store() -> FileBlobStore:
+    return _cached("blob_store", default_blob_store)
+
+
+_last_blob_prune = 0.0
+
+
+def _put_blob(data: bytes) -> str:
+    """Store *data* for a task, pruning stale blobs every so often."""
+
+    global _last_blob_prune
+    store = _blob_store()
+    now = time.monotonic()
+    if now - _last_blob_prune >= BLOB_PRUNE_INTERVAL:
+        _last_blob_prune = now
+        stats.increment("blobs_pruned", store.prune(BLOB_TTL))
+    stats.increment("blob_uploads")
+    return store.put(data)
+
+
+def warm_worker_state(prewarm: bool = False) -> None:
+    """Import and construct the OCR engine and model client for this process.
+
+    With ``prewarm`` a dummy inference runs through both so the first real
+    task does not pay for lazy initialisation inside the libraries.
+    Failures are logged rather than raised so a worker without Pillow or
+    Tesseract can still serve text-only tasks.
+    """
+
+    client = _model_client()
+    try:
+        image_module = _pil_image()
+        backend = _ocr_backend()
+    except Exception:
+        logger.warning("OCR warm-up skipped", exc_info=True)
+        image_module = backend = None
+    if not prewarm:
+        return
+    client.ask("warm up", ["warm", "up"])
+    if image_module is not None and backend is not None:
+        try:
+            backend(image_module.new("RGB", (32, 32), "white"))
+        except Exception:
+            logger.warning("OCR pre-warm inference failed", exc_info=True)
+
+
+@worker_process_init.connect
+def _init_worker_process(**_: Any) -> None:  # pragma: no cover - worker only
+    warm_worker_state(prewarm=WORKER_PREWARM)
+    if BLOB_STORE_DIR:
+        _blob_store().prune(BLOB_TTL)
+
+
+@celery_app.task
+def process_answer(
+    question: str | None,
+    image_b64: str | None,
+    options: List[str],
+    image_ref: str | None = None,
+) -> str:
+    """Run OCR and model prediction for *question* or *image*.
+
+    ``image_ref`` names an image in the blob store instead of passing it
+    inline as ``image_b64``.  Tasks are not retried, so the blob is deleted
+    once the task returns or raises; only a task lost with its worker leaves
+    the blob behind until it is pruned after ``BLOB_TTL``.
+    """
+
+    try:
+        return _answer(question, image_b64, options, image_ref)
+    except Exception:
+        if image_ref:
+            _blob_store().delete(image_ref)
+        raise
+
+
+def _answer(
+    question: str | None,
+    image_b64: str | None,
+    options: List[str],
+    image_ref: str | None,
+) -> str:
+    start = time.perf_counter()
+    question_text = question or ""
+    img_bytes = None
+    if image_ref:
+        img_bytes = _blob_store().get(image_ref)
+    elif image_b64:
         img_bytes = base64.b64decode(image_b64)
-        with Image.open(BytesIO(img_bytes)) as img:
-            ocr_backend = get_backend()
-            question_text = ocr_backend(img)
+    if img_bytes is not None and not question:
+        image_module = _pil_image()
+        with image_module.open(BytesIO(img_bytes)) as img:
+            question_text = _ocr_backend()(img)
+        stats.record_stage("ocr", time.perf_counter() - start)
+
+    model_start = time.perf_counter()
+    answer = _model_client().ask(question_text, options)
+    stats.record_stage("model", time.perf_counter() - model_start)
+    stats.record(time.perf_counter() - start, 0)
+    if image_ref:
+        _blob_store().delete(image_ref)
+    return answer
+
+
+@celery_app.task
+def process_answer_chunk(items: List[dict[str, Any]]) -> List[dict[str, str]]:
+    """Answer several requests in one task; failures are reported per item."""
+
+    results: List[dict[str, str]] = []
+    for item in items:
+        try:
+            answer = process_answer(
+                item.get("question"),
+                item.get("image"),
+                item["options"],
+                item.get("image_ref"),
+            )
+        except Exception as exc:
+            stats.record_error()
+            results.append({"status": "failed", "error": str(exc)})
+        else:
+            results.append({"status": "completed", "answer": answer})
+    return results
+
+
+def _offload_image(image_b64: str | None) -> tuple[str | None, str | None]:
+    """Return ``(image_b64, image_ref)`` for a task message.
+
+    With ``BLOB_STORE_DIR`` set, images over ``INLINE_IMAGE_MAX_BYTES`` are
+    decoded once here, written to the blob store as raw bytes and replaced
+    by their key.
+    """
+
+    if not BLOB_STORE_DIR or not image_b64 or len(image_b64) <= INLINE_IMAGE_MAX_BYTES:
+        return image_b64, None
+    try:
+        data = base64.b64decode(image_b64, validate=True)
+    except binascii.Error as exc:
+        raise HTTPException(status_code=422, detail="Invalid base64 image") from exc
+    return None, _put_blob(data)
+
+
+def _answer_inline(request: AnswerRequest) -> dict[str, str] | None:
+    """Answer a text-only *request* in-process if a slot is free.
+
+    FastAPI already runs this sync endpoint on its worker thread pool; the
+    semaphore caps how many of those threads do model work at once.  The
+    result is still written to the result backend so ``GET /answer/{id}``
+    behaves the same for inline and queued answers.
+    """
 
-    client = LocalModelClient()
-    return client.ask(question_text, options)
+    if not _inline_slots.acquire(blocking=False):
+        stats.increment("inline_overflow")
+        return None
+    try:
+        answer = process_answer(request.question, None, request.options)
+    finally:
+        _inline_slots.release()
+    task_id = str(uuid.uuid4())
+    celery_app.backend.store_result(task_id, answer, states.SUCCESS)
+    stats.increment("inline_answers")
+    return {"task_id": task_id, "status": "completed", "answer": answer}
+
+
+def _submit_once(key: str, submit: Callable[[], str]) -> dict[str, str]:
+    """Return the task for *key*, calling *submit* only for new content.
+
+    Duplicates of an in-flight request get its task id; repeats of a finished
+    one also get its answer.  Failed tasks are forgotten and resubmitted.
+    """
+
+    if RESULT_CACHE_TTL <= 0:
+        return {"task_id": submit()}
+    while True:
+        task_id, shared = result_cache.single_flight(key, submit)
+        if not shared:
+            stats.increment("answer_cache_misses")
+            return {"task_id": task_id}
+        result = celery_app.AsyncResult(task_id)
+        if result.failed():
+            result_cache.discard(key, task_id)
+            continue
+        if result.successful():
+            stats.increment("answer_cache_hits")
+            return {"task_id": task_id, "status": "completed", "answer": result.result}
+        stats.increment("answer_coalesced")
+        return {"task_id": task_id}
 
 
 @app.post("/answer")
 def create_answer(request: AnswerRequest) -> dict[str, str]:
-    """Enqueue an OCR/model job and return the task id."""
+    """Enqueue an OCR/model job and return the task id.
 
-    task = process_answer.delay(request.question, request.image, request.options)
-    return {"task_id": task.id}
+    With ``INLINE_TEXT_ANSWERS`` enabled, requests carrying ``question`` text
+    and no ``image`` are answered immediately and the response also includes
+    ``status`` and ``answer``.
+    """
 
+    stats.increment("answer_requests")
+    inline: dict[str, str] = {}
 
-@app.get("/answer/{task_id}")
-def get_answer(task_id: str) -> dict[str, str]:
-    """Return task status and result when available."""
+    def submit() -> str:
+        if INLINE_TEXT_ANSWERS and request.question and not request.image:
+            body = _answer_inline(request)
+            if body is not None:
+                inline.update(body)
+                return body["task_id"]
+        image_b64, image_ref = _offload_image(request.image)
+        task = process_answer.delay(
+            request.question, image_b64, request.options, image_ref
+        )
+        return task.id
 
-    result = celery_app.AsyncResult(task_id)
+    key = content_key(request.question, request.options, request.image)
+    body = _submit_once(key, submit)
+    return inline or body
+
+
+def _enqueue_image(data: bytes, options: List[str]) -> dict[str, str]:
+    def submit() -> str:
+        if not BLOB_STORE_DIR:
+            image_b64 = base64.b64encode(data).decode("ascii")
+            return process_answer.delay(None, image_b64, options).id
+        return process_answer.delay(None, None, options, _put_blob(data)).id
+
+    return _submit_once(content_key(None, options, data), submit)
+
+
+@app.post("/answer/image")
+async def create_answer_image(
+    request: Request, options: List[str] = Query(...)
+) -> dict[str, str]:
+    """Enqueue a job for a screenshot sent as the raw request body.
+
+    Send the image bytes with any ``Content-Type`` (e.g. ``image/png``) and the
+    answer options as repeated ``?options=`` parameters.  The bytes go
+    straight to the blob store, skipping base64 and JSON decoding, and only
+    their key is passed through the broker.  Bodies over ``MAX_IMAGE_BYTES``
+    are rejected with 413, from ``Content-Length`` when given and otherwise
+    while streaming, so an oversized upload is never held in memory.
+    """
+
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+    chunks: List[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+        chunks.append(chunk)
+    data = b"".join(chunks)
+    if not data:
+        raise HTTPException(status_code=422, detail="Empty image body")
+    stats.increment("answer_requests")
+    return await run_in_threadpool(_enqueue_image, data, options)
+
+
+@app.post("/answer/batch")
+def create_batch(request: BatchAnswerRequest) -> dict[str, Any]:
+    """Enqueue many questions as a group of chunked tasks and return its id."""
+
+    size = request.chunk_size or BATCH_CHUNK_SIZE
+    items = []
+    for item in request.items:
+        image_b64, image_ref = _offload_image(item.image)
+        items.append(
+            {
+                "question": item.question,
+                "image": image_b64,
+                "options": item.options,
+                "image_ref": image_ref,
+            }
+        )
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    stats.increment("answer_requests", len(items))
+    result = group(process_answer_chunk.s(chunk) for chunk in chunks).apply_async()
+    result.save()
+    return {"batch_id": result.id, "size": len(items), "chunks": len(chunks)}
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _restore_batch(batch_id: str) -> GroupResult:
+    result = GroupResult.restore(batch_id, app=celery_app)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown batch")
+    return result
+
+
+def _task_body(result: Any) -> dict[str, str]:
     if result.successful():
         return {"status": "completed", "answer": result.result}
-    if result.failed():  # pragma: no cover - exercised via tests
-        raise HTTPException(status_code=500, detail=str(result.result))
+    if result.failed():
+        return {"status": "failed", "error": str(result.result)}
     return {"status": "pending"}
+
+
+def _ready_task_ids(task_ids: List[str]) -> set[str]:
+    """Return which of *task_ids* have finished, in one backend round trip.
+
+    Key-value result backends (Redis, memcached) answer with a single
+    ``MGET``; other backends fall back to one lookup per task.
+    """
+
+    backend = celery_app.backend
+    if isinstance(backend, BaseKeyValueStoreBackend):
+        keys = {backend.get_key_for_task(task_id): task_id for task_id in task_ids}
+        try:
+            values = backend.mget(list(keys))
+        except NotImplementedError:  # pragma: no cover - backend without MGET
+            pass
+        else:
+            pairs = values.items() if hasattr(values, "items") else zip(keys, values)
+            return {
+                keys[key]
+                for key, value in pairs
+                if value is not None
+                and backend.decode_result(value)["status"] in states.READY_STATES
+            }
+    return {task_id for task_id in task_ids if celery_app.AsyncResult(task_id).ready()}
+
+
+class _ResultWatcher:
+    """Wake waiting requests when their Celery tasks finish.
+
+    A single poller per event loop checks every watched task id with one
+    batched result-backend read each ``SSE_POLL_INTERVAL`` and resolves the
+    waiters' futures, so any number of long polls and streams cost one
+    lookup per interval instead of one each, and none of them holds a thread.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[str, set[asyncio.Future[None]]] = {}
+        self._poller: asyncio.Task[None] | None = None
+
+    async def wait(
+        self, task_ids: Iterable[str], timeout: float, any_ready: bool = False
+    ) -> set[str]:
+        """Wait up to *timeout* seconds for all of *task_ids* to finish.
+
+        With ``any_ready`` return as soon as one has finished.  Returns the
+        ids seen finished.
+        """
+
+        loop = asyncio.get_running_loop()
+        futures: dict[asyncio.Future[None], str] = {}
+        for task_id in set(task_ids):
+            future = loop.create_future()
+            self._waiters.setdefault(task_id, set()).add(future)
+            futures[future] = task_id
+        if self._poller is None:
+            self._poller = loop.create_task(self._poll())
+        try:
+            if futures:
+                await asyncio.wait(
+                    futures,
+                    timeout=timeout,
+                    return_when=(
+                        asyncio.FIRST_COMPLETED if any_ready else asyncio.ALL_COMPLETED
+                    ),
+                )
+            return {task_id for future, task_id in futures.items() if future.done()}
+        finally:
+            for future, task_id in futures.items():
+                waiters = self._waiters.get(task_id)
+                if waiters is not None:
+                    waiters.discard(future)
+                    if not waiters:
+                        del self._waiters[task_id]
+
+    async def _poll(self) -> None:
+        try:
+            while self._waiters:
+                ready = await run_in_threadpool(_ready_task_ids, list(self._waiters))
+                for task_id in ready:
+                    for future in self._waiters.pop(task_id, ()):
+                        if not future.done():
+                            future.set_result(None)
+                if self._waiters:
+                    await asyncio.sleep(SSE_POLL_INTERVAL)
+        finally:
+            self._poller = None
+
+
+_watchers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ResultWatcher] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _result_watcher() -> _ResultWatcher:
+    loop = asyncio.get_running_loop()
+    watcher = _watchers.get(loop)
+    if watcher is None:
+        watcher = _watchers[loop] = _ResultWatcher()
+    return watcher
+
+
+async def _wait_ready(result: Any, timeout: float) -> bool:
+    """Wait up to *timeout* seconds for *result* or all of a group's tasks."""
+
+    if isinstance(result, GroupResult):
+        task_ids = {child.id for child in result.results}
+    else:
+        task_ids = {result.id}
+    finished = await _result_watcher().wait(task_ids, timeout)
+    return len(finished) == len(task_ids)
+
+
+def _batch_body(result: GroupResult) -> dict[str, Any]:
+    done = [child for child in result.results if child.ready()]
+    body: dict[str, Any] = {
+        "status": "completed" if len(done) == len(result.results) else "pending",
+        "chunks_completed": len(done),
+        "chunks_total": len(result.results),
+    }
+    if body["status"] == "completed":
+        answers: List[dict[str, str]] = []
+        for child in result.results:
+            if child.successful():
+                answers.extend(child.result)
+            else:  # pragma: no cover - chunk tasks catch item errors
+                raise HTTPException(status_code=500, detail=str(child.result))
+        body["results"] = answers
+    return body
+
+
+@app.get("/answer/batch/{batch_id}")
+async def get_batch(
+    batch_id: str, wait: float = Query(default=0.0, ge=0.0)
+) -> dict[str, Any]:
+    """Return progress of a batch and, once finished, all results in order.
+
+    ``wait`` waits up to that many seconds (capped by ``LONG_POLL_MAX_WAIT``)
+    for the whole batch to finish before answering.
+    """
+
+    result = await run_in_threadpool(_restore_batch, batch_id)
+    if wait:
+        await _wait_ready(result, min(wait, LONG_POLL_MAX_WAIT))
+    return await run_in_threadpool(_batch_body, result)
+
+
+class _EventStream(StreamingResponse):
+    """SSE response that holds one of ``SSE_MAX_STREAMS`` while it is sent.
+
+    The slot is taken and given back around the whole ASGI call, so it is
+    released however the response ends, including a client that disconnects
+    before the first event.  Without a free slot the client gets 503.
+    """
+
+    def __init__(self, events: AsyncIterator[str]) -> None:
+        super().__init__(events, media_type="text/event-stream")
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if not _stream_slots.acquire(blocking=False):
+            stats.increment("streams_rejected")
+            rejected = JSONResponse(
+                {"detail": "Too many open event streams"},
+                status_code=503,
+                headers={"Retry-After": str(int(SSE_KEEPALIVE))},
+            )
+            await rejected(scope, receive, send)
+            return
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _stream_slots.release()
+
+
+def _chunk_outcome(child: Any) -> dict[str, Any]:
+    if child.successful():
+        return {"results": child.result}
+    return {"error": str(child.result)}
+
+
+@app.get("/answer/batch/{batch_id}/events")
+async def stream_batch(batch_id: str) -> StreamingResponse:
+    """Stream ``chunk`` events as batch chunks finish, then a ``done`` event.
+
+    One stream replaces many clients polling
+    ``GET /answer/batch/{batch_id}``.  At most ``SSE_MAX_STREAMS`` streams are
+    open at once.
+    """
+
+    result = await run_in_threadpool(_restore_batch, batch_id)
+
+    async def events() -> AsyncIterator[str]:
+        pending = {child.id: index for index, child in enumerate(result.results)}
+        total = len(pending)
+        watcher = _result_watcher()
+        while pending:
+            finished = await watcher.wait(pending, SSE_KEEPALIVE, any_ready=True)
+            if not finished:
+                yield ": keep-alive\n\n"
+                continue
+            for index in sorted(pending.pop(task_id) for task_id in finished):
+                outcome = await run_in_threadpool(_chunk_outcome, result.results[index])
+                yield _sse(
+                    "chunk",
+                    {
+                        "chunk": index,
+                        "chunks_completed": total - len(pending),
+                        "chunks_total": total,
+                        **outcome,
+                    },
+                )
+        yield _sse("done", {"chunks_total": total})
+
+    return _EventStream(events())
+
+
+@app.get("/answer/{task_id}")
+async def get_answer(
+    task_id: str, wait: float = Query(default=0.0, ge=0.0)
+) -> dict[str, str]:
+    """Return task status and result when available.
+
+    ``wait`` turns the request into a long poll: it waits up to that many
+    seconds (capped by ``LONG_POLL_MAX_WAIT``) for the task to finish without
+    tying up a worker thread.
+    """
+
+    result = celery_app.AsyncResult(task_id)
+    if wait:
+        await _wait_ready(result, min(wait, LONG_POLL_MAX_WAIT))
+    body = await run_in_threadpool(_task_body, result)
+    if body["status"] == "failed":  # pragma: no cover - exercised via tests
+        raise HTTPException(status_code=500, detail=body["error"])
+    return body
+
+
+@app.get("/answer/{task_id}/events")
+async def stream_answer(task_id: str) -> StreamingResponse:
+    """Stream a single ``result`` event once the task finishes.
+
+    Keep-alive comments are sent every ``SSE_KEEPALIVE`` seconds while the
+    task is pending.  At most ``SSE_MAX_STREAMS`` streams are open at once.
+    """
+
+    result = celery_app.AsyncResult(task_id)
+
+    async def events() -> AsyncIterator[str]:
+        while not await _wait_ready(result, SSE_KEEPALIVE):
+            yield ": keep-alive\n\n"
+        yield _sse("result", await run_in_threadpool(_task_body, result))
+
+    return _EventStream(events())
+
+
+def _stats_client() -> Any | None:
+    """Return the result backend's Redis client, or ``None`` for other backends."""
+
+    client = getattr(celery_app.backend, "client", None)
+    return client if hasattr(client, "hgetall") else None
+
+
+@task_postrun.connect
+def _publish_worker_stats(**_: Any) -> None:
+    """Store this process's statistics for :func:`collect_stats`.
+
+    Prefork tasks run in pool children the API cannot ask directly, so after
+    every task the child writes its snapshot to ``WORKER_STATS_KEY`` under
+    its host name and pid.
+    """
+
+    if celery_app.conf.task_always_eager:
+        return
+    client = _stats_client()
+    if client is None:
+        return
+    entry = {"updated": time.time(), "stats": stats.snapshot().to_dict()}
+    try:
+        client.hset(
+            WORKER_STATS_KEY, f"{socket.gethostname()}:{os.getpid()}", json.dumps(entry)
+        )
+    except Exception:
+        logger.warning("Could not publish worker statistics", exc_info=True)
+
+
+def collect_stats() -> StatsSnapshot:
+    """Return the API process's statistics merged with every worker's.
+
+    Worker processes publish their snapshots to a Redis hash on the result
+    backend after each task; one ``HGETALL`` reads them all, and entries
+    older than ``WORKER_STATS_TTL`` are removed.  In eager mode the tasks run
+    in this process, and with a non-Redis result backend or an unreachable
+    Redis only this process is reported.
+    """
+
+    snap = stats.snapshot()
+    client = _stats_client()
+    if celery_app.conf.task_always_eager or client is None:
+        return snap
+    try:
+        entries = client.hgetall(WORKER_STATS_KEY)
+        cutoff = time.time() - WORKER_STATS_TTL
+        stale = []
+        for field, raw in entries.items():
+            entry = json.loads(raw)
+            if entry["updated"] < cutoff:
+                stale.append(field)
+            else:
+                snap = snap.merge(StatsSnapshot.from_dict(entry["stats"]))
+        if stale:
+            client.hdel(WORKER_STATS_KEY, *stale)
+    except Exception:
+        logger.warning("Could not collect worker statistics", exc_info=True)
+        return stats.snapshot()
+    return snap
+
+
+@app.get("/stats")
+def get_stats() -> dict[str, Any]:
+    """Return answer counts and p50/p95/p99 latencies per stage.
+
+    The figures cover the API process and every Celery worker process that
+    published its statistics.
+    """
+
+    snap = collect_stats()
+    return {
+        "questions_answered": snap.questions_answered,
+        "errors": snap.errors,
+        "average_time": snap.average_time,
+        "latency": {stage: hist.percentiles() for stage, hist in snap.latency.items()},
+    }
+
+
+@app.get("/metrics")
+def get_metrics() -> Response:
+    """Expose API and worker metrics in the Prometheus text format."""
+
+    return Response(render_metrics(collect_stats()), media_type=CONTENT_TYPE)
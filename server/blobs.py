@@ -0,0 +1,88 @@
+"""File-backed blob store for passing large images to Celery workers by reference.
+
+Images are written once by the API process and only the returned key travels
+through the broker.  Point ``BLOB_STORE_DIR`` at storage shared by the API and
+the workers: a common volume in multi-host deployments or ``/dev/shm`` to keep
+blobs in shared memory on a single host.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+_KEY = re.compile(r"^[0-9a-f]{32}$")
+
+
+class FileBlobStore:
+    """Store byte strings as files named by random hex keys."""
+
+    def __init__(self, root: str | Path) -> None:
+        """Use *root* as the storage directory, creating it if needed."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        if not _KEY.match(key):
+            raise KeyError(key)
+        return self.root / key
+
+    def put(self, data: bytes) -> str:
+        """Persist *data* and return its key.
+
+        The file is written under a temporary name and renamed into place so
+        readers never observe a partial blob.
+        """
+        key = uuid.uuid4().hex
+        tmp = self.root / f".{key}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, self.root / key)
+        return key
+
+    def get(self, key: str) -> bytes:
+        """Return the blob stored under *key*.
+
+        Raises
+        ------
+        KeyError
+            If *key* is malformed or unknown.
+        """
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def delete(self, key: str) -> None:
+        """Remove the blob under *key* if it exists."""
+        try:
+            self._path(key).unlink()
+        except (FileNotFoundError, KeyError):
+            pass
+
+    def prune(self, max_age: float) -> int:
+        """Delete blobs older than *max_age* seconds and return how many."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.root.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:  # pragma: no cover - concurrent prune
+                continue
+        return removed
+
+
+def default_blob_store() -> FileBlobStore:
+    """Return a store rooted at ``BLOB_STORE_DIR`` or a temp directory."""
+    root = os.getenv("BLOB_STORE_DIR") or os.path.join(
+        tempfile.gettempdir(), "quiz_blobs"
+    )
+    return FileBlobStore(root)
+
+
+__all__ = ["FileBlobStore", "default_blob_store"]
@@ -0,0 +1,123 @@
+"""Request deduplication for the answer endpoints.
+
+Identical requests map to the same content key.  :class:`ResultCache` keeps
+the Celery task id submitted for each key for ``ttl`` seconds, so concurrent
+duplicates share one in-flight task and later repeats reuse its stored result.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+def content_key(
+    question: str | None, options: Sequence[str], image: bytes | str | None = None
+) -> str:
+    """Return a stable hex digest identifying a request's content."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([question, list(options)]).encode("utf-8"))
+    if image is not None:
+        digest.update(b"\0")
+        digest.update(image.encode("ascii") if isinstance(image, str) else image)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU map from content keys to task ids with expiry.
+
+    Parameters
+    ----------
+    ttl:
+        Seconds a task id is reused after submission.
+    max_entries:
+        Oldest entries are evicted beyond this size.
+    clock:
+        Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        task_id, expires = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return task_id
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the live task id for *key*, if any."""
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key: str, task_id: str) -> None:
+        """Remember *task_id* for *key* for the next ``ttl`` seconds."""
+        with self._lock:
+            self._entries[key] = (task_id, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str, task_id: str | None = None) -> None:
+        """Forget *key*, optionally only while it still maps to *task_id*."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and task_id in (None, entry[0]):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def single_flight(self, key: str, submit: Callable[[], str]) -> Tuple[str, bool]:
+        """Return ``(task_id, shared)`` for *key*, calling *submit* at most once.
+
+        While one caller runs *submit*, others asking for the same key wait
+        for it and then share its task id (``shared`` is ``True``).  If
+        *submit* raises, the exception propagates to its caller and one of the
+        waiters submits instead.
+        """
+        while True:
+            with self._lock:
+                task_id = self._lookup(key)
+                if task_id is not None:
+                    return task_id, True
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+            pending.wait()
+        try:
+            task_id = submit()
+            self.put(key, task_id)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return task_id, False
+
+
+__all__ = ["ResultCache", "content_key"]
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation.analytics import SessionSummary, analyze, format_report
+from quiz_automation.session_log import RotatingSink
+
+
+def _records(hour, n, error_every=0):
+    for i in range(n):
+        stamp = f"2024-05-01T{hour:02d}:{i % 60:02d}:00"
+        if error_every and i % error_every == 0:
+            yield {"timestamp": stamp, "error": "TimeoutError", "message": "slow"}
+        else:
+            yield {
+                "timestamp": stamp,
+                "ocr_text": "Q?",
+                "letter": "ABCD"[i % 4],
+                "duration": (i % 10 + 1) / 10,
+                "tokens": 3,
+            }
+
+
+def test_summary_counts_records():
+    report = SessionSummary().update(_records(9, 100, error_every=10)).to_dict()
+    assert report["answered"] == 90
+    assert report["errors"] == 10
+    assert report["error_rate"] == pytest.approx(0.1)
+    assert report["error_types"] == {"TimeoutError": 10}
+    assert report["hourly"] == {"2024-05-01T09": 90}
+    assert report["tokens"]["total"] == 270
+    assert sum(report["letters"].values()) == 90
+    assert report["latency"]["max"] == pytest.approx(1.0)
+    assert report["latency"]["p50"] == pytest.approx(0.6, rel=0.06)
+    assert "Errors: 10 (10.0%)" in format_report(report)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_merges_rotated_and_compressed_files(tmp_path, workers):
+    plain = tmp_path / "a.jsonl"
+    plain.write_text("".join(json.dumps(r) + "\n" for r in _records(9, 40)))
+    sink = RotatingSink(
+        tmp_path / "b.log",
+        fmt="columnar",
+        compression="gzip",
+        max_bytes=500,
+        block_records=1,
+    )
+    for record in _records(10, 60, error_every=20):
+        sink.write_records([record])
+        sink.flush()
+    sink.close()
+    assert len(sink.segments) > 1
+
+    summary = analyze(tmp_path, workers=workers)
+    expected = SessionSummary().update(_records(9, 40))
+    expected.update(_records(10, 60, error_every=20))
+    assert summary.to_dict() == expected.to_dict()
+    assert summary.to_dict()["hourly"] == {"2024-05-01T09": 40, "2024-05-01T10": 57}
@@ -166,6 +166,40 @@ def test_answer_question_fallback_to_first_option(monkeypatch):
     assert calls == [0]
 
 
+def test_answer_question_clicks_calibrated_target(monkeypatch):
+    """A calibrator's targets for the frame are passed to ``click_option``."""
+
+    calls: list[tuple] = []
+
+    class FakeCalibrator:
+        def targets(self, frame, count):
+            calls.append(("calibrate", frame, count))
+            return [Point(5, 5), Point(5, 50)]
+
+    monkeypatch.setattr(automation, "send_to_chatgpt", lambda img, box: None)
+    monkeypatch.setattr(
+        automation,
+        "read_chatgpt_response",
+        lambda region, timeout=20.0, poll_interval=0.5: "B",
+    )
+    monkeypatch.setattr(
+        automation,
+        "click_option",
+        lambda base, idx, offset=40, targets=None: calls.append((idx, targets)),
+    )
+
+    automation.answer_question(
+        "img",
+        Point(0, 0),
+        Region(0, 0, 1, 1),
+        ["A", "B"],
+        Point(0, 0),
+        calibrator=FakeCalibrator(),
+    )
+
+    assert calls == [("calibrate", "img", 2), (1, [Point(5, 5), Point(5, 50)])]
+
+
 def test_answer_question_custom_poll_interval(monkeypatch):
     """``answer_question`` forwards ``poll_interval``."""
 
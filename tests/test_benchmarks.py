@@ -0,0 +1,48 @@
+"""Smoke tests for the benchmark suite in :mod:`benchmarks`."""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from benchmarks.__main__ import main
+from benchmarks.frames import SyntheticOCR, generate_frames
+from benchmarks.suite import compare, run
+
+
+def test_generate_frames_repeats_questions() -> None:
+    frames = list(generate_frames(6, size=(4, 2), repeat=3))
+    texts = [SyntheticOCR()(f) for f in frames]
+    assert len(set(texts)) == 2
+    assert len(frames[0].rgb) == 4 * 2 * 3
+
+
+def test_run_reports_selected_benchmarks() -> None:
+    report = run(["watcher_dedupe", "answer_question", "stats_record"], 20)
+    results = report["results"]
+    assert results["watcher_dedupe"]["extra"]["new_questions"] == 7
+    assert results["answer_question"]["iterations"] == 20
+    assert "stats_record[threads=8]" in results
+    assert report["meta"]["iterations"] == 20
+
+
+def test_compare_flags_slower_median() -> None:
+    base = {"results": {"a": {"p50": 1.0}, "b": {"p50": 1.0}}}
+    current = {"results": {"a": {"p50": 1.5}, "b": {"p50": 1.1}}}
+    regressions = compare(base, current, threshold=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("a:")
+
+
+def test_cli_writes_report(tmp_path) -> None:
+    out = tmp_path / "bench.json"
+    assert main(["local_model_ask", "--iterations", "10", "--output", str(out)]) == 0
+    assert "local_model_ask" in json.loads(out.read_text())["results"]
+
+
+def test_pipeline_load_reports_achieved_rates() -> None:
+    results = run(["pipeline_load"], 40)["results"]
+    watcher = results["pipeline_load[watcher,rate=max]"]
+    assert watcher["iterations"] == 40
+    assert watcher["extra"]["questions"] == 14
+    assert results["pipeline_load[runner,rate=500]"]["iterations"] == 10
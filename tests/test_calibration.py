@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("pydantic_settings")
+np = pytest.importorskip("numpy")
+
+from quiz_automation.calibration import OptionCalibrator, frame_fingerprint
+from quiz_automation.cv_expert import AdvancedUIDetector
+from quiz_automation.stats import Stats
+from quiz_automation.types import Point, Region
+from tests.test_cv_expert import checkbox, numpy_cv2, quiz_frame
+
+
+class CountingDetector(AdvancedUIDetector):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def detect_elements(self, frame, roi=None):
+        self.calls += 1
+        return super().detect_elements(frame, roi)
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr("quiz_automation.cv_expert.cv2", numpy_cv2())
+    return CountingDetector(templates={"checkbox": checkbox()})
+
+
+def test_targets_are_screen_centres_and_cached(detector):
+    stats = Stats()
+    calibrator = OptionCalibrator(detector, Region(100, 200, 300, 200), stats=stats)
+    frame = quiz_frame(checkbox())
+
+    expected = [Point(129, 228 + 40 * i) for i in range(4)]
+    assert calibrator.targets(frame, 4) == expected
+    assert calibrator.targets(frame.copy(), 4) == expected
+    assert detector.calls == 1
+    assert stats.snapshot().counters == {
+        "calibration_misses": 1,
+        "calibration_hits": 1,
+    }
+
+
+def test_layout_change_triggers_redetection(detector):
+    calibrator = OptionCalibrator(detector, Region(0, 0, 300, 200))
+    calibrator.targets(quiz_frame(checkbox()), 4)
+    moved = calibrator.targets(quiz_frame(checkbox(), spacing=44), 4)
+    assert detector.calls == 2
+    assert moved[1] == Point(29, 72)
+
+
+def test_missing_options_return_none(detector):
+    calibrator = OptionCalibrator(detector, Region(0, 0, 300, 200))
+    frame = quiz_frame(checkbox(), count=2)
+    assert calibrator.targets(frame, 4) is None
+    assert calibrator.targets(frame, 4) is None
+    assert detector.calls == 1
+
+
+def test_fingerprint_ignores_small_noise():
+    frame = quiz_frame(checkbox())
+    noisy = frame.copy()
+    noisy[150, 250] ^= 3
+    assert frame_fingerprint(frame) == frame_fingerprint(noisy)
+    assert frame_fingerprint(frame) != frame_fingerprint(quiz_frame(checkbox(), 3))
+
+
+def test_relocate_moves_targets_and_drops_layouts(detector):
+    calibrator = OptionCalibrator(detector, Region(0, 0, 300, 200))
+    frame = quiz_frame(checkbox())
+    calibrator.targets(frame, 4)
+    calibrator.relocate(Region(100, 200, 300, 200))
+    assert calibrator.targets(frame, 4)[0] == Point(129, 228)
+    assert detector.calls == 2
+
+
+def test_new_question_with_same_layout_hits_cache(detector):
+    stats = Stats()
+    calibrator = OptionCalibrator(detector, Region(0, 0, 300, 200), stats=stats)
+    first = quiz_frame(checkbox())
+    second = first.copy()
+    second[20:200, 60:200] = 245
+    second[26:34, 60:120] = 40  # different question text
+    assert frame_fingerprint(first) != frame_fingerprint(second)
+
+    assert calibrator.targets(first, 4) == calibrator.targets(second, 4)
+    assert detector.calls == 1
+    assert stats.snapshot().counters["calibration_hits"] == 1
+
+
+def test_fingerprint_columns_mask_other_pixels():
+    frame = quiz_frame(checkbox())
+    other = frame.copy()
+    other[:, 60:] = 0
+    assert frame_fingerprint(frame, columns=(21, 37)) == frame_fingerprint(
+        other, columns=(21, 37)
+    )
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+np = pytest.importorskip("numpy")
+
+from quiz_automation import automation
+from quiz_automation.capture import (
+    Frame,
+    FrameRecorder,
+    RecordingCapture,
+    ReplayCapture,
+    frame_bytes,
+)
+from quiz_automation.clicker import NullClicker
+from quiz_automation.model_client import LocalModelClient
+from quiz_automation.runner import QuizRunner
+from quiz_automation.types import Point, Region
+
+
+def _frame(value):
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+class ListSource:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def grab(self, region):
+        return self.frames.pop(0) if self.frames else None
+
+
+def _record(directory, values, step=1.0):
+    now = [0.0]
+    recorder = FrameRecorder(directory, clock=lambda: now[0])
+    capture = RecordingCapture(ListSource(_frame(v) for v in values), recorder)
+    for _ in values:
+        capture.grab(Region(0, 0, 6, 4))
+        now[0] += step
+    recorder.close()
+    return recorder
+
+
+def test_recorder_deduplicates_frames(tmp_path):
+    recorder = _record(tmp_path, [1, 2, 1, 1, 3])
+    assert (recorder.frames, recorder.unique) == (5, 3)
+    assert len(list(tmp_path.glob("*.rgb.gz"))) == 3
+    index = [json.loads(line) for line in (tmp_path / "index.jsonl").open()]
+    assert [e["t"] for e in index] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert index[0]["frame"] == index[2]["frame"]
+
+
+def test_replay_returns_recorded_frames_then_none(tmp_path):
+    _record(tmp_path, [1, 2, 1])
+    replay = ReplayCapture(tmp_path)
+    assert len(replay) == 3
+    frames = [replay.grab(), replay.grab(), replay.grab()]
+    assert [int(f[0, 0, 0]) for f in frames] == [1, 2, 1]
+    assert frames[0].shape == (4, 6, 3)
+    assert replay.grab() is None
+
+
+def test_replay_paces_frames_by_speed(tmp_path):
+    _record(tmp_path, [1, 2, 3], step=2.0)
+    now = [100.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    replay = ReplayCapture(tmp_path, speed=4.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        replay.grab()
+    assert sleeps == [0.5, 0.5]
+
+
+def test_replay_loops(tmp_path):
+    _record(tmp_path, [1, 2])
+    replay = ReplayCapture(tmp_path, loop=True)
+    values = [int(replay.grab()[0, 0, 0]) for _ in range(5)]
+    assert values == [1, 2, 1, 2, 1]
+
+
+def test_frame_bytes_accepts_mss_like_shots():
+    shot = Frame((2, 1), bytes(range(6)))
+    assert frame_bytes(shot) == ((2, 1), bytes(range(6)))
+    with pytest.raises(TypeError):
+        frame_bytes(object())
+
+
+def test_runner_replays_recording_offline(tmp_path, monkeypatch):
+    _record(tmp_path, [1, 2, 3, 2])
+    texts = {1: "Q one?\nA one\nB two", 2: "Q two?\nA one\nB two", 3: "Q?\nA x\nB y"}
+    monkeypatch.setattr(
+        automation.ocr,
+        "get_backend",
+        lambda name: (lambda img: texts[int(img[0, 0, 0])]),
+    )
+    clicker = NullClicker(Point(10, 100), 40)
+    runner = QuizRunner(
+        Region(0, 0, 6, 4),
+        Point(0, 0),
+        Region(0, 0, 6, 4),
+        ["A", "B"],
+        Point(10, 100),
+        model_client=LocalModelClient(),
+        capture=ReplayCapture(tmp_path),
+        clicker=clicker,
+    )
+    runner.start()
+    runner.join(timeout=2)
+
+    assert not runner.is_alive()
+    assert runner.stats.questions_answered == 4
+    assert clicker.clicks == [(10, 100), (10, 140), (10, 100), (10, 140)]
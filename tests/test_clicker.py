@@ -59,3 +59,31 @@ def test_click_raises_when_pyautogui_missing(monkeypatch):
     with pytest.raises(RuntimeError):
         clicker.Clicker().click()
 
+
+
+def test_click_option_prefers_calibrated_targets(monkeypatch):
+    """Calibrated ``targets`` override ``base``/``offset`` for covered indices."""
+
+    calls: list[tuple] = []
+    fake = types.SimpleNamespace(
+        moveTo=lambda x, y: calls.append(("move", x, y)), click=lambda: None
+    )
+    monkeypatch.setattr(clicker, "pyautogui", fake)
+
+    c = clicker.Clicker((10, 10), offset=5, targets=[(50, 60), (50, 95)])
+    c.click_option(1)
+    c.click_option(2)
+
+    assert calls == [("move", 50, 95), ("move", 10, 20)]
+
+
+def test_null_clicker_records_clicks_without_pyautogui(monkeypatch):
+    """``NullClicker`` never touches pyautogui and honours per-call targets."""
+
+    monkeypatch.setattr(clicker, "pyautogui", types.SimpleNamespace())
+
+    c = clicker.NullClicker((10, 10), offset=5)
+    c.click_option(2)
+    c.click_option(0, targets=[(70, 80)])
+
+    assert c.clicks == [(10, 20), (70, 80)]
@@ -49,3 +49,60 @@ def test_temperature_validator() -> None:
         Settings(temperature=-0.1)
     assert Settings(temperature=0.5).temperature == 0.5
 
+
+def _touch(path, text, bump):
+    import os
+
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump))
+
+
+def test_registry_loads_once_and_snapshots_are_frozen(tmp_path):
+    from quiz_automation.config import SettingsRegistry
+
+    env = tmp_path / ".env"
+    env.write_text("POLL_INTERVAL=2\n")
+    registry = SettingsRegistry()
+    cfg = registry.configure(env, temperature=0.3, ocr_backend=None)
+    assert (cfg.poll_interval, cfg.temperature, cfg.ocr_backend) == (2.0, 0.3, None)
+    assert all(registry.current() is cfg for _ in range(3))
+    assert registry.loads == 1
+    with pytest.raises(ValidationError):
+        cfg.poll_interval = 5
+    assert not registry.reload()
+
+
+def test_registry_reloads_changed_file_and_notifies(tmp_path):
+    from quiz_automation.config import SettingsRegistry
+
+    env = tmp_path / ".env"
+    env.write_text("POLL_INTERVAL=2\n")
+    registry = SettingsRegistry()
+    first = registry.configure(env)
+    seen = []
+    unsubscribe = registry.subscribe(seen.append)
+
+    _touch(env, "POLL_INTERVAL=0.5\n", 10**9)
+    assert registry.reload()
+    assert registry.current().poll_interval == 0.5
+    assert first.poll_interval == 2.0
+    assert seen == [registry.current()]
+
+    _touch(env, "POLL_INTERVAL=0\n", 2 * 10**9)
+    assert not registry.reload()
+    assert registry.current().poll_interval == 0.5
+
+    unsubscribe()
+    registry.override(poll_interval=3.0)
+    assert registry.current().poll_interval == 3.0
+    assert len(seen) == 1
+
+
+def test_module_settings_follow_registry(monkeypatch):
+    from quiz_automation.config import settings, settings_registry
+
+    monkeypatch.setattr(settings, "openai_model", "patched")
+    assert settings_registry.current().openai_model == "patched"
+    settings_registry.reset()
+    assert settings.openai_model == "o4-mini-high"
@@ -8,8 +8,6 @@ pytest.importorskip("pydantic_settings")
 np = pytest.importorskip("numpy")
 
 
-
-
 def test_detector_returns_empty_without_template(monkeypatch):
     detector = AdvancedUIDetector()
     assert detector.detect_elements(None) == []
@@ -31,3 +29,131 @@ def test_detector_uses_opencv(monkeypatch):
 def test_layout_analyzer_scores_average():
     elems = [UIElement("a", (0, 0, 1, 1), 0.5), UIElement("b", (0, 0, 1, 1), 1.0)]
     assert LayoutAnalyzer.score_layout(elems) == 0.75
+
+
+def numpy_cv2():
+    """Small NumPy implementation of the OpenCV calls used by the detector."""
+
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    def match_template(image, template, method):
+        image = image.astype(np.float64)
+        t = template.astype(np.float64)
+        t = t - t.mean()
+        windows = sliding_window_view(image, t.shape)
+        centred = windows - windows.mean(axis=(-2, -1), keepdims=True)
+        num = (centred * t).sum(axis=(-2, -1))
+        den = np.sqrt((centred**2).sum(axis=(-2, -1)) * (t**2).sum())
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    def min_max_loc(result):
+        lo, hi = np.unravel_index(result.argmin(), result.shape), np.unravel_index(
+            result.argmax(), result.shape
+        )
+        return result[lo], result[hi], lo[::-1], hi[::-1]
+
+    def resize(image, size, interpolation=None):
+        width, height = size
+        fy, fx = image.shape[0] / height, image.shape[1] / width
+        if fx == fy and fx == int(fx) and fx > 1:
+            f = int(fx)
+            cropped = image[: height * f, : width * f].astype(np.float64)
+            return (
+                cropped.reshape(height, f, width, f).mean(axis=(1, 3)).astype(np.uint8)
+            )
+        rows = np.minimum((np.arange(height) * fy).astype(int), image.shape[0] - 1)
+        cols = np.minimum((np.arange(width) * fx).astype(int), image.shape[1] - 1)
+        return image[rows[:, None], cols]
+
+    return types.SimpleNamespace(
+        imread=lambda path, flag: None,
+        matchTemplate=match_template,
+        minMaxLoc=min_max_loc,
+        resize=resize,
+        cvtColor=lambda img, code: img[..., :3].mean(axis=2).astype(np.uint8),
+        TM_CCOEFF_NORMED=5,
+        INTER_AREA=3,
+        COLOR_BGR2GRAY=6,
+        COLOR_BGRA2GRAY=10,
+    )
+
+
+def checkbox(size=16):
+    tmpl = np.full((size, size), 255, np.uint8)
+    tmpl[:2], tmpl[-2:], tmpl[:, :2], tmpl[:, -2:] = 0, 0, 0, 0
+    tmpl[size // 3 : -size // 3, size // 3 : -size // 3] = 128
+    return tmpl
+
+
+def quiz_frame(tmpl, count=4, spacing=40):
+    rng = np.random.default_rng(0)
+    frame = rng.integers(230, 256, (200, 300), dtype=np.uint8)
+    h, w = tmpl.shape
+    for i in range(count):
+        y = 20 + i * spacing
+        frame[y : y + h, 21 : 21 + w] = tmpl
+        frame[y + 4 : y + 10, 60:200] = 40  # option text
+    return frame
+
+
+def test_detector_finds_all_matches_coarse_to_fine(monkeypatch):
+    monkeypatch.setattr("quiz_automation.cv_expert.cv2", numpy_cv2())
+    tmpl = checkbox()
+    detector = AdvancedUIDetector(templates={"checkbox": tmpl})
+    elements = detector.detect_elements(quiz_frame(tmpl))
+    assert [e.bbox for e in elements] == [(21, 20 + 40 * i, 16, 16) for i in range(4)]
+    assert all(e.name == "checkbox" and e.confidence > 0.9 for e in elements)
+
+
+def test_detector_multi_scale_and_roi(monkeypatch):
+    from quiz_automation.types import Region
+
+    cv2 = numpy_cv2()
+    monkeypatch.setattr("quiz_automation.cv_expert.cv2", cv2)
+    tmpl = checkbox(16)
+    frame = quiz_frame(cv2.resize(tmpl, (24, 24)), spacing=44)
+    assert AdvancedUIDetector(templates={"box": tmpl}).detect_elements(frame) == []
+
+    detector = AdvancedUIDetector(templates={"box": tmpl}, scales=(1.0, 1.5))
+    assert len(detector.detect_elements(frame)) == 4
+    found = detector.detect_elements(frame, roi=Region(0, 50, 300, 100))
+    assert [e.bbox[:2] for e in found] == [(21, 64), (21, 108)]
+
+
+def test_non_max_suppression_keeps_best_of_overlaps():
+    from quiz_automation.cv_expert import non_max_suppression
+
+    boxes = [(0, 0, 10, 10), (1, 1, 10, 10), (50, 50, 10, 10)]
+    assert non_max_suppression(boxes, [0.8, 0.9, 0.7]) == [1, 2]
+
+
+def test_tracker_searches_near_previous_boxes(monkeypatch):
+    from quiz_automation.cv_expert import ElementTracker
+
+    monkeypatch.setattr("quiz_automation.cv_expert.cv2", numpy_cv2())
+    tmpl = checkbox()
+    detector = AdvancedUIDetector(templates={"checkbox": tmpl})
+    tracker = ElementTracker(detector, search_margin=8)
+    calls = []
+    original = detector._match
+    monkeypatch.setattr(detector, "_match", lambda *a: calls.append(1) or original(*a))
+
+    frame = quiz_frame(tmpl)
+    assert len(tracker.detect_elements(frame)) == 4
+    shifted = np.roll(frame, 3, axis=0)
+    moved = tracker.detect_elements(shifted)
+    assert [e.bbox[1] for e in moved] == [23, 63, 103, 143]
+    assert tracker.detect_elements(shifted) == moved
+    assert (tracker.full_detections, tracker.tracked_frames, len(calls)) == (1, 1, 1)
+
+    tracker.detect_elements(quiz_frame(tmpl, count=2))
+    assert tracker.full_detections == 2
+    assert len(tracker.elements) == 2
+
+
+def test_layout_analyzer_requests_redetection_on_low_confidence():
+    good = [UIElement("a", (0, 0, 1, 1), 0.95)]
+    weak = [UIElement("a", (0, 0, 1, 1), 0.81)]
+    assert not LayoutAnalyzer.needs_redetection(good)
+    assert LayoutAnalyzer.needs_redetection(weak)
+    assert LayoutAnalyzer.needs_redetection([])
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation.dashboard import SPARK_CHARS, Dashboard, sparkline
+from quiz_automation.stats import Stats
+
+
+def test_sparkline_scales_to_largest_value():
+    assert sparkline([0, 1, 2, 4]) == SPARK_CHARS[0] + "▃▅█"
+    assert sparkline([0, 0]) == SPARK_CHARS[0] * 2
+    assert sparkline([8, 0, 0, 0, 4, 8], width=3) == "▁▅█"
+    assert sparkline([]) == ""
+
+
+def test_dashboard_derives_interval_metrics():
+    stats = Stats()
+    dash = Dashboard()
+    assert not dash.sample(stats.snapshot(), now=0.0)
+
+    for _ in range(4):
+        stats.record(1.0, 10)
+        stats.record_stage("ocr", 0.1)
+        stats.record_stage("model", 0.8)
+    stats.record_error()
+    stats.increment("calibration_hits", 3)
+    stats.increment("calibration_misses")
+    stats.set_gauge("queue_depth", 1)
+    assert dash.sample(stats.snapshot(), now=30.0)
+
+    stats.record_stage("ocr", 2.0)
+    assert dash.sample(stats.snapshot(), now=60.0)
+
+    assert dash.values("throughput") == [8.0, 0.0]
+    assert dash.values("error_rate") == [0.2, 0.0]
+    assert dash.values("latency:ocr") == pytest.approx([0.1, 2.0])
+    assert dash.values("latency:model") == pytest.approx([0.8, 0.0])
+    assert dash.values("gauge:queue_depth") == [1, 1]
+    assert dash.hit_ratios == {"calibration": 0.75}
+    assert dash.stages() == ["ocr", "model", "total"]
+    assert dash.bottleneck(window=1) == "ocr"
+    assert dash.bottleneck() == "ocr"
+
+    text = dash.render(width=10)
+    assert "questions/min" in text
+    assert "ocr latency" in text
+    assert "queue_depth" in text
+    assert "calibration hit ratio: 75.0%" in text
+    assert text.endswith("Bottleneck: ocr")
+
+
+def test_dashboard_buffers_are_bounded():
+    stats = Stats()
+    dash = Dashboard(capacity=3)
+    for t in range(10):
+        stats.record(0.5, 1)
+        dash.sample(stats.snapshot(), now=float(t))
+    assert dash.values("throughput") == [60.0, 60.0, 60.0]
+    assert len(dash.values("latency:total")) == 3
+    with pytest.raises(ValueError):
+        Dashboard(capacity=0)
+
+
+def test_dashboard_hit_ratios_cover_each_interval():
+    stats = Stats()
+    dash = Dashboard()
+    stats.increment("calibration_hits", 9)
+    stats.increment("calibration_misses")
+    dash.sample(stats.snapshot(), now=0.0)
+
+    stats.increment("calibration_misses", 3)
+    stats.increment("calibration_hits")
+    dash.sample(stats.snapshot(), now=1.0)
+    assert dash.hit_ratios == {"calibration": 0.25}
+
+    dash.sample(stats.snapshot(), now=2.0)
+    assert dash.hit_ratios == {"calibration": 0.25}
+
+
+def test_dashboard_windowed_histograms_report_window_mean():
+    stats = Stats(latency_window=60.0)
+    dash = Dashboard(windowed=True)
+    for _ in range(3):
+        stats.record_stage("ocr", 0.2)
+    dash.sample(stats.snapshot(), now=0.0)
+    dash.sample(stats.snapshot(), now=1.0)
+    assert dash.values("latency:ocr") == pytest.approx([0.2])
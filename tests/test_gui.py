@@ -49,3 +49,63 @@ def test_gui_buttons_trigger_runner_methods():
         gui._emit_stop()
 
     assert calls == ["pause", "resume", "stop"]
+
+
+def test_updates_are_coalesced_into_one_render():
+    import threading
+
+    from quiz_automation.stats import Stats
+
+    class CountingStats(Stats):
+        snapshots = 0
+
+        def snapshot(self):
+            CountingStats.snapshots += 1
+            return super().snapshot()
+
+    gui = QuizGUI(refresh_interval=60)
+    stats = CountingStats()
+
+    def worker():
+        for _ in range(200):
+            stats.record(0.1, 5)
+            gui.update(stats)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert CountingStats.snapshots == 0
+    assert gui.refresh()
+    assert not gui.refresh()
+    assert CountingStats.snapshots == 1
+    assert gui.repaints == 1
+    assert "Questions: 800" in gui.last_text
+
+
+def test_dashboard_is_sampled_while_idle():
+    from quiz_automation.stats import Stats
+
+    now = [0.0]
+    gui = QuizGUI(sample_interval=1.0, clock=lambda: now[0])
+    stats = Stats()
+
+    class Runner:
+        pause = resume = stop = None
+
+    Runner.stats = stats
+    gui.connect_runner(Runner())
+    assert gui.refresh()
+    stats.record(0.5, 3)
+    gui.update(stats)
+    now[0] = 0.5
+    assert gui.refresh()
+    assert gui.dashboard.values("throughput") == []
+    now[0] = 1.0
+    assert gui.refresh()
+    now[0] = 2.0
+    assert gui.refresh()
+    assert gui.dashboard.values("throughput") == [60.0, 0.0]
+    assert "questions/min" in gui.dashboard_text
@@ -0,0 +1,77 @@
+"""Import-time budget: importing the package and CLI must stay cheap.
+
+Each check runs in a fresh interpreter so modules imported by other tests do
+not leak into the measurement.
+"""
+
+import json
+import os
+import subprocess  # nosec B404
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+#: Optional dependencies that must only load when a feature needs them.
+HEAVY = ("numpy", "cv2", "openai", "PySide6", "pyautogui", "pytesseract", "PIL")
+
+#: Upper bound for ``import quiz_automation`` measured with ``-X importtime``.
+PACKAGE_BUDGET_US = 50_000
+
+
+def _python(*args: str) -> str:
+    result = subprocess.run(  # nosec B603
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "OPENAI_API_KEY": "x"},
+    )
+    return result.stdout
+
+
+def _loaded_after(statement: str) -> list:
+    code = (
+        f"import json, sys; {statement}; "
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    return json.loads(_python("-c", code))
+
+
+def test_package_import_is_lazy_and_within_budget():
+    assert _loaded_after("import quiz_automation") == []
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", "import quiz_automation"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    line = next(
+        row
+        for row in result.stderr.splitlines()
+        if row.rstrip().endswith("| quiz_automation")
+    )
+    cumulative = int(line.split("|")[1])
+    assert cumulative < PACKAGE_BUDGET_US
+
+
+def test_exports_resolve_on_first_access():
+    assert (
+        _loaded_after("import quiz_automation as q; assert q.Stats.__name__ == 'Stats'")
+        == []
+    )
+    with pytest.raises(AttributeError):
+        import quiz_automation
+
+        quiz_automation.does_not_exist
+
+
+def test_cli_and_runner_skip_optional_dependencies():
+    pytest.importorskip("pydantic_settings")
+    assert (
+        _loaded_after("import run; from quiz_automation.runner import QuizRunner") == []
+    )
@@ -0,0 +1,44 @@
+"""Tests for :mod:`quiz_automation.metrics`."""
+
+from urllib.request import urlopen
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation.metrics import MetricsServer, render_metrics
+from quiz_automation.stats import Stats
+
+
+def _stats() -> Stats:
+    stats = Stats()
+    stats.record(0.2, 3)
+    stats.record_stage("ocr", 0.004)
+    stats.record_error()
+    stats.increment("cache_hit", 2)
+    stats.set_gauge("queue_depth", 1)
+    return stats
+
+
+def test_render_metrics_exposition_format() -> None:
+    text = render_metrics(_stats().snapshot())
+
+    assert "quiz_questions_answered_total 1" in text
+    assert "quiz_errors_total 1" in text
+    assert "quiz_cache_hit_total 2" in text
+    assert "# TYPE quiz_queue_depth gauge" in text
+    assert 'quiz_stage_latency_seconds_bucket{stage="ocr",le="0.001"} 0' in text
+    assert 'quiz_stage_latency_seconds_bucket{stage="ocr",le="0.005"} 1' in text
+    assert 'quiz_stage_latency_seconds_count{stage="total"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_metrics_server_serves_snapshot() -> None:
+    server = MetricsServer(_stats(), port=0).start()
+    try:
+        with urlopen(f"http://127.0.0.1:{server.port}/metrics") as resp:
+            body = resp.read().decode("utf-8")
+            assert resp.headers["Content-Type"].startswith("text/plain")
+    finally:
+        server.stop()
+    assert "quiz_questions_answered_total 1" in body
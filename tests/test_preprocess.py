@@ -0,0 +1,76 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation import preprocess
+from quiz_automation.config import Settings
+from quiz_automation.ocr import PytesseractOCR
+from quiz_automation.preprocess import Preprocessor, skew_angle
+from quiz_automation.stats import Stats
+
+
+def _tilted_line(degrees: float, dark_theme: bool = False):
+    img = np.full((120, 300, 3), 255, np.uint8)
+    slope = math.tan(math.radians(degrees))
+    for x in range(40, 260):
+        y = int(50 + (x - 40) * slope)
+        img[y : y + 6, x] = 0
+    return 255 - img if dark_theme else img
+
+
+@pytest.fixture(autouse=True)
+def _numpy_only(monkeypatch):
+    """Exercise the NumPy code paths even when OpenCV is installed."""
+    monkeypatch.setattr(preprocess, "cv2", None)
+
+
+def test_pipeline_binarizes_crops_and_deskews():
+    stats = Stats()
+    pre = Preprocessor(stats=stats)
+    out = pre(_tilted_line(5.0))
+    assert out.ndim == 2 and set(np.unique(out)) <= {0, 255}
+    assert out.shape[0] < 60 and out.shape[1] < 250
+    assert abs(skew_angle(out)) < 0.5
+    assert set(pre.timings) == set(preprocess.STEPS)
+    assert stats.snapshot().latency["preprocess_threshold"].count == 1
+
+
+def test_threshold_inverts_dark_theme():
+    out = Preprocessor(steps=("threshold",))(_tilted_line(0.0, dark_theme=True))
+    assert out.mean() > 127
+    assert out[52, 100] == 0
+
+
+def test_scale_and_mss_like_input():
+    shot = type("Shot", (), {"size": (40, 20), "rgb": bytes(40 * 20 * 3)})()
+    out = Preprocessor(steps=("grayscale", "scale"), scale=0.5)(shot)
+    assert out.shape == (10, 20)
+
+
+def test_invalid_configuration_rejected():
+    with pytest.raises(ValueError):
+        Preprocessor(steps=("sharpen",))
+    with pytest.raises(ValueError):
+        Preprocessor(block_size=4)
+
+
+def test_pytesseract_backend_uses_settings(monkeypatch):
+    monkeypatch.setattr(
+        "quiz_automation.config.settings", Settings(ocr_preprocess=True, ocr_scale=2)
+    )
+    backend = PytesseractOCR()
+    assert backend.preprocess is not None and backend.preprocess.scale == 2
+    assert PytesseractOCR(preprocess=False).preprocess is None
+
+
+def test_pytesseract_backend_preprocess_true_builds_from_settings(monkeypatch):
+    monkeypatch.setattr(
+        "quiz_automation.config.settings", Settings(ocr_preprocess=False, ocr_scale=3)
+    )
+    assert PytesseractOCR().preprocess is None
+    backend = PytesseractOCR(preprocess=True)
+    assert isinstance(backend.preprocess, Preprocessor)
+    assert backend.preprocess.scale == 3
@@ -12,6 +12,15 @@ from unittest.mock import patch
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _reset_settings():
+    """Drop the settings loaded by ``run.main`` so later tests see defaults."""
+    yield
+    from quiz_automation.config import settings_registry
+
+    settings_registry.reset()
+
+
 @pytest.mark.parametrize(
     "backend, client_attr",
     [
@@ -51,7 +60,11 @@ def test_cli_uses_selected_backend_and_stops(backend: str, client_attr: str) ->
         openai_model="dummy-model",
         openai_system_prompt="dummy-prompt",
         ocr_backend="dummy-ocr",
+        poll_interval=1.0,
         temperature=0.0,
+        trace_enabled=False,
+        trace_path=None,
+        trace_sample_rate=1.0,
     )
     stats = SimpleNamespace(questions_answered=0)
     instantiated = {}
@@ -60,13 +73,15 @@ def test_cli_uses_selected_backend_and_stops(backend: str, client_attr: str) ->
         def __init__(self, *a, **k):
             instantiated["created"] = True
 
-    from quiz_automation.config import settings as global_settings
+    from quiz_automation.config import settings_registry
 
-    with patch.object(run, "Settings", return_value=_cfg), patch.object(
+    with patch.object(settings_registry, "factory", return_value=_cfg), patch.object(
         run, "Stats", return_value=stats
     ), patch.object(run, "QuizRunner") as Runner, patch.object(
         run, client_attr, DummyClient
-    ):
+    ), patch.object(
+        run, "MetricsServer"
+    ) as Metrics:
         Runner.return_value.is_alive.side_effect = [True, False]
         Runner.return_value.start.return_value = None
         Runner.return_value.join.return_value = None
@@ -80,15 +95,17 @@ def test_cli_uses_selected_backend_and_stops(backend: str, client_attr: str) ->
                 backend,
                 "--max-questions",
                 "0",
+                "--metrics-port",
+                "9100",
+                "--metrics-host",
+                "0.0.0.0",
             ]
         )
 
+    assert Metrics.call_args.kwargs == {"host": "0.0.0.0", "port": 9100}
+    assert Metrics.return_value.start.return_value.stop.called
     assert instantiated.get("created", False)
     assert Runner.return_value.stop.call_count == 1
-    global_settings.openai_model = "o4-mini-high"
-    global_settings.openai_system_prompt = "Reply with JSON {'answer':'A|B|C|D'}"
-    global_settings.ocr_backend = None
-    global_settings.temperature = 0.0
     assert Runner.call_args.kwargs["max_questions"] == 0
 
 
@@ -119,6 +136,7 @@ def test_cli_gui_mode_passes_gui_and_stops(backend: str, client_attr: str) -> No
     )
 
     run = importlib.import_module("run")
+    from quiz_automation.config import settings_registry
     from quiz_automation.types import Point, Region
 
     _cfg = SimpleNamespace(
@@ -129,7 +147,11 @@ def test_cli_gui_mode_passes_gui_and_stops(backend: str, client_attr: str) -> No
         openai_model="dummy-model",
         openai_system_prompt="dummy-prompt",
         ocr_backend="dummy-ocr",
+        poll_interval=1.0,
         temperature=0.0,
+        trace_enabled=False,
+        trace_path=None,
+        trace_sample_rate=1.0,
     )
     stats = SimpleNamespace(questions_answered=0)
     instantiated = {}
@@ -142,7 +164,7 @@ def test_cli_gui_mode_passes_gui_and_stops(backend: str, client_attr: str) -> No
         def __init__(self):
             self._app = None
 
-    with patch.object(run, "Settings", return_value=_cfg), patch.object(
+    with patch.object(settings_registry, "factory", return_value=_cfg), patch.object(
         run, "Stats", return_value=stats
     ), patch.object(run, "QuizRunner") as Runner, patch.object(
         run, client_attr, DummyClient
@@ -190,6 +212,7 @@ def test_cli_temperature(monkeypatch) -> None:
 
     run = importlib.import_module("run")
     from quiz_automation.config import settings as global_settings
+    from quiz_automation.config import settings_registry
     from quiz_automation.types import Point, Region
 
     cfg = SimpleNamespace(
@@ -200,7 +223,11 @@ def test_cli_temperature(monkeypatch) -> None:
         openai_model="dummy-model",
         openai_system_prompt="dummy-prompt",
         ocr_backend="dummy-ocr",
+        poll_interval=1.0,
         temperature=0.0,
+        trace_enabled=False,
+        trace_path=None,
+        trace_sample_rate=1.0,
     )
     stats = SimpleNamespace(questions_answered=0)
     captured = SimpleNamespace(temp=None)
@@ -213,9 +240,11 @@ def test_cli_temperature(monkeypatch) -> None:
         cfg.temperature = kwargs.get("temperature", cfg.temperature)
         return cfg
 
-    with patch.object(run, "Settings", side_effect=fake_settings), patch.object(
-        run, "Stats", return_value=stats
-    ), patch.object(run, "QuizRunner") as Runner, patch.object(
+    with patch.object(
+        settings_registry, "factory", side_effect=fake_settings
+    ), patch.object(run, "Stats", return_value=stats), patch.object(
+        run, "QuizRunner"
+    ) as Runner, patch.object(
         run, "ChatGPTClient", DummyClient
     ):
         Runner.return_value.is_alive.side_effect = [True, False]
@@ -238,10 +267,6 @@ def test_cli_temperature(monkeypatch) -> None:
 
     assert captured.temp == 0.7
     assert cfg.temperature == 0.7
-    global_settings.openai_model = "o4-mini-high"
-    global_settings.openai_system_prompt = "Reply with JSON {'answer':'A|B|C|D'}"
-    global_settings.ocr_backend = None
-    global_settings.temperature = 0.0
 
 
 def test_cli_propagates_settings_to_global() -> None:
@@ -263,6 +288,7 @@ def test_cli_propagates_settings_to_global() -> None:
 
     run = importlib.import_module("run")
     from quiz_automation.config import settings as global_settings
+    from quiz_automation.config import settings_registry
     from quiz_automation.types import Point, Region
 
     cfg = SimpleNamespace(
@@ -273,7 +299,11 @@ def test_cli_propagates_settings_to_global() -> None:
         openai_model="model-x",
         openai_system_prompt="prompt-y",
         ocr_backend="ocr-z",
+        poll_interval=1.0,
         temperature=0.2,
+        trace_enabled=False,
+        trace_path=None,
+        trace_sample_rate=1.0,
     )
     stats = SimpleNamespace(questions_answered=0)
 
@@ -281,7 +311,7 @@ def test_cli_propagates_settings_to_global() -> None:
         def __init__(self, *a, **k):
             pass
 
-    with patch.object(run, "Settings", return_value=cfg), patch.object(
+    with patch.object(settings_registry, "factory", return_value=cfg), patch.object(
         run, "Stats", return_value=stats
     ), patch.object(run, "QuizRunner") as Runner, patch.object(
         run, "ChatGPTClient", DummyClient
@@ -306,7 +336,86 @@ def test_cli_propagates_settings_to_global() -> None:
     assert global_settings.openai_system_prompt == "prompt-y"
     assert global_settings.ocr_backend == "ocr-z"
     assert global_settings.temperature == 0.2
-    global_settings.openai_model = "o4-mini-high"
-    global_settings.openai_system_prompt = "Reply with JSON {'answer':'A|B|C|D'}"
-    global_settings.ocr_backend = None
-    global_settings.temperature = 0.0
+
+
+def test_cli_analyze_subcommand(tmp_path, capsys) -> None:
+    """``analyze`` summarises session logs without starting a runner."""
+
+    import importlib
+    import json
+
+    run = importlib.import_module("run")
+    log = tmp_path / "session.jsonl"
+    log.write_text(
+        json.dumps({"timestamp": "2024-05-01T09:00:00", "letter": "C", "duration": 1.5})
+        + "\n"
+    )
+    with patch.object(run, "QuizRunner") as Runner:
+        run.main(["analyze", str(log), "--json"])
+    Runner.assert_not_called()
+    report = json.loads(capsys.readouterr().out)
+    assert report["answered"] == 1
+    assert report["letters"] == {"C": 1}
+
+
+def test_cli_watch_config_requires_config(capsys) -> None:
+    """``--watch-config`` has nothing to watch without ``--config``."""
+
+    import importlib
+    import sys
+
+    sys.modules.setdefault(
+        "pydantic",
+        SimpleNamespace(
+            BaseModel=object,
+            ValidationError=Exception,
+            field_validator=lambda *a, **k: (lambda f: f),
+        ),
+    )
+    sys.modules.setdefault(
+        "pydantic_settings",
+        SimpleNamespace(BaseSettings=object, SettingsConfigDict=dict),
+    )
+    run = importlib.import_module("run")
+
+    with pytest.raises(SystemExit):
+        run.main(["--watch-config", "1"])
+    assert "--watch-config requires --config" in capsys.readouterr().err
+
+
+def test_tracing_needs_an_output(tmp_path) -> None:
+    """``TRACE_ENABLED`` only collects spans when ``TRACE_PATH`` is set."""
+
+    import importlib
+    import sys
+
+    sys.modules.setdefault(
+        "pydantic",
+        SimpleNamespace(
+            BaseModel=object,
+            ValidationError=Exception,
+            field_validator=lambda *a, **k: (lambda f: f),
+        ),
+    )
+    sys.modules.setdefault(
+        "pydantic_settings",
+        SimpleNamespace(BaseSettings=object, SettingsConfigDict=dict),
+    )
+    run = importlib.import_module("run")
+    from quiz_automation import tracing
+
+    args = SimpleNamespace(trace=None, trace_format="chrome", trace_sample_rate=None)
+    cfg = SimpleNamespace(trace_enabled=True, trace_path=None, trace_sample_rate=1.0)
+    try:
+        run._configure_tracing(args, cfg)
+        assert not tracing.tracer.enabled
+
+        cfg.trace_path = str(tmp_path / "trace.json")
+        run._configure_tracing(args, cfg)
+        assert tracing.tracer.enabled
+        with tracing.span("question"):
+            pass
+        run._export_trace(args, cfg)
+        assert (tmp_path / "trace.json").exists()
+    finally:
+        tracing.tracer.configure(enabled=False)
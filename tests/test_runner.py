@@ -62,3 +62,134 @@ def test_runner_triggers_full_flow(monkeypatch):
 
     assert calls == {"screenshot": 1, "paste": 1, "read": 1, "click": 1}
     assert runner.stats.questions_answered == 1
+
+
+def test_runner_session_log_is_written_in_background(monkeypatch):
+    import io
+    import json
+
+    from quiz_automation.session_log import SessionLogWriter
+
+    monkeypatch.setattr(
+        automation.pyautogui, "screenshot", lambda *, region=None: "img"
+    )
+    monkeypatch.setattr(automation, "send_to_chatgpt", lambda img, box: None)
+    monkeypatch.setattr(
+        automation,
+        "read_chatgpt_response",
+        lambda region, timeout=20.0, poll_interval=0.5: "Answer B",
+    )
+    monkeypatch.setattr(automation, "click_option", lambda base, idx, offset=40: None)
+    monkeypatch.setattr(
+        automation.ocr, "get_backend", lambda name: (lambda img: "Q?\nA x\nB y")
+    )
+    stream = io.StringIO()
+
+    runner = QuizRunner(
+        Region(0, 0, 10, 10),
+        Point(0, 0),
+        Region(0, 0, 10, 10),
+        ["A", "B"],
+        Point(0, 0),
+        max_questions=2,
+        session_log=stream,
+    )
+    assert isinstance(runner.session_log, SessionLogWriter)
+    runner.start()
+    runner.join(timeout=2)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["letter"] for r in records] == ["B", "B"]
+
+
+def test_runner_logs_error_records(monkeypatch):
+    import io
+    import json
+
+    monkeypatch.setattr(
+        automation.pyautogui, "screenshot", lambda *, region=None: "img"
+    )
+    monkeypatch.setattr(automation, "send_to_chatgpt", lambda img, box: None)
+    replies = iter([TimeoutError("no reply"), "Answer A"])
+
+    def fake_read(region, timeout=20.0, poll_interval=0.5):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(automation, "read_chatgpt_response", fake_read)
+    monkeypatch.setattr(automation, "click_option", lambda base, idx, offset=40: None)
+    monkeypatch.setattr(
+        automation.ocr, "get_backend", lambda name: (lambda img: "Q?\nA x\nB y")
+    )
+    stream = io.StringIO()
+
+    runner = QuizRunner(
+        Region(0, 0, 10, 10),
+        Point(0, 0),
+        Region(0, 0, 10, 10),
+        ["A", "B"],
+        Point(0, 0),
+        max_questions=1,
+        session_log=stream,
+    )
+    runner.start()
+    runner.join(timeout=2)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0]["error"] == "TimeoutError"
+    assert records[0]["message"] == "no reply"
+    assert records[1]["letter"] == "A"
+
+
+def test_runner_apply_settings_while_running(monkeypatch):
+    from quiz_automation.clicker import NullClicker
+
+    built = []
+    monkeypatch.setattr(
+        automation.ocr,
+        "get_backend",
+        lambda name: built.append(name) or (lambda img: "Q?\nA x\nB y"),
+    )
+    moved = SimpleNamespace(
+        quiz_region=Region(50, 50, 20, 20),
+        chat_box=Point(0, 0),
+        response_region=Region(0, 0, 10, 10),
+        option_base=Point(7, 8),
+        poll_interval=0.5,
+        ocr_backend="other",
+    )
+    regions = []
+
+    class Source:
+        def grab(self, region):
+            regions.append(region)
+            if len(regions) == 1:
+                runner.apply_settings(moved)
+            return "img" if len(regions) <= 3 else None
+
+    class Client:
+        def ask(self, question, options):
+            return "B"
+
+    clicker = NullClicker(Point(0, 0))
+    runner = QuizRunner(
+        Region(0, 0, 10, 10),
+        Point(0, 0),
+        Region(0, 0, 10, 10),
+        ["A", "B"],
+        Point(0, 0),
+        model_client=Client(),
+        capture=Source(),
+        clicker=clicker,
+        max_questions=2,
+    )
+    runner.start()
+    runner.join(timeout=2)
+
+    assert regions[0] == Region(0, 0, 10, 10)
+    assert set(regions[1:]) == {Region(50, 50, 20, 20)}
+    assert built == ["other"]
+    assert clicker.clicks == [(7, 48), (7, 48)]
+    assert runner.stats.questions_answered == 2
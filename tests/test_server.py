@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import base64
+import contextlib
+import json
+
+import pytest
 from fastapi.testclient import TestClient
 
 from server.app import app, celery_app
 
 
+@pytest.fixture(autouse=True)
+def _clear_result_cache() -> None:
+    """Keep deduplicated task ids from leaking between tests."""
+
+    from server.app import result_cache
+
+    result_cache.clear()
+
+
 def test_answer_endpoint_eager(monkeypatch) -> None:
     """POST /answer triggers Celery task and returns model response."""
 
@@ -27,3 +41,526 @@ def test_answer_endpoint_eager(monkeypatch) -> None:
     data = res.json()
     assert data["status"] == "completed"
     assert data["answer"] == "A"
+
+
+def test_stats_endpoint_reports_percentiles() -> None:
+    """GET /stats exposes per-stage latency percentiles."""
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    client = TestClient(app)
+
+    client.post("/answer", json={"question": "sky", "options": ["sky", "sea"]})
+    data = client.get("/stats").json()
+    assert data["questions_answered"] >= 1
+    assert set(data["latency"]["model"]) == {"p50", "p95", "p99"}
+
+
+def test_metrics_endpoint_prometheus_format() -> None:
+    """GET /metrics returns the Prometheus text exposition."""
+
+    client = TestClient(app)
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "quiz_questions_answered_total" in resp.text
+
+
+def test_batch_answer_endpoint_eager() -> None:
+    """POST /answer/batch splits items into chunks and returns ordered results."""
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    client = TestClient(app)
+
+    items = [
+        {"question": "clear sky colour", "options": ["sky", "sea"]},
+        {"question": "salty sea water", "options": ["sky", "sea"]},
+        {"image": "not-base64", "options": ["A", "B"]},
+    ]
+    resp = client.post("/answer/batch", json={"items": items, "chunk_size": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["size"] == 3 and body["chunks"] == 2
+
+    res = client.get(f"/answer/batch/{body['batch_id']}").json()
+    assert res["status"] == "completed"
+    assert res["chunks_completed"] == res["chunks_total"] == 2
+    assert [r.get("answer") for r in res["results"][:2]] == ["A", "B"]
+    assert res["results"][2]["status"] == "failed"
+
+
+def test_batch_unknown_id_returns_404() -> None:
+    celery_app.conf.result_backend = "cache+memory://"
+    client = TestClient(app)
+    assert client.get("/answer/batch/missing").status_code == 404
+
+
+def test_inline_text_answer_skips_broker(monkeypatch) -> None:
+    """Text-only requests are answered in-process when inline mode is on."""
+
+    from server import app as app_module
+
+    celery_app.conf.result_backend = "cache+memory://"
+    monkeypatch.setattr(app_module, "INLINE_TEXT_ANSWERS", True)
+    monkeypatch.setattr(
+        app_module.process_answer,
+        "delay",
+        lambda *a, **k: (_ for _ in ()).throw(AssertionError("enqueued")),
+    )
+    client = TestClient(app)
+
+    resp = client.post(
+        "/answer", json={"question": "blue sky", "options": ["sea", "sky"]}
+    )
+    body = resp.json()
+    assert body["status"] == "completed" and body["answer"] == "B"
+    assert client.get(f"/answer/{body['task_id']}").json()["answer"] == "B"
+
+
+def test_inline_overflow_falls_back_to_celery(monkeypatch) -> None:
+    from threading import BoundedSemaphore
+
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    monkeypatch.setattr(app_module, "INLINE_TEXT_ANSWERS", True)
+    slots = BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(app_module, "_inline_slots", slots)
+    client = TestClient(app)
+
+    resp = client.post("/answer", json={"question": "sky", "options": ["sky"]})
+    assert set(resp.json()) == {"task_id"}
+
+
+def test_long_poll_and_event_stream() -> None:
+    """``?wait=`` and the SSE endpoint deliver finished results."""
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    client = TestClient(app)
+
+    task_id = client.post(
+        "/answer", json={"question": "sky", "options": ["sky", "sea"]}
+    ).json()["task_id"]
+    assert client.get(f"/answer/{task_id}?wait=1").json()["answer"] == "A"
+
+    resp = client.get(f"/answer/{task_id}/events")
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text.startswith("event: result\n")
+    assert '"answer": "A"' in resp.text
+
+
+def test_batch_event_stream_reports_chunks() -> None:
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    client = TestClient(app)
+
+    items = [{"question": "sky", "options": ["sky", "sea"]}] * 3
+    batch_id = client.post(
+        "/answer/batch", json={"items": items, "chunk_size": 2}
+    ).json()["batch_id"]
+
+    events = [
+        block.split("\n")[0]
+        for block in client.get(f"/answer/batch/{batch_id}/events").text.split("\n\n")
+        if block
+    ]
+    assert events == ["event: chunk", "event: chunk", "event: done"]
+    assert (
+        client.get(f"/answer/batch/{batch_id}?wait=1").json()["status"] == "completed"
+    )
+
+
+def test_tasks_reuse_cached_model_client(monkeypatch) -> None:
+    """The model client is built once per process, not once per task."""
+
+    from server import app as app_module
+
+    created = []
+
+    class CountingClient:
+        def __init__(self) -> None:
+            created.append(self)
+
+        def ask(self, question, options):
+            return "A"
+
+    monkeypatch.setattr(app_module, "_worker_state", {})
+    monkeypatch.setattr(app_module, "LocalModelClient", CountingClient)
+    app_module.process_answer("q", None, ["x"])
+    app_module.process_answer("q", None, ["x"])
+    assert len(created) == 1
+
+
+def test_warm_worker_state_prewarms_model(monkeypatch) -> None:
+    from server import app as app_module
+
+    asked = []
+
+    class RecordingClient:
+        def ask(self, question, options):
+            asked.append(question)
+            return "A"
+
+    monkeypatch.setattr(app_module, "_worker_state", {})
+    monkeypatch.setattr(app_module, "LocalModelClient", RecordingClient)
+    monkeypatch.setattr(app_module, "get_backend", lambda: (lambda img: ""))
+    app_module.warm_worker_state(prewarm=True)
+    assert asked == ["warm up"]
+    assert "model_client" in app_module._worker_state
+
+
+class _FakeImage:
+    """Stand-in for ``PIL.Image`` whose ``open`` yields the raw bytes."""
+
+    @staticmethod
+    def open(fh):
+        return contextlib.nullcontext(fh.read())
+
+
+def _blob_worker_state(monkeypatch, tmp_path):
+    from server import app as app_module
+    from server.blobs import FileBlobStore
+
+    store = FileBlobStore(tmp_path)
+    seen = []
+
+    def ocr(data):
+        seen.append(data)
+        return "What color is the clear sky?"
+
+    monkeypatch.setattr(
+        app_module,
+        "_worker_state",
+        {"blob_store": store, "pil_image": _FakeImage, "ocr_backend": ocr},
+    )
+    monkeypatch.setattr(app_module, "BLOB_STORE_DIR", str(tmp_path))
+    return store, seen
+
+
+def test_raw_image_upload_passes_blob_reference(monkeypatch, tmp_path) -> None:
+    """POST /answer/image stores the body once and the task reads it by key."""
+
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    store, seen = _blob_worker_state(monkeypatch, tmp_path)
+    sent = []
+    original = app_module.process_answer.delay
+    monkeypatch.setattr(
+        app_module.process_answer,
+        "delay",
+        lambda *args: sent.append(args) or original(*args),
+    )
+    client = TestClient(app)
+
+    resp = client.post(
+        "/answer/image?options=Blue&options=Red",
+        content=b"\x89PNG raw bytes",
+        headers={"Content-Type": "image/png"},
+    )
+    assert resp.status_code == 200
+    assert seen == [b"\x89PNG raw bytes"]
+    assert sent[0][:3] == (None, None, ["Blue", "Red"])
+    assert list(tmp_path.iterdir()) == []
+    data = client.get(f"/answer/{resp.json()['task_id']}").json()
+    assert data["answer"] == "A"
+
+
+def test_large_base64_image_goes_through_blob_store(monkeypatch, tmp_path) -> None:
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    store, seen = _blob_worker_state(monkeypatch, tmp_path)
+    monkeypatch.setattr(app_module, "INLINE_IMAGE_MAX_BYTES", 8)
+    payload = b"x" * 64
+
+    resp = TestClient(app).post(
+        "/answer",
+        json={"image": base64.b64encode(payload).decode(), "options": ["Blue"]},
+    )
+    assert resp.status_code == 200
+    assert seen == [payload]
+
+
+def test_images_stay_inline_without_blob_store_dir(monkeypatch, tmp_path) -> None:
+    """Offloading is opt-in: without a shared directory nothing is stored."""
+
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    store, seen = _blob_worker_state(monkeypatch, tmp_path)
+    monkeypatch.setattr(app_module, "BLOB_STORE_DIR", None)
+    monkeypatch.setattr(app_module, "INLINE_IMAGE_MAX_BYTES", 8)
+    client = TestClient(app)
+
+    resp = client.post("/answer/image?options=Blue", content=b"raw image")
+    assert resp.status_code == 200
+    resp = client.post(
+        "/answer",
+        json={"image": base64.b64encode(b"x" * 64).decode(), "options": ["Blue"]},
+    )
+    assert resp.status_code == 200
+    assert seen == [b"raw image", b"x" * 64]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stale_blobs_are_pruned_on_upload(monkeypatch, tmp_path) -> None:
+    import os
+
+    from server import app as app_module
+
+    store, _seen = _blob_worker_state(monkeypatch, tmp_path)
+    monkeypatch.setattr(app_module, "_last_blob_prune", 0.0)
+    monkeypatch.setattr(app_module, "BLOB_PRUNE_INTERVAL", 0.0)
+    stale = store.put(b"old")
+    os.utime(tmp_path / stale, (0, 0))
+
+    fresh = app_module._put_blob(b"new")
+    assert list(tmp_path.iterdir()) == [tmp_path / fresh]
+
+
+def test_blob_store_rejects_unknown_and_malformed_keys(tmp_path) -> None:
+    from server.blobs import FileBlobStore
+
+    store = FileBlobStore(tmp_path)
+    key = store.put(b"data")
+    assert store.get(key) == b"data"
+    store.delete(key)
+    for bad in (key, "../etc/passwd"):
+        with pytest.raises(KeyError):
+            store.get(bad)
+    store.put(b"old")
+    assert store.prune(-1) == 1
+
+
+def test_duplicate_requests_share_one_task(monkeypatch) -> None:
+    """Repeats of a payload reuse the first task and return its answer."""
+
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    sent = []
+    original = app_module.process_answer.delay
+    monkeypatch.setattr(
+        app_module.process_answer,
+        "delay",
+        lambda *args: sent.append(args) or original(*args),
+    )
+    client = TestClient(app)
+    payload = {"question": "clear sky", "options": ["sky", "sea"]}
+
+    first = client.post("/answer", json=payload).json()
+    second = client.post("/answer", json=payload).json()
+    other = client.post("/answer", json={**payload, "options": ["sea", "sky"]})
+    assert len(sent) == 2
+    assert second == {"task_id": first["task_id"], "status": "completed", "answer": "A"}
+    assert other.json()["task_id"] != first["task_id"]
+
+
+def test_result_cache_single_flight_and_expiry() -> None:
+    import threading
+
+    from server.cache import ResultCache, content_key
+
+    now = [0.0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0])
+    release = threading.Event()
+    calls = []
+
+    def submit() -> str:
+        calls.append(1)
+        release.wait(1)
+        return "task-1"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.single_flight("k", submit))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(results) == [("task-1", False)] + [("task-1", True)] * 3
+
+    now[0] = 11
+    assert cache.get("k") is None
+    assert content_key("q", ["a"], b"img") != content_key("q", ["a"], None)
+
+
+def test_raw_image_upload_rejects_oversized_body(monkeypatch, tmp_path) -> None:
+    from server import app as app_module
+
+    store, seen = _blob_worker_state(monkeypatch, tmp_path)
+    monkeypatch.setattr(app_module, "MAX_IMAGE_BYTES", 8)
+    client = TestClient(app)
+
+    resp = client.post("/answer/image?options=A", content=b"x" * 9)
+    assert resp.status_code == 413
+    streamed = client.post("/answer/image?options=A", content=iter([b"x" * 5] * 2))
+    assert streamed.status_code == 413
+    assert seen == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_task_deletes_blob(monkeypatch, tmp_path) -> None:
+    from server import app as app_module
+
+    store, _seen = _blob_worker_state(monkeypatch, tmp_path)
+
+    def broken_ocr(data):
+        raise RuntimeError("OCR failed")
+
+    monkeypatch.setitem(app_module._worker_state, "ocr_backend", broken_ocr)
+    key = store.put(b"image")
+    with pytest.raises(RuntimeError):
+        app_module.process_answer(None, None, ["A"], key)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_event_streams_are_capped(monkeypatch) -> None:
+    import threading
+
+    from server import app as app_module
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_store_eager_result = True
+    celery_app.conf.result_backend = "cache+memory://"
+    monkeypatch.setattr(app_module, "_stream_slots", threading.BoundedSemaphore(1))
+    client = TestClient(app)
+    task_id = client.post(
+        "/answer", json={"question": "sky", "options": ["sky", "sea"]}
+    ).json()["task_id"]
+
+    # A finished stream hands its slot back.
+    for _ in range(2):
+        assert client.get(f"/answer/{task_id}/events").status_code == 200
+
+    app_module._stream_slots.acquire()
+    resp = client.get(f"/answer/{task_id}/events")
+    assert resp.status_code == 503
+    assert "retry-after" in resp.headers
+
+
+def test_stream_slot_released_when_client_disconnects_early(monkeypatch) -> None:
+    import asyncio
+    import threading
+
+    from server import app as app_module
+
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(app_module, "_stream_slots", slots)
+
+    async def events():
+        yield "never sent"
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    response = app_module._EventStream(events())
+    with pytest.raises(OSError):
+        asyncio.run(response({"type": "http"}, receive, send))
+    assert slots.acquire(blocking=False)
+
+
+def test_waiters_share_one_backend_check(monkeypatch) -> None:
+    """Concurrent long polls are woken by one batched readiness check."""
+
+    import asyncio
+
+    from server import app as app_module
+
+    calls = []
+
+    def ready(task_ids):
+        calls.append(sorted(task_ids))
+        return set(task_ids) if len(calls) > 1 else set()
+
+    monkeypatch.setattr(app_module, "_ready_task_ids", ready)
+    monkeypatch.setattr(app_module, "SSE_POLL_INTERVAL", 0.01)
+
+    async def wait_all():
+        watcher = app_module._result_watcher()
+        return await asyncio.gather(
+            *(watcher.wait([f"task-{i % 3}"], 1) for i in range(30))
+        )
+
+    results = asyncio.run(wait_all())
+    assert all(len(finished) == 1 for finished in results)
+    assert calls == [["task-0", "task-1", "task-2"]] * 2
+
+
+def test_long_poll_times_out_on_pending_task(monkeypatch) -> None:
+    from server import app as app_module
+
+    celery_app.conf.result_backend = "cache+memory://"
+    monkeypatch.setattr(app_module, "SSE_POLL_INTERVAL", 0.01)
+    resp = TestClient(app).get("/answer/never-submitted?wait=0.05")
+    assert resp.json() == {"status": "pending"}
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    def hdel(self, name, *keys):
+        for key in keys:
+            self.hashes.get(name, {}).pop(key, None)
+
+
+def test_stats_include_published_worker_stats(monkeypatch) -> None:
+    """Each worker process publishes after a task; the API merges them."""
+
+    from quiz_automation.stats import Stats
+    from server import app as app_module
+
+    redis = _FakeRedis()
+    worker = Stats()
+    worker.record(2.0, 0)
+    worker.record_stage("ocr", 0.5)
+    monkeypatch.setattr(app_module, "_stats_client", lambda: redis)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", False)
+    monkeypatch.setattr(app_module, "stats", worker)
+    app_module._publish_worker_stats()
+    assert len(redis.hashes[app_module.WORKER_STATS_KEY]) == 1
+    redis.hset(
+        app_module.WORKER_STATS_KEY,
+        "gone:1",
+        json.dumps({"updated": 0, "stats": worker.snapshot().to_dict()}),
+    )
+
+    monkeypatch.setattr(app_module, "stats", Stats())
+    client = TestClient(app)
+    data = client.get("/stats").json()
+    assert data["questions_answered"] == 1
+    assert data["latency"]["ocr"]["p50"] == pytest.approx(0.5, rel=0.05)
+    assert "gone:1" not in redis.hashes[app_module.WORKER_STATS_KEY]
+    assert "quiz_questions_answered_total 1" in client.get("/metrics").text
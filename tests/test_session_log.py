@@ -0,0 +1,226 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation import session_log
+from quiz_automation.session_log import (
+    RotatingSink,
+    SessionLogWriter,
+    read_session_log,
+    session_log_files,
+)
+
+
+class SlowStream(io.StringIO):
+    """Stream whose writes block until released and whose flushes are counted."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.flushes = 0
+
+    def write(self, s):
+        self.release.wait(2)
+        return super().write(s)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_log_does_not_block_and_close_drains_everything():
+    stream = SlowStream()
+    writer = SessionLogWriter(stream, flush_interval=60)
+    start = time.perf_counter()
+    for i in range(1000):
+        writer.log({"n": i})
+    assert time.perf_counter() - start < 0.5
+    stream.release.set()
+    writer.close()
+    assert [r["n"] for r in _records(stream)] == list(range(1000))
+    assert stream.flushes >= 1
+    with pytest.raises(ValueError):
+        writer.log({"n": 1000})
+
+
+def test_flush_waits_for_queued_records():
+    stream = SlowStream()
+    stream.release.set()
+    with SessionLogWriter(stream, flush_interval=60, flush_records=10_000) as writer:
+        writer.log({"letter": "A"})
+        assert writer.flush(timeout=1)
+        assert _records(stream) == [{"letter": "A"}]
+        assert stream.flushes == 1
+
+
+def test_time_based_flush():
+    stream = SlowStream()
+    stream.release.set()
+    writer = SessionLogWriter(stream, flush_interval=0.05, flush_records=10_000)
+    writer.log({"letter": "B"})
+    deadline = time.monotonic() + 1
+    while stream.flushes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stream.flushes == 1
+    writer.close()
+
+
+def test_unserialisable_record_is_dropped():
+    stream = io.StringIO()
+    writer = SessionLogWriter(stream)
+    writer.log({"bad": object()})
+    writer.log({"ok": 1})
+    writer.close()
+    assert _records(stream) == [{"ok": 1}]
+    assert writer.dropped == 1
+
+
+def _session(n):
+    return [
+        {"letter": "ABCD"[i % 4], "duration": i / 10, "ocr_text": "x" * 200}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "columnar"])
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_rotating_sink_round_trip(tmp_path, fmt, compression):
+    sink = RotatingSink(tmp_path / "session.log", fmt=fmt, compression=compression)
+    with SessionLogWriter(sink, flush_records=7, max_batch=7) as writer:
+        for record in _session(50):
+            writer.log(record)
+    assert list(read_session_log(tmp_path / "session.log")) == _session(50)
+
+
+def test_gzip_blocks_are_smaller(tmp_path):
+    plain = RotatingSink(tmp_path / "plain.log")
+    packed = RotatingSink(tmp_path / "packed.log", fmt="columnar", compression="gzip")
+    for sink in (plain, packed):
+        sink.write_records(_session(200))
+        sink.close()
+    assert packed.segments[0].stat().st_size * 5 < plain.segments[0].stat().st_size
+
+
+def test_rotation_by_size_and_age(tmp_path):
+    now = [0.0]
+    sink = RotatingSink(
+        tmp_path / "s.log", max_bytes=2000, max_age=3600, clock=lambda: now[0]
+    )
+    for _ in range(3):
+        sink.write_records(_session(5))
+        sink.flush()
+    assert len(sink.segments) == 2
+    now[0] = 7200.0
+    sink.write_records(_session(1))
+    sink.close()
+    assert len(sink.segments) == 3
+    assert sink.segments[-1].name.startswith("s.log.19700101T020000-")
+    assert session_log_files(tmp_path / "s.log") == sink.segments
+    assert len(list(read_session_log(tmp_path))) == 16
+
+
+def test_columnar_reader_projects_columns(tmp_path, monkeypatch):
+    sink = RotatingSink(tmp_path / "s.log", fmt="columnar", compression="gzip")
+    sink.write_records(_session(10))
+    sink.close()
+    decoded = []
+    real = session_log._decompress
+    monkeypatch.setattr(
+        session_log,
+        "_decompress",
+        lambda data, codec: decoded.append(data) or real(data, codec),
+    )
+    rows = list(read_session_log(tmp_path / "s.log", columns=["duration"]))
+    assert rows == [{"duration": i / 10} for i in range(10)]
+    assert len(decoded) == 1
+
+
+def test_reader_accepts_plain_jsonl(tmp_path):
+    path = tmp_path / "old.jsonl"
+    path.write_text('{"letter": "A"}\n\n{"letter": "B"}\n')
+    assert [r["letter"] for r in read_session_log(path)] == ["A", "B"]
+
+
+def test_zstd_compression(tmp_path):
+    pytest.importorskip("zstandard")
+    sink = RotatingSink(tmp_path / "s.log", compression="zstd")
+    sink.write_records(_session(3))
+    sink.flush()
+    sink.write_records(_session(2))
+    sink.close()
+    assert list(read_session_log(tmp_path / "s.log")) == _session(3) + _session(2)
+
+
+def test_compressed_blocks_fill_before_writing(tmp_path):
+    now = [0.0]
+    sink = RotatingSink(
+        tmp_path / "s.log",
+        fmt="columnar",
+        compression="gzip",
+        block_records=10,
+        block_delay=60,
+        clock=lambda: now[0],
+    )
+    for _ in range(3):
+        sink.write_records(_session(3))
+        sink.flush()
+    assert sink.segments == []
+    sink.write_records(_session(1))
+    sink.flush()
+    assert len(list(read_session_log(tmp_path / "s.log"))) == 10
+    sink.write_records(_session(2))
+    sink.flush()
+    now[0] = 60.0
+    sink.flush()
+    assert len(list(read_session_log(tmp_path / "s.log"))) == 12
+    sink.write_records(_session(1))
+    sink.close()
+    assert len(list(read_session_log(tmp_path / "s.log"))) == 13
+
+
+def test_segments_never_reuse_existing_files(tmp_path):
+    first = RotatingSink(tmp_path / "s.log", fmt="columnar", clock=lambda: 0.0)
+    second = RotatingSink(tmp_path / "s.log", fmt="columnar", clock=lambda: 0.0)
+    for sink in (first, second):
+        sink.write_records(_session(2))
+        sink.close()
+    assert first.segments[0] != second.segments[0]
+    assert len(list(read_session_log(tmp_path / "s.log"))) == 4
+
+
+def test_session_log_files_ignore_unrelated_siblings(tmp_path):
+    sink = RotatingSink(tmp_path / "s.log", compression="gzip")
+    sink.write_records(_session(1))
+    sink.close()
+    (tmp_path / "s.log").write_text('{"letter": "A"}\n')
+    (tmp_path / "s.log.bak").write_text("old")
+    (tmp_path / "s.log2").write_text("other")
+    (tmp_path / "s.log.20240101T000000-0001.txt").write_text("other")
+    assert session_log_files(tmp_path / "s.log") == [tmp_path / "s.log"] + sink.segments
+
+
+def test_writer_writes_partial_block_after_block_delay(tmp_path):
+    sink = RotatingSink(tmp_path / "s.log", compression="gzip", block_delay=0.2)
+    with SessionLogWriter(sink, flush_interval=0.05) as writer:
+        writer.log({"letter": "A"})
+        deadline = time.monotonic() + 5
+        while not sink.segments and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert sink.pending == 0
+        assert list(read_session_log(tmp_path / "s.log")) == [{"letter": "A"}]
+
+
+def test_writer_flush_forces_buffered_block(tmp_path):
+    sink = RotatingSink(tmp_path / "s.log", fmt="columnar", block_delay=3600)
+    with SessionLogWriter(sink, flush_interval=3600) as writer:
+        writer.log({"letter": "A"})
+        assert writer.flush(timeout=5)
+        assert list(read_session_log(tmp_path / "s.log")) == [{"letter": "A"}]
@@ -5,7 +5,13 @@ from threading import Thread
 
 pytest.importorskip("pydantic_settings")
 
-from quiz_automation.stats import Stats
+from quiz_automation.stats import (
+    HistogramSnapshot,
+    LatencyHistogram,
+    SlidingHistogram,
+    Stats,
+    StatsSnapshot,
+)
 
 
 
@@ -52,4 +58,92 @@ def test_thread_safe_updates_with_multiple_threads() -> None:
     assert stats.errors == error_threads
 
 
+def test_stage_percentiles_from_histogram() -> None:
+    stats = Stats()
+    for i in range(1, 101):
+        stats.record_stage("ocr", i / 100)
+
+    p = stats.percentiles("ocr")
+    assert p["p50"] == pytest.approx(0.50, rel=0.05)
+    assert p["p95"] == pytest.approx(0.95, rel=0.05)
+    assert p["p99"] == pytest.approx(0.99, rel=0.05)
+    assert stats.percentiles("click") == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+def test_record_feeds_total_histogram() -> None:
+    stats = Stats()
+    stats.record(0.2, 1)
+    stats.record(0.4, 1)
+    snap = stats.latency_snapshots()["total"]
+    assert snap.count == 2
+    assert snap.maximum == pytest.approx(0.4)
+
+
+def test_histogram_snapshots_merge_and_roundtrip() -> None:
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        a.record(0.01)
+    for _ in range(10):
+        b.record(1.0)
+
+    merged = a.snapshot().merge(HistogramSnapshot.from_dict(b.snapshot().to_dict()))
+    assert merged.count == 100
+    assert merged.percentile(50) == pytest.approx(0.01, rel=0.05)
+    assert merged.percentile(99) == pytest.approx(1.0, rel=0.05)
+
+
+def test_sliding_histogram_drops_old_slots() -> None:
+    now = [0.0]
+    hist = SlidingHistogram(window=10.0, slots=5, clock=lambda: now[0])
+    hist.record(5.0)
+    now[0] = 4.0
+    hist.record(0.1)
+    assert hist.snapshot().count == 2
+
+    now[0] = 11.0
+    snap = hist.snapshot()
+    assert snap.count == 1
+    assert snap.maximum == pytest.approx(0.1)
+
+
+def test_snapshot_combines_per_thread_shards() -> None:
+    stats = Stats()
+
+    def work() -> None:
+        for _ in range(100):
+            stats.record(0.5, 2)
+            stats.record_stage("ocr", 0.1)
+
+    threads = [Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.record_error()
 
+    snap = stats.snapshot()
+    assert snap.questions_answered == 400
+    assert snap.total_tokens == 800
+    assert snap.errors == 1
+    assert snap.average_time == pytest.approx(0.5)
+    assert snap.latency["ocr"].count == 400
+    assert snap.percentiles("total")["p99"] == pytest.approx(0.5)
+
+
+def test_stats_snapshot_merge_and_roundtrip() -> None:
+    a, b = Stats(), Stats()
+    a.record(1.0, 3)
+    a.increment("blob_uploads")
+    b.record(3.0, 5)
+    b.record_error()
+    b.increment("blob_uploads", 2)
+    b.set_gauge("queue_depth", 2)
+
+    merged = a.snapshot().merge(StatsSnapshot.from_dict(b.snapshot().to_dict()))
+    assert merged.questions_answered == 2
+    assert merged.total_tokens == 8
+    assert merged.errors == 1
+    assert merged.average_time == pytest.approx(2.0)
+    assert merged.latency["total"].count == 2
+    assert merged.counters == {"blob_uploads": 3}
+    assert merged.gauges == {"queue_depth": 2}
@@ -0,0 +1,81 @@
+"""Tests for :mod:`quiz_automation.tracing`."""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation import automation, tracing
+from quiz_automation.tracing import Tracer
+from quiz_automation.types import Point, Region
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    tracer = Tracer()
+    with tracer.span("work") as span:
+        assert span is None
+
+    @tracer.traced()
+    def work() -> int:
+        return 1
+
+    assert work() == 1
+    assert tracer.spans() == []
+
+
+def test_nested_spans_share_trace() -> None:
+    tracer = Tracer(enabled=True)
+    with tracer.span("question", letter="A"):
+        with tracer.span("ocr"):
+            pass
+
+    ocr_span, root = tracer.spans()
+    assert root.name == "question" and root.parent_id is None
+    assert ocr_span.parent_id == root.span_id
+    assert ocr_span.trace_id == root.trace_id
+    assert root.attributes == {"letter": "A"}
+    assert root.end_ns >= ocr_span.end_ns
+
+
+def test_unsampled_trace_drops_children() -> None:
+    tracer = Tracer(enabled=True, sample_rate=0.0)
+    with tracer.span("question"):
+        with tracer.span("ocr"):
+            pass
+    assert tracer.spans() == []
+
+
+def test_exports_chrome_and_otlp(tmp_path) -> None:
+    tracer = Tracer(enabled=True)
+    with tracer.span("question"):
+        pass
+
+    tracer.export(tmp_path / "trace.json")
+    chrome = json.loads((tmp_path / "trace.json").read_text())
+    event = chrome["traceEvents"][0]
+    assert event["name"] == "question" and event["ph"] == "X"
+
+    otlp = tracer.to_otlp()
+    span = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "question"
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+
+
+def test_answer_question_emits_stage_spans(monkeypatch) -> None:
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    monkeypatch.setattr(automation, "send_to_chatgpt", lambda img, box: None)
+    monkeypatch.setattr(
+        automation,
+        "read_chatgpt_response",
+        lambda region, timeout=20.0, poll_interval=0.5: "Answer B",
+    )
+    monkeypatch.setattr(automation, "click_option", lambda base, idx, offset=40: None)
+    automation.answer_question(
+        "img", Point(0, 0), Region(0, 0, 1, 1), ["A", "B"], Point(0, 0)
+    )
+
+    names = [s.name for s in tracer.spans()]
+    assert names == ["model", "click", "answer_question"]
+    assert len({s.trace_id for s in tracer.spans()}) == 1
@@ -0,0 +1,107 @@
+from itertools import islice
+from queue import Queue
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from quiz_automation import automation, ocr
+from quiz_automation.capture import get_capture_source
+from quiz_automation.clicker import NullClicker
+from quiz_automation.config import Settings
+from quiz_automation.model_client import LocalModelClient
+from quiz_automation.runner import QuizRunner
+from quiz_automation.types import Point, Region
+from quiz_automation.virtual_screen import (
+    VirtualOCR,
+    VirtualScreen,
+    random_questions,
+    render_quiz,
+)
+from quiz_automation.watcher import Watcher
+
+
+def test_frames_repeat_and_differ_per_question():
+    screen = VirtualScreen(repeat=2, size=(120, 80))
+    frames = [screen.grab() for _ in range(4)]
+    assert frames[0] is frames[1] and frames[2] is frames[3]
+    assert frames[0].rgb != frames[2].rgb
+    assert len(frames[0].rgb) == 120 * 80 * 3
+    assert (screen.frames, screen.questions) == (4, 2)
+    assert frames[2].text.splitlines()[1].startswith("A) ")
+
+
+def test_frame_size_follows_region_and_limit_ends_screen():
+    screen = VirtualScreen(["Q?\nA) x\nB) y"], limit=3, repeat=5)
+    assert screen.grab(Region(0, 0, 30, 20)).size == (30, 20)
+    screen.grab()
+    screen.grab()
+    assert screen.grab() is None
+
+
+def test_screen_runs_dry_after_last_question():
+    screen = VirtualScreen(["Q1?", "Q2?"])
+    assert [screen.grab().text, screen.grab().text] == ["Q1?", "Q2?"]
+    assert screen.grab() is None
+
+
+def test_rate_paces_frames():
+    now = [10.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    screen = VirtualScreen(rate=100, clock=lambda: now[0], sleep=sleep, size=(8, 8))
+    for _ in range(3):
+        screen.grab()
+    assert sleeps == pytest.approx([0.01, 0.01])
+
+
+def test_render_draws_text_on_white():
+    rgb = render_quiz("Hello?\nA) one", (60, 30))
+    assert rgb[:3] == b"\xff\xff\xff"
+    assert min(rgb) < 0xFF
+
+
+def test_registered_backends():
+    frame = VirtualScreen(size=(8, 8)).grab()
+    assert isinstance(ocr.get_backend("virtual"), VirtualOCR)
+    assert ocr.get_backend("virtual")(frame) == frame.text
+    assert isinstance(get_capture_source("virtual", limit=1), VirtualScreen)
+    with pytest.raises(RuntimeError):
+        get_capture_source("nope")
+
+
+def test_watcher_deduplicates_virtual_frames(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    q: Queue = Queue()
+    watcher = Watcher(
+        Region(0, 0, 64, 48),
+        q,
+        Settings(poll_interval=1e-6),
+        ocr=VirtualOCR(),
+        source=VirtualScreen(repeat=3, limit=30),
+    )
+    watcher.run()
+    assert q.qsize() == 10
+
+
+def test_runner_under_load(monkeypatch):
+    monkeypatch.setattr(automation.settings, "ocr_backend", "virtual")
+    clicker = NullClicker((0, 0))
+    runner = QuizRunner(
+        Region(0, 0, 64, 48),
+        Point(0, 0),
+        Region(0, 0, 64, 48),
+        list("ABCD"),
+        Point(0, 0),
+        model_client=LocalModelClient(),
+        capture=VirtualScreen(islice(random_questions(), 2000)),
+        clicker=clicker,
+    )
+    runner.start()
+    runner.join(timeout=30)
+    assert runner.stats.questions_answered == 2000
+    assert len(clicker.clicks) == 2000
@@ -179,3 +179,49 @@ def test_capture_passes_dict(monkeypatch):
     w.capture()
     assert captured == {"left": 1, "top": 2, "width": 3, "height": 4}
     assert isinstance(captured, dict)
+
+
+def test_watcher_replays_capture_source_until_exhausted(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    frames = ["q1", "q1", "q2"]
+
+    class Source:
+        def grab(self, region):
+            return frames.pop(0) if frames else None
+
+    cfg = Settings()
+    q: Queue = Queue()
+    w = Watcher(Region(0, 0, 1, 1), q, cfg, ocr=lambda img: img, source=Source())
+    monkeypatch.setattr("quiz_automation.watcher.time.sleep", lambda _: None)
+    w.run()
+    assert w.stop_flag.is_set()
+    assert [q.get()[2], q.get()[2]] == ["q1", "q2"]
+    assert q.empty()
+
+
+def test_watcher_apply_settings_swaps_region_and_backend(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    built = []
+    monkeypatch.setattr(
+        watcher_module,
+        "get_backend",
+        lambda name: built.append(name) or (lambda img: f"{name}:{img}"),
+    )
+    cfg = Settings(ocr_backend="a")
+    w = Watcher(cfg.quiz_region, Queue(), cfg)
+    w.is_new_question("q")
+
+    w.apply_settings(Settings(ocr_backend="a", poll_interval=0.2))
+    assert built == ["a"]
+    assert w.cfg.poll_interval == 0.2
+    assert not w.is_new_question("q")
+
+    w.apply_settings(Settings(ocr_backend="b", quiz_region=Region(5, 5, 2, 2)))
+    assert built == ["a", "b"]
+    assert w.region == Region(5, 5, 2, 2)
+    assert w.ocr("img") == "b:img"
+    assert w.is_new_question("q")
+
+    with pytest.raises(ValueError):
+        w.apply_settings(Settings(ocr_backend="c", quiz_region=Region(0, 0, 0, 1)))
+    assert (w.region, built) == (Region(5, 5, 2, 2), ["a", "b"])